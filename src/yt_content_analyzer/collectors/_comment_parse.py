@@ -0,0 +1,92 @@
+"""String-level parsers for YouTube comment fields.
+
+Kept free of Playwright and settings imports, with concrete annotations, so
+the module can be compiled (e.g. ``mypyc``) without touching the collector.
+"""
+from __future__ import annotations
+
+import re
+import time
+from functools import lru_cache
+
+# Vote counts: "1,234" (plain, commas allowed) or "1.2K" / "3M" / "1B" (abbreviated)
+_VOTE_RE = re.compile(r"(\d[\d,]*)|(\d*\.?\d+)\s*([KMB])", re.IGNORECASE)
+_VOTE_MULTIPLIERS = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+_COMMA_TABLE = str.maketrans("", "", ",")
+
+# Relative publish times: "just now" or "<N> <unit>(s) ago", optionally "(edited)"
+_RELATIVE_TIME_RE = re.compile(
+    r"\s*(?:(just now)\s*(?:\(edited\)\s*)?$"
+    r"|(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago)",
+    re.IGNORECASE,
+)
+_UNIT_SECONDS = {
+    "second": 1,
+    "minute": 60,
+    "hour": 3600,
+    "day": 86400,
+    "week": 604800,
+    "month": 2592000,   # ~30 days
+    "year": 31536000,   # ~365 days
+}
+
+
+def _extract_text_from_runs(runs: list[dict]) -> str:
+    """Join all ``text`` values from YouTube's runs format."""
+    if not runs:
+        return ""
+    if len(runs) == 1:  # most comments are a single unformatted run
+        text: str = runs[0].get("text", "")
+        return text
+    return "".join([run["text"] for run in runs if "text" in run])
+
+
+def _parse_vote_count(text: str) -> int:
+    """Parse YouTube vote count strings.
+
+    Examples: ``"42"`` -> 42, ``"1.2K"`` -> 1200, ``"1.5M"`` -> 1500000, ``""`` -> 0
+    """
+    if not text:
+        return 0
+    if text.isdecimal():  # plain counts skip the regex
+        return int(text)
+    match = _VOTE_RE.fullmatch(text.strip())
+    if match is None:
+        return 0
+    plain, number, suffix = match.groups()
+    if plain is not None:
+        return int(plain.translate(_COMMA_TABLE))
+    return int(float(number) * _VOTE_MULTIPLIERS[suffix.upper()])
+
+
+@lru_cache(maxsize=256)
+def _relative_offset(text: str) -> int | None:
+    """Return how many seconds before now *text* describes, or None.
+
+    Cached because a comment page repeats a small set of phrasings
+    ("2 days ago", "1 week ago"), so each distinct string is matched once.
+    """
+    match = _RELATIVE_TIME_RE.match(text)
+    if match is None:
+        return None
+    if match.group(1):
+        return 0
+    return int(match.group(2)) * _UNIT_SECONDS[match.group(3).lower()]
+
+
+def _parse_relative_time(text: str, now: int | None = None) -> int | None:
+    """Parse YouTube relative timestamps to Unix epoch seconds.
+
+    Examples: ``"2 days ago"`` -> ``now - 172800``, ``"just now"`` -> ``now``.
+    Ignores an ``"(edited)"`` suffix. Returns ``None`` if unparseable.
+    *now* defaults to the current time; pass it to parse a batch against one
+    reference instant.
+    """
+    if not text:
+        return None
+    offset = _relative_offset(text)
+    if offset is None:
+        return None
+    if now is None:
+        now = int(time.time())
+    return now - offset
@@ -4,13 +4,29 @@ import logging
 import random
 import re
 import time
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
 
 from ..config import Settings
+from ..models import RawComment
+from ..utils.io import _loads
+from ._comment_parse import (
+    _extract_text_from_runs,
+    _parse_relative_time,
+    _parse_vote_count,
+)
 
 _logger = logging.getLogger(__name__)
 
+# Shared read-only stand-in for absent sub-objects, instead of a fresh {} per lookup
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Leaf lookups in YouTube's text containers ({"simpleText": ...} / {"runs": [...]})
+_simple_text = itemgetter("simpleText")
+_runs = itemgetter("runs")
+
 
 # ---------------------------------------------------------------------------
 # Public entry point
@@ -22,7 +38,7 @@ def collect_comments_playwright_ui(
     sort_mode: str = "top",
     *,
     artifact_dir: Path | None = None,
-) -> list[dict[str, Any]]:
+) -> list[RawComment]:
     """Collect comments via Playwright API interception.
 
     Navigates to the video page with a headless Chromium browser, intercepts
@@ -41,13 +57,13 @@ def collect_comments_playwright_ui(
 
     Returns
     -------
-    list[dict]
-        Raw comment dicts ready for ``normalize_comments()``.
+    list[RawComment]
+        Raw comments ready for ``normalize_comments()``.
     """
     from playwright.sync_api import sync_playwright
 
     max_comments = cfg.MAX_COMMENTS_PER_VIDEO
-    collected: list[dict[str, Any]] = []
+    collected: list[RawComment] = []
 
     def _on_response(response):
         try:
@@ -56,9 +72,7 @@ def collect_comments_playwright_ui(
                 and "youtubei/v1/next" in response.url
                 and response.status == 200
             ):
-                body = response.json()
-                comments = _extract_comments_from_api_response(body)
-                collected.extend(comments)
+                collected.extend(_iter_comments(_loads(response.body())))
         except Exception:
             pass  # non-JSON or network error — ignore
 
@@ -183,7 +197,7 @@ def _switch_sort_mode(page, sort_mode: str) -> None:
 
 
 def _scroll_and_collect(
-    page, collected: list[dict], max_comments: int, cfg: Settings,
+    page, collected: list[RawComment], max_comments: int, cfg: Settings,
 ) -> None:
     """Scroll the page to trigger comment loading via API interception.
 
@@ -216,7 +230,7 @@ def _scroll_and_collect(
                 break
 
 
-def _expand_replies(page, collected: list[dict], cfg: Settings) -> None:
+def _expand_replies(page, collected: list[RawComment], cfg: Settings) -> None:
     """Click 'View replies' and 'Show more replies' buttons to load reply threads."""
     max_depth = cfg.MAX_COMMENT_THREAD_DEPTH
 
@@ -276,213 +290,172 @@ def _extract_video_id_from_url(url: str) -> str:
 # YouTube API response parsing
 # ---------------------------------------------------------------------------
 
-def _extract_comments_from_api_response(data: dict) -> list[dict[str, Any]]:
-    """Extract comment dicts from a ``youtubei/v1/next`` JSON response.
+def _extract_comments_from_api_response(
+    data: dict, *, now: int | None = None,
+) -> list[RawComment]:
+    """Extract comments from a ``youtubei/v1/next`` JSON response.
 
     Supports two YouTube API formats:
     - **New (2025+):** Comment data lives in ``frameworkUpdates.entityBatchUpdate.mutations``
       as ``commentEntityPayload`` objects.
     - **Legacy:** Comment data lives inline in ``commentThreadRenderer.comment.commentRenderer``
       within ``onResponseReceivedEndpoints``.
+
+    Relative publish times are resolved against *now* (epoch seconds),
+    read once per response when omitted.
     """
-    comments: list[dict[str, Any]] = []
-
-    # --- New format: frameworkUpdates mutations ---
-    mutations = (
-        data.get("frameworkUpdates", {})
-        .get("entityBatchUpdate", {})
-        .get("mutations", [])
-    )
+    return list(_iter_comments(data, now=now))
+
+
+def _iter_comments(data: dict, *, now: int | None = None) -> Iterator[RawComment]:
+    """Lazily yield the comments of :func:`_extract_comments_from_api_response`.
+
+    The legacy format is only consulted when the new format yields nothing.
+    """
+    if not data:
+        return
+    framework = data.get("frameworkUpdates")
+    endpoints = data.get("onResponseReceivedEndpoints")
+    if not framework and not endpoints:
+        return  # tail pages often carry neither
+    if now is None:
+        now = int(time.time())
+
+    found = False
+    if framework:
+        for parsed in _iter_framework_comments(framework, now):
+            found = True
+            yield parsed
+    if not found and endpoints:
+        yield from _iter_endpoint_comments(endpoints, now)
+
+
+def _iter_framework_comments(framework: dict, now: int) -> Iterator[RawComment]:
+    """Yield comments from new-format ``frameworkUpdates`` mutations."""
+    parse_entity = _parse_comment_entity_payload
+    mutations = (framework.get("entityBatchUpdate") or _EMPTY).get("mutations") or ()
     for mutation in mutations:
-        payload = mutation.get("payload", {})
-        entity = payload.get("commentEntityPayload")
+        entity = (mutation.get("payload") or _EMPTY).get("commentEntityPayload")
         if entity:
-            parsed = _parse_comment_entity_payload(entity)
+            parsed = parse_entity(entity, now=now)
             if parsed:
-                comments.append(parsed)
+                yield parsed
 
-    if comments:
-        return comments
 
-    # --- Legacy format: onResponseReceivedEndpoints ---
-    endpoints = data.get("onResponseReceivedEndpoints", [])
+def _iter_endpoint_comments(endpoints: list, now: int) -> Iterator[RawComment]:
+    """Yield comments from legacy ``onResponseReceivedEndpoints`` renderers."""
+    parse_renderer = _parse_comment_renderer
     for endpoint in endpoints:
         items = (
-            endpoint.get("appendContinuationItemsAction", {}).get("continuationItems", [])
-            or endpoint.get("reloadContinuationItemsCommand", {}).get(
-                "continuationItems", []
+            (endpoint.get("appendContinuationItemsAction") or _EMPTY).get("continuationItems")
+            or (endpoint.get("reloadContinuationItemsCommand") or _EMPTY).get(
+                "continuationItems"
             )
+            or ()
         )
         for item in items:
             thread = item.get("commentThreadRenderer")
             if thread:
-                renderer = thread.get("comment", {}).get("commentRenderer")
+                renderer = (thread.get("comment") or _EMPTY).get("commentRenderer")
                 if renderer:
-                    parsed = _parse_comment_renderer(renderer, parent_id="root")
+                    parsed = parse_renderer(renderer, parent_id="root", now=now)
                     if parsed:
-                        comments.append(parsed)
+                        yield parsed
 
-                replies_renderer = thread.get("replies", {}).get(
-                    "commentRepliesRenderer", {}
-                )
-                for reply_item in replies_renderer.get("contents", []):
+                parent_id = renderer.get("commentId", "root") if renderer else "root"
+                replies = (thread.get("replies") or _EMPTY).get("commentRepliesRenderer") or _EMPTY
+                for reply_item in replies.get("contents") or ():
                     reply_renderer = reply_item.get("commentRenderer")
                     if reply_renderer:
-                        parent_id = (
-                            renderer.get("commentId", "root") if renderer else "root"
-                        )
-                        parsed_reply = _parse_comment_renderer(
-                            reply_renderer, parent_id=parent_id
-                        )
-                        if parsed_reply:
-                            comments.append(parsed_reply)
+                        parsed = parse_renderer(reply_renderer, parent_id=parent_id, now=now)
+                        if parsed:
+                            yield parsed
                 continue
 
             bare = item.get("commentRenderer")
             if bare:
-                parsed = _parse_comment_renderer(bare, parent_id="root")
+                parsed = parse_renderer(bare, parent_id="root", now=now)
                 if parsed:
-                    comments.append(parsed)
-
-    return comments
+                    yield parsed
 
 
-def _parse_comment_entity_payload(entity: dict) -> dict[str, Any] | None:
+def _parse_comment_entity_payload(
+    entity: dict, *, now: int | None = None,
+) -> RawComment | None:
     """Parse a ``commentEntityPayload`` (new 2025+ YouTube API format)."""
     try:
-        props = entity.get("properties", {})
-        comment_id = props.get("commentId")
-        if not comment_id:
-            return None
+        props = entity["properties"]
+        comment_id = props["commentId"]
+    except (KeyError, TypeError):
+        return None
+    if not comment_id:
+        return None
 
-        text = props.get("content", {}).get("content", "")
+    try:
+        text = (props.get("content") or _EMPTY).get("content", "")
         published_time = props.get("publishedTime", "")
         reply_level = props.get("replyLevel", 0)
 
-        author_info = entity.get("author", {})
-        author = author_info.get("displayName", "")
+        author = (entity.get("author") or _EMPTY).get("displayName", "")
 
-        toolbar = entity.get("toolbar", {})
+        toolbar = entity.get("toolbar") or _EMPTY
         like_count = _parse_vote_count(toolbar.get("likeCountNotliked", ""))
         reply_count_str = toolbar.get("replyCount", "")
         reply_count = int(reply_count_str) if reply_count_str else 0
 
-        timestamp = _parse_relative_time(published_time)
+        timestamp = _parse_relative_time(published_time, now=now)
         parent_id = "root" if reply_level == 0 else "unknown_parent"
 
-        return {
-            "id": comment_id,
-            "parent": parent_id,
-            "author": author,
-            "text": text,
-            "like_count": like_count,
-            "timestamp": timestamp,
-            "reply_count": reply_count if reply_level == 0 else 0,
-        }
+        return RawComment(
+            id=comment_id,
+            parent=parent_id,
+            author=author,
+            text=text,
+            like_count=like_count,
+            timestamp=timestamp,
+            reply_count=reply_count if reply_level == 0 else 0,
+        )
     except (KeyError, TypeError, ValueError) as exc:
         _logger.debug("Skipping malformed commentEntityPayload: %s", exc)
         return None
 
 
 def _parse_comment_renderer(
-    renderer: dict, parent_id: str = "root",
-) -> dict[str, Any] | None:
-    """Parse a single ``commentRenderer`` (legacy format) into a raw comment dict."""
+    renderer: dict, parent_id: str = "root", *, now: int | None = None,
+) -> RawComment | None:
+    """Parse a single ``commentRenderer`` (legacy format) into a raw comment."""
+    # Optional fields are normally present, so subscripting and catching the
+    # rare KeyError beats .get() chains that allocate {} defaults
     try:
         comment_id = renderer["commentId"]
-        author = renderer.get("authorText", {}).get("simpleText", "")
-        text = _extract_text_from_runs(
-            renderer.get("contentText", {}).get("runs", [])
-        )
-        like_count = _parse_vote_count(
-            renderer.get("voteCount", {}).get("simpleText", "")
-        )
-        timestamp = _parse_relative_time(
-            _extract_text_from_runs(
-                renderer.get("publishedTimeText", {}).get("runs", [])
-            )
-        )
+        try:
+            author = _simple_text(renderer["authorText"])
+        except KeyError:
+            author = ""
+        try:
+            text = _extract_text_from_runs(_runs(renderer["contentText"]))
+        except KeyError:
+            text = ""
+        try:
+            like_count = _parse_vote_count(_simple_text(renderer["voteCount"]))
+        except KeyError:
+            like_count = 0
+        try:
+            published = _extract_text_from_runs(_runs(renderer["publishedTimeText"]))
+        except KeyError:
+            published = ""
+        timestamp = _parse_relative_time(published, now=now)
         reply_count = renderer.get("replyCount", 0) if parent_id == "root" else 0
 
-        return {
-            "id": comment_id,
-            "parent": parent_id,
-            "author": author,
-            "text": text,
-            "like_count": like_count,
-            "timestamp": timestamp,
-            "reply_count": reply_count,
-        }
+        return RawComment(
+            id=comment_id,
+            parent=parent_id,
+            author=author,
+            text=text,
+            like_count=like_count,
+            timestamp=timestamp,
+            reply_count=reply_count,
+        )
     except (KeyError, TypeError) as exc:
         _logger.debug("Skipping malformed comment renderer: %s", exc)
         return None
-
-
-def _extract_text_from_runs(runs: list[dict]) -> str:
-    """Join all ``text`` values from YouTube's runs format."""
-    if not runs:
-        return ""
-    return "".join(run.get("text", "") for run in runs)
-
-
-def _parse_vote_count(text: str) -> int:
-    """Parse YouTube vote count strings.
-
-    Examples: ``"42"`` -> 42, ``"1.2K"`` -> 1200, ``"1.5M"`` -> 1500000, ``""`` -> 0
-    """
-    if not text or not text.strip():
-        return 0
-    text = text.strip()
-    multipliers = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
-    upper = text.upper()
-    for suffix, mult in multipliers.items():
-        if upper.endswith(suffix):
-            try:
-                return int(float(upper[:-1]) * mult)
-            except ValueError:
-                return 0
-    try:
-        return int(text.replace(",", ""))
-    except ValueError:
-        return 0
-
-
-def _parse_relative_time(text: str) -> int | None:
-    """Parse YouTube relative timestamps to Unix epoch seconds.
-
-    Examples: ``"2 days ago"`` -> ``now - 172800``, ``"just now"`` -> ``now``.
-    Strips ``"(edited)"`` suffix. Returns ``None`` if unparseable.
-    """
-    if not text:
-        return None
-
-    text = text.strip()
-    # Strip "(edited)" suffix
-    text = re.sub(r"\s*\(edited\)\s*$", "", text)
-    text = text.strip()
-
-    if not text:
-        return None
-
-    now = int(time.time())
-
-    if text.lower() in ("just now", "0 seconds ago"):
-        return now
-
-    match = re.match(r"(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago", text, re.I)
-    if not match:
-        return None
-
-    amount = int(match.group(1))
-    unit = match.group(2).lower()
-    unit_seconds = {
-        "second": 1,
-        "minute": 60,
-        "hour": 3600,
-        "day": 86400,
-        "week": 604800,
-        "month": 2592000,   # ~30 days
-        "year": 31536000,   # ~365 days
-    }
-
-    return now - amount * unit_seconds.get(unit, 0)
@@ -5,6 +5,7 @@ import time
 from typing import Any
 
 from ..config import Settings
+from ..utils.ytdlp import get_yt_dlp
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +16,7 @@ def collect_comments_ytdlp(video_url: str, cfg: Settings) -> list[dict[str, Any]
     Returns raw comment list from yt-dlp's info dict.
     Retries on failure with exponential backoff.
     """
-    import yt_dlp
+    yt_dlp = get_yt_dlp("the comment collection fallback")
 
     max_comments = cfg.MAX_COMMENTS_PER_VIDEO
     max_thread_depth = cfg.MAX_COMMENT_THREAD_DEPTH
@@ -7,6 +7,7 @@ import urllib.request
 from typing import Any
 
 from ..config import Settings
+from ..utils.ytdlp import get_yt_dlp
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +19,7 @@ def collect_transcript_ytdlp(video_url: str, cfg: Settings) -> dict[str, Any]:
     where entries is a list of {text, start, duration}.
     Retries on failure with exponential backoff.
     """
-    import yt_dlp
+    yt_dlp = get_yt_dlp("transcript collection")
 
     ydl_opts: dict[str, Any] = {
         "skip_download": True,
@@ -56,6 +56,7 @@ class Settings(BaseSettings):
     CAPTURE_ARTIFACTS_ON_ERROR: bool = True
     CAPTURE_ARTIFACTS_ALWAYS: bool = False
     ON_VIDEO_FAILURE: str = "skip"
+    MAX_CONCURRENT_VIDEOS: int = 1          # videos processed in parallel (needs OUTPUT_PER_VIDEO)
 
     @field_validator("ON_VIDEO_FAILURE")
     @classmethod
@@ -92,7 +93,7 @@ class Settings(BaseSettings):
     TRANSCRIPT_CHUNK_OVERLAP_SECONDS: int = 10
 
     # Rate limiting / API safeguards
-    API_MAX_CONCURRENT_CALLS: int = 2
+    API_MAX_CONCURRENT_CALLS: int = 2       # LLM/embedding requests in flight, across all videos
     API_RATE_LIMIT_RPS: float = 2.0
     API_RATE_LIMIT_BURST: int = 4
     API_COOLDOWN_ON_ERROR_S: int = 10
@@ -118,6 +119,8 @@ class Settings(BaseSettings):
     EMBEDDINGS_ENDPOINT: str = "http://localhost:1234/v1"  # for local provider
     EMBEDDINGS_TIMEOUT_S: int = 30
     EMBEDDINGS_MAX_RETRIES: int = 3
+    EMBEDDINGS_BATCH_SIZE: int = 100        # texts per embeddings request
+    EMBEDDINGS_CACHE_SIZE: int = 10_000     # in-memory LRU of vectors; 0 disables
 
     EMBEDDINGS_FALLBACK_TO_SAMPLING: bool = True
     TOPIC_SAMPLING_MAX_COMMENTS_PER_VIDEO: int = 5000
@@ -130,6 +133,11 @@ class Settings(BaseSettings):
     LLM_PROVIDER: Optional[str] = None      # openai|anthropic|google|xai|deepseek|local
     LLM_MODEL: Optional[str] = None
     LLM_ENDPOINT: Optional[str] = None      # for local provider
+    LLM_CACHE_ENABLE: bool = False          # reuse responses to identical requests
+    LLM_CACHE_PATH: str = ".cache/llm_cache.sqlite"
+    LLM_CACHE_TTL_S: int = 604800           # 7 days; <= 0 never expires
+    LLM_SEMANTIC_CACHE_ENABLE: bool = False # also match cached summary prompts by embedding similarity
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = 0.95
 
     # YouTube Data API (rare fallback for discovery)
     YOUTUBE_API_KEY: Optional[str] = None
@@ -137,6 +145,7 @@ class Settings(BaseSettings):
     # NLP toggles
     TM_CLUSTERING: str = "nlp"
     SA_GRANULARITY: list[str] = ["polarity"]
+    SENTIMENT_BATCH_SIZE: int = 50          # items per sentiment LLM prompt
     STRIP_PII: bool = False
 
     # Summarization
@@ -146,6 +155,7 @@ class Settings(BaseSettings):
 
     # URL extraction
     URL_EXTRACTION_ENABLE: bool = True
+    URL_MAX_UNIQUE: int = 100_000           # distinct URLs tracked per video/asset type
 
     # Output structure
     OUTPUT_PER_VIDEO: bool = True       # True → per-video subdirs; False → flat
@@ -5,6 +5,8 @@ import random
 import time
 from typing import Any
 
+from ..utils.ytdlp import get_yt_dlp
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,13 +48,7 @@ def resolve_channel_videos(
 
     Returns a list of dicts: ``{"VIDEO_URL": ..., "VIDEO_ID": ..., "TITLE": ...}``.
     """
-    try:
-        import yt_dlp  # type: ignore[import-untyped]
-    except ImportError:
-        raise RuntimeError(
-            "yt-dlp is required for subscription mode. "
-            "Install with: pip install yt-content-analyzer[scrape]"
-        )
+    yt_dlp = get_yt_dlp("subscription mode")
 
     channel_url = _normalize_channel_url(channel)
     logger.info("Resolving videos from %s (max %d)", channel_url, max_videos)
@@ -5,6 +5,8 @@ import random
 import time
 from typing import Any
 
+from ..utils.ytdlp import get_yt_dlp
+
 logger = logging.getLogger(__name__)
 
 
@@ -19,13 +21,7 @@ def resolve_search_videos(
 
     Returns a list of dicts: ``{"VIDEO_URL": ..., "VIDEO_ID": ..., "TITLE": ..., "SEARCH_TERM": term}``.
     """
-    try:
-        import yt_dlp  # type: ignore[import-untyped]
-    except ImportError:
-        raise RuntimeError(
-            "yt-dlp is required for search-term discovery. "
-            "Install with: pip install yt-content-analyzer[scrape]"
-        )
+    yt_dlp = get_yt_dlp("search-term discovery")
 
     search_url = f"ytsearch{max_videos}:{term}"
     logger.info("Searching YouTube for %r (max %d videos)", term, max_videos)
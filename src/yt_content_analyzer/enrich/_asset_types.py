@@ -0,0 +1,18 @@
+"""Helpers for enrichment stages that take one asset type or one per item."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+
+def _asset_types_for(items: Sequence[dict], asset_type: str | Sequence[str]) -> Sequence[str]:
+    """Expand *asset_type* to one entry per item (a sequence is used as-is)."""
+    if isinstance(asset_type, str):
+        return [asset_type] * len(items)
+    return asset_type
+
+
+def _asset_label(asset_type: str | Sequence[str]) -> str:
+    """Name *asset_type* for logs and fallbacks, e.g. ``"comments+transcripts"``."""
+    if isinstance(asset_type, str):
+        return asset_type
+    return "+".join(dict.fromkeys(asset_type))
@@ -4,7 +4,7 @@ import logging
 import time
 
 from ..config import Settings
-from .llm_client import get_embeddings
+from .llm_client import get_embeddings, map_api_calls
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +12,9 @@ logger = logging.getLogger(__name__)
 def compute_embeddings(texts: list[str], cfg: Settings) -> list[list[float]] | None:
     """Compute embeddings for a list of texts.
 
+    Texts are sent in batches of EMBEDDINGS_BATCH_SIZE, with up to
+    API_MAX_CONCURRENT_CALLS batches in flight at once.
+
     Returns list of embedding vectors, or None if embeddings are disabled
     or fail with fallback enabled.
     """
@@ -23,36 +26,44 @@ def compute_embeddings(texts: list[str], cfg: Settings) -> list[list[float]] | N
     if not texts:
         return []
 
-    batch_size = 100
+    batch_size = max(1, cfg.EMBEDDINGS_BATCH_SIZE)
     max_retries = cfg.EMBEDDINGS_MAX_RETRIES
     backoff_base = cfg.BACKOFF_BASE_SECONDS
-    all_embeddings: list[list[float]] = []
+    batches = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+    total_batches = len(batches)
 
-    try:
-        total_batches = (len(texts) + batch_size - 1) // batch_size
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
-            batch_num = i // batch_size + 1
+    def embed_batch(numbered: tuple[int, list[str]]) -> list[list[float]]:
+        batch_num, batch = numbered
+        for attempt in range(max_retries):
+            try:
+                batch_embeddings = get_embeddings(cfg, batch)
+                break
+            except Exception:
+                if attempt == max_retries - 1:
+                    raise
+                wait = backoff_base * (2 ** attempt)
+                logger.warning(
+                    "Embeddings batch %d/%d attempt %d failed, retrying in %.1fs",
+                    batch_num, total_batches, attempt + 1, wait,
+                )
+                time.sleep(wait)
+        else:  # EMBEDDINGS_MAX_RETRIES <= 0: no attempts allowed
+            return []
 
-            for attempt in range(max_retries):
-                try:
-                    batch_embeddings = get_embeddings(cfg, batch)
-                    all_embeddings.extend(batch_embeddings)
-                    break
-                except Exception:
-                    if attempt == max_retries - 1:
-                        raise
-                    wait = backoff_base * (2 ** attempt)
-                    logger.warning(
-                        "Embeddings batch %d/%d attempt %d failed, retrying in %.1fs",
-                        batch_num, total_batches, attempt + 1, wait,
-                    )
-                    time.sleep(wait)
+        logger.info(
+            "Embeddings batch %d/%d complete (%d texts)",
+            batch_num, total_batches, len(batch),
+        )
+        return batch_embeddings
 
-            logger.info(
-                "Embeddings batch %d/%d complete (%d texts)",
-                batch_num, total_batches, len(batch),
-            )
+    try:
+        all_embeddings: list[list[float]] = []
+        for batch_result in map_api_calls(
+            embed_batch, list(enumerate(batches, start=1)), cfg.API_MAX_CONCURRENT_CALLS,
+        ):
+            if isinstance(batch_result, Exception):
+                raise batch_result
+            all_embeddings.extend(batch_result)
         return all_embeddings
     except Exception as e:
         if cfg.EMBEDDINGS_FALLBACK_TO_SAMPLING:
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+_logger = logging.getLogger(__name__)
+
+# (request scope, SHA-1 digest of the text)
+EmbeddingKey = tuple[tuple[str, ...], bytes]
+
+# Semantic entries kept per scope; the oldest are deleted beyond this
+SEMANTIC_MAX_ROWS_PER_SCOPE = 1000
+
+
+def cache_key(**request: Any) -> str:
+    """Return a stable SHA-256 key for the request fields in *request*."""
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _norm(vector: Sequence[float]) -> float:
+    return math.sqrt(math.fsum(x * x for x in vector))
+
+
+class ResponseCache:
+    """SQLite cache of LLM responses.
+
+    Exact entries are keyed by :func:`cache_key`. Semantic entries store the
+    prompt embedding within a *scope* (the non-prompt request fields) and are
+    matched by cosine similarity, see :meth:`nearest`; each scope keeps at
+    most *max_semantic_rows* of them. Entries older than *ttl_s* seconds are
+    ignored (``ttl_s <= 0`` keeps them forever). SQLite
+    errors are logged and treated as misses, so a broken cache file never
+    fails the request it was meant to speed up.
+    """
+
+    def __init__(
+        self, path: Path, ttl_s: int, max_semantic_rows: int = SEMANTIC_MAX_ROWS_PER_SCOPE,
+    ) -> None:
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_semantic_rows = max_semantic_rows
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS semantic "
+            "(scope TEXT NOT NULL, embedding BLOB NOT NULL, norm REAL NOT NULL, "
+            "response TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        # One row per (scope, prompt embedding); drop duplicates left by older
+        # versions before the unique index can be built
+        self._conn.execute(
+            "DELETE FROM semantic WHERE rowid NOT IN "
+            "(SELECT MAX(rowid) FROM semantic GROUP BY scope, embedding)"
+        )
+        self._conn.execute("DROP INDEX IF EXISTS semantic_scope")
+        self._conn.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS semantic_entry ON semantic (scope, embedding)"
+        )
+
+    def _min_ts(self) -> int:
+        return int(time.time()) - self.ttl_s if self.ttl_s > 0 else 0
+
+    def get(self, key: str) -> str | None:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response, ts FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            _logger.warning("LLM cache read failed (%s)", self.path, exc_info=True)
+            return None
+        if row is None:
+            return None
+        response, ts = row
+        if ts < self._min_ts():
+            return None
+        result: str = response
+        return result
+
+    def put(self, key: str, response: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                    (key, response, int(time.time())),
+                )
+        except sqlite3.Error:
+            _logger.warning("LLM cache write failed (%s)", self.path, exc_info=True)
+
+    def nearest(self, scope: str, embedding: Sequence[float], threshold: float) -> str | None:
+        """Return the cached response most similar to *embedding* in *scope*.
+
+        Only a match with cosine similarity >= *threshold* counts. This is a
+        linear scan of the scope's unexpired entries, which
+        :meth:`put_semantic` keeps to at most ``max_semantic_rows``.
+        """
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT embedding, norm, response FROM semantic WHERE scope = ? AND ts >= ?",
+                    (scope, self._min_ts()),
+                ).fetchall()
+        except sqlite3.Error:
+            _logger.warning("LLM cache read failed (%s)", self.path, exc_info=True)
+            return None
+        query_norm = _norm(embedding)
+        if not query_norm:
+            return None
+        best_score = threshold
+        best: str | None = None
+        for blob, norm, response in rows:
+            stored = array("f")
+            stored.frombytes(blob)
+            if len(stored) != len(embedding) or not norm:
+                continue  # embedded by a different model
+            score = math.fsum(x * y for x, y in zip(embedding, stored)) / (query_norm * norm)
+            if score >= best_score:
+                best_score, best = score, response
+        return best
+
+    def put_semantic(self, scope: str, embedding: Sequence[float], response: str) -> None:
+        """Store *response* for *embedding* in *scope*.
+
+        An entry for the same embedding is replaced, expired entries are
+        deleted, and only the newest ``max_semantic_rows`` of the scope kept.
+        """
+        vector = array("f", embedding)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO semantic (scope, embedding, norm, response, ts) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (scope, vector.tobytes(), _norm(vector), response, int(time.time())),
+                )
+                if self.ttl_s > 0:
+                    self._conn.execute("DELETE FROM semantic WHERE ts < ?", (self._min_ts(),))
+                self._conn.execute(
+                    "DELETE FROM semantic WHERE scope = ? AND rowid NOT IN "
+                    "(SELECT rowid FROM semantic WHERE scope = ? "
+                    "ORDER BY ts DESC, rowid DESC LIMIT ?)",
+                    (scope, scope, self.max_semantic_rows),
+                )
+        except sqlite3.Error:
+            _logger.warning("LLM cache write failed (%s)", self.path, exc_info=True)
+
+
+class EmbeddingLRU:
+    """Thread-safe in-memory LRU of embedding vectors.
+
+    Keys are built by :func:`embedding_key`, so long texts are held as a
+    20-byte digest rather than the text itself.
+    """
+
+    def __init__(self) -> None:
+        self._data: OrderedDict[EmbeddingKey, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, keys: Sequence[EmbeddingKey]) -> list[list[float] | None]:
+        """Return the cached vector (or None) for each key, marking hits as recent."""
+        out: list[list[float] | None] = []
+        with self._lock:
+            for key in keys:
+                vector = self._data.get(key)
+                if vector is not None:
+                    self._data.move_to_end(key)
+                out.append(vector)
+        return out
+
+    def store(self, items: dict[EmbeddingKey, list[float]], maxsize: int) -> None:
+        """Insert *items*, evicting least recently used entries beyond *maxsize*."""
+        with self._lock:
+            self._data.update(items)
+            for key in items:
+                self._data.move_to_end(key)
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def embedding_key(scope: tuple[str, ...], text: str) -> EmbeddingKey:
+    """Key an embedding by its request scope (endpoint, model) and text digest."""
+    return scope, hashlib.sha1(text.encode("utf-8"), usedforsecurity=False).digest()
+
+
+# Shared by every get_embeddings call in the process
+embedding_cache = EmbeddingLRU()
+
+
+@lru_cache(maxsize=8)
+def get_response_cache(path: str, ttl_s: int) -> ResponseCache | None:
+    """Return the shared cache for *path*, or None if it can't be opened."""
+    try:
+        return ResponseCache(Path(path), ttl_s)
+    except (OSError, sqlite3.Error):
+        _logger.warning(
+            "LLM cache unavailable at %s — continuing without it", path, exc_info=True
+        )
+        return None
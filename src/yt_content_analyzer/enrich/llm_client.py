@@ -1,17 +1,34 @@
 from __future__ import annotations
 
+import atexit
+import http.client
+import io
 import json
 import logging
 import re
+import threading
 import time
 import urllib.error
 import urllib.request
-from typing import Any
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
 
 from ..config import Settings, resolve_api_key
+from .llm_cache import cache_key, embedding_cache, embedding_key, get_response_cache
 
 logger = logging.getLogger(__name__)
 
+# parse_json_response: markdown fences, and the outermost {...} / [...] span
+_FENCE_RE = re.compile(r"```(?:json)?\s*\n?")
+_JSON_OBJECT_RE = re.compile(r"\{[\s\S]*\}")
+_JSON_ARRAY_RE = re.compile(r"\[[\s\S]*\]")
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 # Known base URLs per provider (OpenAI-compatible endpoints)
 PROVIDER_BASE_URLS: dict[str, str] = {
     "openai": "https://api.openai.com/v1",
@@ -22,6 +39,7 @@ PROVIDER_BASE_URLS: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=64)
 def _resolve_base_url(provider: str, endpoint: str | None) -> str:
     """Resolve the base URL for a provider."""
     if provider in ("local", "ollama") and endpoint:
@@ -31,14 +49,131 @@ def _resolve_base_url(provider: str, endpoint: str | None) -> str:
     return PROVIDER_BASE_URLS.get(provider, "http://localhost:11434/v1")
 
 
+@lru_cache(maxsize=8)
+def _request_slots(max_concurrent: int) -> threading.BoundedSemaphore:
+    """Return the process-wide semaphore capping in-flight API requests.
+
+    Every chat and embedding POST holds a slot, so API_MAX_CONCURRENT_CALLS
+    bounds the total across enrichment stages, batch pools and videos.
+    """
+    return threading.BoundedSemaphore(max(max_concurrent, 1))
+
+
+# Idle keep-alive connections per (scheme, host), shared by every thread, so
+# repeated LLM and embedding calls skip the TCP/TLS handshake
+_idle_connections: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+_idle_lock = threading.Lock()
+# Idle connections kept per host; extras are closed when returned
+_MAX_IDLE_PER_HOST = 16
+# How a server that closed an idle keep-alive connection shows up on reuse;
+# the request never reached it, so it is safe to send once more
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError,
+)
+
+
+@lru_cache(maxsize=1)
+def _proxied_schemes() -> frozenset[str]:
+    """URL schemes with a proxy configured, read from the environment once."""
+    return frozenset(urllib.request.getproxies())
+
+
+def _new_connection(scheme: str, netloc: str, timeout: int) -> http.client.HTTPConnection:
+    conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+    return conn_cls(netloc, timeout=timeout)
+
+
+def _checkout_connection(
+    scheme: str, netloc: str, timeout: int,
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Return ``(connection, reused)`` for *netloc*, taking an idle one if any."""
+    with _idle_lock:
+        idle = _idle_connections.get((scheme, netloc))
+        conn = idle.pop() if idle else None
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+    return _new_connection(scheme, netloc, timeout), False
+
+
+def _checkin_connection(scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+    """Return *conn* to the idle pool, or close it if the pool is full."""
+    with _idle_lock:
+        idle = _idle_connections.setdefault((scheme, netloc), [])
+        if len(idle) < _MAX_IDLE_PER_HOST:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _close_idle_connections() -> None:
+    """Close every idle pooled connection (also run at interpreter exit)."""
+    with _idle_lock:
+        conns = [conn for idle in _idle_connections.values() for conn in idle]
+        _idle_connections.clear()
+    for conn in conns:
+        conn.close()
+
+
+atexit.register(_close_idle_connections)
+
+
+def _http_post(url: str, body: bytes, headers: dict, timeout: int) -> bytes:
+    """POST *body* to *url* over a pooled keep-alive connection.
+
+    Raises :class:`urllib.error.HTTPError` for error statuses and
+    :class:`urllib.error.URLError` for connection failures, like ``urlopen``.
+    Falls back to ``urlopen`` when a proxy is configured for the scheme. A
+    pooled connection the server has already closed is replaced and the
+    request sent once more; any other failure, including a timeout, is
+    raised right away and left to the caller's retry policy.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or parts.scheme in _proxied_schemes():
+        req = urllib.request.Request(url, data=body, headers=headers, method="POST")
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            data: bytes = resp.read()
+            return data
+
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    conn, reused = _checkout_connection(parts.scheme, parts.netloc, timeout)
+    while True:
+        try:
+            conn.request("POST", path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except _STALE_CONNECTION_ERRORS as exc:
+            conn.close()
+            if not reused:
+                raise urllib.error.URLError(exc) from exc
+            # The server closed the idle connection; retry once on a new one
+            conn, reused = _new_connection(parts.scheme, parts.netloc, timeout), False
+            continue
+        except (OSError, http.client.HTTPException) as exc:
+            conn.close()
+            raise urllib.error.URLError(exc) from exc
+        break
+    if resp.will_close:
+        conn.close()
+    else:
+        _checkin_connection(parts.scheme, parts.netloc, conn)
+    if resp.status >= 400:
+        raise urllib.error.HTTPError(
+            url, resp.status, resp.reason, resp.headers, io.BytesIO(data)
+        )
+    return data
+
+
 def _post_json(url: str, payload: dict, headers: dict, timeout: int) -> dict[str, Any]:
     """POST JSON and return parsed response dict."""
     body = json.dumps(payload).encode("utf-8")
     headers.setdefault("User-Agent", "yt-content-analyzer")
-    req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        result: dict[str, Any] = json.loads(resp.read().decode("utf-8"))
-        return result
+    result: dict[str, Any] = json.loads(_http_post(url, body, headers, timeout).decode("utf-8"))
+    return result
 
 
 def chat_completion(
@@ -47,10 +182,21 @@ def chat_completion(
     *,
     temperature: float = 0.3,
     max_tokens: int = 2048,
+    semantic_scope: tuple[str, ...] | None = None,
 ) -> str:
     """Send a chat completion request to an OpenAI-compatible API.
 
-    Returns the assistant message content string.
+    Returns the assistant message content string. With LLM_CACHE_ENABLE,
+    responses are cached on disk and an identical request (same provider,
+    endpoint, model, messages and sampling parameters) within
+    LLM_CACHE_TTL_S seconds is answered from the cache. With
+    LLM_SEMANTIC_CACHE_ENABLE, callers passing a *semantic_scope* (e.g.
+    ``(video_id, asset_type)``) also get a cached response from the same
+    scope whose prompt embedding is at least LLM_SEMANTIC_CACHE_THRESHOLD
+    cosine-similar to theirs (with otherwise identical parameters). Only
+    opt in where a near-duplicate prompt's answer
+    is acceptable, e.g. summaries — not for prompts whose response refers
+    back to the items sent.
     """
     provider = cfg.LLM_PROVIDER or "local"
     base_url = _resolve_base_url(provider, cfg.LLM_ENDPOINT)
@@ -69,14 +215,41 @@ def chat_completion(
     if cfg.LLM_MODEL:
         payload["model"] = cfg.LLM_MODEL
 
+    use_semantic = semantic_scope is not None and cfg.LLM_SEMANTIC_CACHE_ENABLE
+    cache = (
+        get_response_cache(cfg.LLM_CACHE_PATH, cfg.LLM_CACHE_TTL_S)
+        if cfg.LLM_CACHE_ENABLE or use_semantic else None
+    )
+    embedding: list[float] | None = None
+    if cache is not None:
+        key = cache_key(url=url, **payload)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if use_semantic:
+            scope = cache_key(
+                url=url, semantic_scope=semantic_scope,
+                **{k: v for k, v in payload.items() if k != "messages"},
+            )
+            embedding = _embed_prompt(cfg, messages)
+            if embedding is not None:
+                cached = cache.nearest(scope, embedding, cfg.LLM_SEMANTIC_CACHE_THRESHOLD)
+                if cached is not None:
+                    return cached
+
     max_retries = cfg.API_MAX_RETRIES
     backoff = cfg.BACKOFF_BASE_SECONDS
     timeout = cfg.API_TIMEOUT_S
 
     for attempt in range(max_retries + 1):
         try:
-            data = _post_json(url, payload, headers, timeout)
+            with _request_slots(cfg.API_MAX_CONCURRENT_CALLS):
+                data = _post_json(url, payload, headers, timeout)
             content: str = data["choices"][0]["message"]["content"]
+            if cache is not None:
+                cache.put(key, content)
+                if embedding is not None:
+                    cache.put_semantic(scope, embedding, content)
             return content
         except urllib.error.HTTPError as e:
             if e.code in (429, 500, 502, 503, 504) and attempt < max_retries:
@@ -102,15 +275,71 @@ def chat_completion(
     raise RuntimeError("Exhausted retries for chat_completion")
 
 
+def _embed_prompt(cfg: Settings, messages: list[dict[str, str]]) -> list[float] | None:
+    """Embed the text of *messages* for the semantic cache; None on failure."""
+    prompt = "\n\n".join(f"{m.get('role', '')}: {m.get('content', '')}" for m in messages)
+    try:
+        return get_embeddings(cfg, [prompt])[0]
+    except Exception:
+        logger.warning("Semantic cache lookup skipped: prompt embedding failed", exc_info=True)
+        return None
+
+
+def map_api_calls(
+    func: Callable[[_T], _R], args: Sequence[_T], max_workers: int,
+) -> list[_R | Exception]:
+    """Call *func* on each of *args*, up to *max_workers* at a time.
+
+    Results come back in input order. A call that raises has its exception
+    returned in its slot instead, so one failed batch doesn't sink the rest.
+    The HTTP requests themselves are also capped process-wide, see
+    :func:`_request_slots`.
+    """
+
+    def call(arg: _T) -> _R | Exception:
+        try:
+            return func(arg)
+        except Exception as exc:  # noqa: BLE001 — handed back to the caller
+            return exc
+
+    workers = min(max(max_workers, 1), len(args))
+    if workers <= 1:
+        return [call(arg) for arg in args]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="llm") as pool:
+        return list(pool.map(call, args))
+
+
 def get_embeddings(cfg: Settings, texts: list[str]) -> list[list[float]]:
     """Get embeddings from an OpenAI-compatible /v1/embeddings endpoint.
 
-    Returns a list of embedding vectors (one per input text).
+    Returns a list of embedding vectors (one per input text). The last
+    EMBEDDINGS_CACHE_SIZE vectors are kept in memory per endpoint and model,
+    so repeated texts are only sent once; set it to 0 to disable.
     """
     provider = cfg.EMBEDDINGS_PROVIDER or "local"
     base_url = _resolve_base_url(provider, cfg.EMBEDDINGS_ENDPOINT)
     url = f"{base_url}/embeddings"
 
+    cache_size = cfg.EMBEDDINGS_CACHE_SIZE
+    if cache_size <= 0:
+        return _request_embeddings(cfg, provider, url, texts)
+
+    scope = (url, cfg.EMBEDDINGS_MODEL or "")
+    keys = [embedding_key(scope, text) for text in texts]
+    vectors = embedding_cache.lookup(keys)
+    # Each distinct uncached text is requested once
+    missing = {key: text for key, text, vec in zip(keys, texts, vectors) if vec is None}
+    if missing:
+        new_vectors = _request_embeddings(cfg, provider, url, list(missing.values()))
+        fetched = dict(zip(missing, new_vectors))
+        embedding_cache.store(fetched, cache_size)
+        vectors = [fetched[key] if vec is None else vec for key, vec in zip(keys, vectors)]
+    return vectors  # type: ignore[return-value]  # no None left
+
+
+def _request_embeddings(
+    cfg: Settings, provider: str, url: str, texts: list[str],
+) -> list[list[float]]:
     api_key = resolve_api_key(provider)
     headers: dict[str, str] = {"Content-Type": "application/json"}
     if api_key:
@@ -122,7 +351,8 @@ def get_embeddings(cfg: Settings, texts: list[str]) -> list[list[float]]:
 
     timeout = cfg.EMBEDDINGS_TIMEOUT_S
 
-    data = _post_json(url, payload, headers, timeout)
+    with _request_slots(cfg.API_MAX_CONCURRENT_CALLS):
+        data = _post_json(url, payload, headers, timeout)
     # Sort by index to ensure order matches input
     sorted_data = sorted(data["data"], key=lambda x: x["index"])
     return [item["embedding"] for item in sorted_data]
@@ -133,30 +363,29 @@ def parse_json_response(text: str) -> Any:
 
     Strips markdown code fences, extracts first JSON object or array.
     """
+    # Clean JSON (the common case) needs no regex work
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
     # Strip markdown code fences
-    text = re.sub(r"```(?:json)?\s*\n?", "", text)
+    if "```" in text:
+        text = _FENCE_RE.sub("", text)
     text = text.strip()
 
-    # Try direct parse first
     try:
         return json.loads(text)
     except json.JSONDecodeError:
         pass
 
-    # Extract first JSON object
-    match = re.search(r"\{[\s\S]*\}", text)
-    if match:
-        try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
-            pass
-
-    # Extract first JSON array
-    match = re.search(r"\[[\s\S]*\]", text)
-    if match:
-        try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
-            pass
+    # Extract first JSON object, then first JSON array
+    for pattern in (_JSON_OBJECT_RE, _JSON_ARRAY_RE):
+        match = pattern.search(text)
+        if match:
+            try:
+                return json.loads(match.group())
+            except json.JSONDecodeError:
+                pass
 
     raise ValueError(f"Could not parse JSON from LLM response: {text[:200]}")
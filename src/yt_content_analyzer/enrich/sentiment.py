@@ -1,34 +1,93 @@
 from __future__ import annotations
 
 import logging
+import urllib.error
+from collections.abc import Sequence
+from functools import lru_cache, partial
+from typing import Any
 
 from ..config import Settings
-from .llm_client import chat_completion, parse_json_response
+from ._asset_types import _asset_label, _asset_types_for
+from .llm_client import chat_completion, map_api_calls, parse_json_response
 
 logger = logging.getLogger(__name__)
 
 
+def _is_context_overflow(exc: Exception) -> bool:
+    """True if *exc* is the API rejecting a prompt as too long for the model."""
+    if not isinstance(exc, urllib.error.HTTPError) or exc.code not in (400, 413):
+        return False
+    if exc.code == 413:
+        return True
+    try:
+        body = exc.read().lower()
+    except (OSError, ValueError):  # body unreadable or already closed
+        return False
+    return any(marker in body for marker in (b"context_length", b"context length", b"too long"))
+
+
+def _sentiment_messages(batch_items: list[dict]) -> list[dict[str, str]]:
+    numbered = "\n".join(
+        f'[{bi["id"]}] {bi["text"]}' for bi in batch_items
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are a sentiment analysis assistant. Analyze the sentiment of each text. "
+                "Return ONLY valid JSON."
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Classify the sentiment of each text below.\n\n"
+                f"{numbered}\n\n"
+                "Return JSON in this exact format:\n"
+                '{"results": [\n'
+                '  {"id": "item_id", "polarity": "positive|negative|neutral", '
+                '"score": 0.85}\n'
+                "]}\n\n"
+                "- polarity: positive, negative, or neutral\n"
+                "- score: confidence from -1.0 (most negative) to 1.0 (most positive)"
+            ),
+        },
+    ]
+
+
+@lru_cache(maxsize=1)
+def _sentiment_analyzer() -> Any:
+    """TextBlob's default (pattern) sentiment analyzer, created once per process."""
+    from textblob.sentiments import PatternAnalyzer
+
+    return PatternAnalyzer()
+
+
 def analyze_sentiment_nlp(
     items: list[dict],
     video_id: str,
-    asset_type: str,
+    asset_type: str | Sequence[str],
     cfg: Settings,
 ) -> list[dict]:
     """Analyze sentiment using TextBlob (NLP fallback).
 
+    *asset_type* is either one type for all items or a per-item sequence.
+
     Returns list of dicts with keys:
     VIDEO_ID, ASSET_TYPE, ITEM_ID, POLARITY, SCORE, TEXT_EXCERPT
     """
-    from textblob import TextBlob
-
+    analyze = _sentiment_analyzer().analyze
+    # Short comments repeat a lot ("first!", emoji-only, copypasta); score each text once
+    scores: dict[str, float] = {}
     results: list[dict] = []
-    for item in items:
+    for item, item_asset_type in zip(items, _asset_types_for(items, asset_type)):
         text = item.get("TEXT", "")
         if not text.strip():
             continue
 
-        blob = TextBlob(text)
-        score = round(blob.sentiment.polarity, 4)
+        score = scores.get(text)
+        if score is None:
+            score = scores[text] = round(analyze(text).polarity, 4)
 
         if score > 0.1:
             polarity = "positive"
@@ -41,7 +100,7 @@ def analyze_sentiment_nlp(
 
         results.append({
             "VIDEO_ID": video_id,
-            "ASSET_TYPE": asset_type,
+            "ASSET_TYPE": item_asset_type,
             "ITEM_ID": str(item_id),
             "POLARITY": polarity,
             "SCORE": score,
@@ -54,12 +113,16 @@ def analyze_sentiment_nlp(
 def analyze_sentiment_llm(
     items: list[dict],
     video_id: str,
-    asset_type: str,
+    asset_type: str | Sequence[str],
     cfg: Settings,
 ) -> list[dict]:
     """Analyze sentiment using an LLM.
 
-    Batches items in groups of 50, asks LLM to classify polarity and score.
+    Batches SENTIMENT_BATCH_SIZE items per prompt, asks LLM to classify
+    polarity and score. Up to API_MAX_CONCURRENT_CALLS batches are in flight
+    at once; a batch rejected as too long for the model's context is split in
+    half and retried. *asset_type* is either one type for all items or a
+    per-item sequence, so comments and transcript chunks can share batches.
 
     Returns list of dicts with keys:
     VIDEO_ID, ASSET_TYPE, ITEM_ID, POLARITY, SCORE, TEXT_EXCERPT
@@ -67,79 +130,85 @@ def analyze_sentiment_llm(
     if not items:
         return []
 
-    batch_size = 50
+    batch_size = max(1, cfg.SENTIMENT_BATCH_SIZE)
     results: list[dict] = []
+    asset_types = _asset_types_for(items, asset_type)
+    asset_label = _asset_label(asset_type)
 
+    pending: list[tuple[int, list[dict]]] = []
     for batch_start in range(0, len(items), batch_size):
         batch = items[batch_start : batch_start + batch_size]
+        batch_types = asset_types[batch_start : batch_start + batch_size]
         batch_items = []
-        for item in batch:
+        for item, item_asset_type in zip(batch, batch_types):
             text = item.get("TEXT", "")
             if not text.strip():
                 continue
             item_id = item.get("COMMENT_ID") or item.get("CHUNK_INDEX", "")
-            batch_items.append({"id": str(item_id), "text": text[:500]})
+            batch_items.append(
+                {"id": str(item_id), "text": text[:500], "asset_type": item_asset_type}
+            )
 
         if not batch_items:
             continue
 
-        numbered = "\n".join(
-            f'[{bi["id"]}] {bi["text"]}' for bi in batch_items
-        )
-
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are a sentiment analysis assistant. Analyze the sentiment of each text. "
-                    "Return ONLY valid JSON."
-                ),
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Classify the sentiment of each text below.\n\n"
-                    f"{numbered}\n\n"
-                    "Return JSON in this exact format:\n"
-                    '{"results": [\n'
-                    '  {"id": "item_id", "polarity": "positive|negative|neutral", '
-                    '"score": 0.85}\n'
-                    "]}\n\n"
-                    "- polarity: positive, negative, or neutral\n"
-                    "- score: confidence from -1.0 (most negative) to 1.0 (most positive)"
-                ),
-            },
-        ]
-
+        pending.append((batch_start, batch_items))
         logger.info(
             "Sentiment LLM batch %d-%d of %d",
             batch_start, batch_start + len(batch_items), len(items),
         )
 
-        try:
-            raw = chat_completion(cfg, messages, temperature=0.1, max_tokens=2048)
-            parsed = parse_json_response(raw)
-        except Exception:
-            logger.warning(
-                "Sentiment LLM batch %d failed for %s/%s — skipping batch",
-                batch_start, video_id, asset_type, exc_info=True,
-            )
-            continue
-        llm_results = parsed.get("results", []) if isinstance(parsed, dict) else []
-
-        # Build lookup for IDs
-        text_lookup = {bi["id"]: bi["text"] for bi in batch_items}
-
-        for r in llm_results:
-            rid = str(r.get("id", ""))
-            results.append({
-                "VIDEO_ID": video_id,
-                "ASSET_TYPE": asset_type,
-                "ITEM_ID": rid,
-                "POLARITY": r.get("polarity", "neutral"),
-                "SCORE": round(float(r.get("score", 0)), 4),
-                "TEXT_EXCERPT": text_lookup.get(rid, "")[:200],
-            })
+    # Keyed by batch start; split halves get distinct starts within their batch
+    batch_results: dict[int, list[dict]] = {}
+    while pending:
+        raws = map_api_calls(
+            partial(chat_completion, cfg, temperature=0.1, max_tokens=2048),
+            [_sentiment_messages(batch_items) for _, batch_items in pending],
+            cfg.API_MAX_CONCURRENT_CALLS,
+        )
+        retry: list[tuple[int, list[dict]]] = []
+        for (batch_start, batch_items), raw in zip(pending, raws):
+            if isinstance(raw, Exception) and len(batch_items) > 1 and _is_context_overflow(raw):
+                half = len(batch_items) // 2
+                logger.info(
+                    "Sentiment LLM batch %d exceeds the model context — splitting %d items",
+                    batch_start, len(batch_items),
+                )
+                retry.append((batch_start, batch_items[:half]))
+                retry.append((batch_start + half, batch_items[half:]))
+                continue
+            try:
+                if isinstance(raw, Exception):
+                    raise raw
+                parsed = parse_json_response(raw)
+            except Exception:
+                logger.warning(
+                    "Sentiment LLM batch %d failed for %s/%s — skipping batch",
+                    batch_start, video_id, asset_label, exc_info=True,
+                )
+                continue
+            llm_results = parsed.get("results", []) if isinstance(parsed, dict) else []
+
+            # Build lookup for IDs
+            item_lookup = {bi["id"]: bi for bi in batch_items}
+
+            rows: list[dict] = []
+            batch_results[batch_start] = rows
+            for r in llm_results:
+                rid = str(r.get("id", ""))
+                source = item_lookup.get(rid, {})
+                rows.append({
+                    "VIDEO_ID": video_id,
+                    "ASSET_TYPE": source.get("asset_type", asset_label),
+                    "ITEM_ID": rid,
+                    "POLARITY": r.get("polarity", "neutral"),
+                    "SCORE": round(float(r.get("score", 0)), 4),
+                    "TEXT_EXCERPT": source.get("text", "")[:200],
+                })
+        pending = retry
+
+    for batch_start in sorted(batch_results):
+        results.extend(batch_results[batch_start])
 
     return results
 
@@ -147,7 +216,7 @@ def analyze_sentiment_llm(
 def analyze_sentiment(
     items: list[dict],
     video_id: str,
-    asset_type: str,
+    asset_type: str | Sequence[str],
     cfg: Settings,
 ) -> list[dict]:
     """Dispatch sentiment analysis: LLM if configured, NLP fallback otherwise."""
@@ -90,6 +90,7 @@ def summarize_content(
     try:
         raw = chat_completion(
             cfg, messages, temperature=0.3, max_tokens=cfg.SUMMARY_MAX_RESPONSE_TOKENS,
+            semantic_scope=(video_id, asset_type),
         )
         parsed = parse_json_response(raw)
     except Exception:
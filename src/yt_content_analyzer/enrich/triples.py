@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Sequence
+from functools import partial
 
 from ..config import Settings
-from .llm_client import chat_completion, parse_json_response
+from ._asset_types import _asset_label, _asset_types_for
+from .llm_client import chat_completion, map_api_calls, parse_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -11,13 +14,16 @@ logger = logging.getLogger(__name__)
 def extract_triples(
     items: list[dict],
     video_id: str,
-    asset_type: str,
+    asset_type: str | Sequence[str],
     cfg: Settings,
 ) -> list[dict]:
     """Extract subject-predicate-object triples using an LLM.
 
     LLM-only: returns [] with a warning if no LLM provider is configured.
-    Batches items in groups of 20.
+    Batches items in groups of 20, with up to API_MAX_CONCURRENT_CALLS batches
+    in flight at once. *asset_type* is either one type for all
+    items or a per-item sequence, so comments and transcript chunks can share
+    batches.
 
     Returns list of dicts with keys:
     VIDEO_ID, ASSET_TYPE, SUBJECT, PREDICATE, OBJECT, CONFIDENCE, SOURCE_TEXT
@@ -31,22 +37,32 @@ def extract_triples(
 
     batch_size = 20
     results: list[dict] = []
+    asset_types = _asset_types_for(items, asset_type)
+    asset_label = _asset_label(asset_type)
 
+    batches: list[tuple[int, list[dict[str, str]]]] = []
+    batch_messages: list[list[dict[str, str]]] = []
     for batch_start in range(0, len(items), batch_size):
         batch = items[batch_start : batch_start + batch_size]
+        batch_types = asset_types[batch_start : batch_start + batch_size]
         batch_texts: list[dict[str, str]] = []
-        for item in batch:
+        for item, item_asset_type in zip(batch, batch_types):
             text = item.get("TEXT", "")
             if not text.strip():
                 continue
-            batch_texts.append({"index": str(batch_start + len(batch_texts)), "text": text[:500]})
+            batch_texts.append({
+                "index": str(batch_start + len(batch_texts)),
+                "text": text[:500],
+                "asset_type": item_asset_type,
+            })
 
         if not batch_texts:
             continue
 
         numbered = "\n".join(f'[{bt["index"]}] {bt["text"]}' for bt in batch_texts)
 
-        messages = [
+        batches.append((batch_start, batch_texts))
+        batch_messages.append([
             {
                 "role": "system",
                 "content": (
@@ -72,36 +88,47 @@ def extract_triples(
                     "- source_index: index of the source text"
                 ),
             },
-        ]
+        ])
 
         logger.info(
             "Triples LLM batch %d-%d of %d",
             batch_start, batch_start + len(batch_texts), len(items),
         )
 
+    raws = map_api_calls(
+        partial(chat_completion, cfg, temperature=0.2, max_tokens=2048),
+        batch_messages,
+        cfg.API_MAX_CONCURRENT_CALLS,
+    )
+
+    for (batch_start, batch_texts), raw in zip(batches, raws):
         try:
-            raw = chat_completion(cfg, messages, temperature=0.2, max_tokens=2048)
+            if isinstance(raw, Exception):
+                raise raw
             parsed = parse_json_response(raw)
         except Exception:
             logger.warning(
                 "Triples LLM batch %d failed for %s/%s — skipping batch",
-                batch_start, video_id, asset_type, exc_info=True,
+                batch_start, video_id, asset_label, exc_info=True,
             )
             continue
         triples = parsed.get("triples", []) if isinstance(parsed, dict) else []
 
-        # Build text lookup for source_index
-        text_lookup = {int(bt["index"]): bt["text"] for bt in batch_texts}
+        # Build source lookup for source_index
+        source_lookup = {int(bt["index"]): bt for bt in batch_texts}
 
         for triple in triples:
             source_idx = triple.get("source_index")
             source_text = ""
-            if isinstance(source_idx, int) and source_idx in text_lookup:
-                source_text = text_lookup[source_idx][:200]
+            triple_asset_type = asset_label
+            if isinstance(source_idx, int) and source_idx in source_lookup:
+                source = source_lookup[source_idx]
+                source_text = source["text"][:200]
+                triple_asset_type = source["asset_type"]
 
             results.append({
                 "VIDEO_ID": video_id,
-                "ASSET_TYPE": asset_type,
+                "ASSET_TYPE": triple_asset_type,
                 "SUBJECT": triple.get("subject", ""),
                 "PREDICATE": triple.get("predicate", ""),
                 "OBJECT": triple.get("object", ""),
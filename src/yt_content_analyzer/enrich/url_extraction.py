@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import Counter
 from urllib.parse import urlparse
 
 from ..config import Settings
@@ -14,11 +15,15 @@ logger = logging.getLogger(__name__)
 _URL_RE = re.compile(r"https?://[^\s<>\"'\]\},;]+")
 
 # Trailing punctuation that is almost never part of a real URL
+_TRAILING_JUNK_CHARS = ".,;:!?"
 _TRAILING_JUNK = re.compile(r"[.,;:!?]+$")
 
 
 def _clean_url(raw: str) -> str:
     """Strip trailing punctuation and unmatched parentheses from a raw URL match."""
+    last = raw[-1:]
+    if last != ")" and last not in _TRAILING_JUNK_CHARS:
+        return raw  # the common case: nothing to strip
     url = _TRAILING_JUNK.sub("", raw)
     # Handle unmatched trailing parenthesis: if ')' count exceeds '(' count, trim
     while url.endswith(")") and url.count(")") > url.count("("):
@@ -34,7 +39,9 @@ def extract_urls(
 ) -> list[dict]:
     """Extract and aggregate URLs mentioned in item TEXT fields.
 
-    Pure regex — no LLM, no network calls, no optional deps.
+    Pure regex — no LLM, no network calls, no optional deps. At most
+    URL_MAX_UNIQUE distinct URLs are tracked; once the cap is reached, URLs
+    already seen keep counting and new ones are dropped.
 
     Returns list of dicts with keys:
     VIDEO_ID, ASSET_TYPE, URL, DOMAIN, MENTION_COUNT, FIRST_SEEN_ITEM_ID
@@ -42,28 +49,42 @@ def extract_urls(
     if not items:
         return []
 
-    # url -> {count, first_seen_item_id}
-    agg: dict[str, dict] = {}
+    counts: Counter[str] = Counter()
+    first_seen: dict[str, str] = {}
+    finditer = _URL_RE.finditer
+    max_unique = cfg.URL_MAX_UNIQUE
+    dropped = 0
 
     for item in items:
         text = item.get("TEXT", "")
-        if not text:
+        # Most items have no URL; a substring check is far cheaper than the regex
+        if not text or "http" not in text:
             continue
 
-        # Resolve item ID: COMMENT_ID for comments, CHUNK_INDEX for transcripts
-        item_id = item.get("COMMENT_ID") or str(item.get("CHUNK_INDEX", ""))
-
-        for match in _URL_RE.finditer(text):
+        item_id: str | None = None
+        for match in finditer(text):
             url = _clean_url(match.group())
             if not url:
                 continue
-            if url in agg:
-                agg[url]["count"] += 1
-            else:
-                agg[url] = {"count": 1, "first_seen_item_id": item_id}
+            if url not in first_seen:
+                if len(first_seen) >= max_unique:
+                    dropped += 1
+                    continue
+                if item_id is None:
+                    # COMMENT_ID for comments, CHUNK_INDEX for transcripts
+                    item_id = item.get("COMMENT_ID") or str(item.get("CHUNK_INDEX", ""))
+                first_seen[url] = item_id
+            counts[url] += 1
+
+    if dropped:
+        logger.warning(
+            "URL_MAX_UNIQUE (%d) reached for %s/%s — dropped %d mentions of new URLs",
+            max_unique, video_id, asset_type, dropped,
+        )
 
     results: list[dict] = []
-    for url, info in agg.items():
+    # most_common() sorts by count descending, keeping first-seen order for ties
+    for url, count in counts.most_common():
         try:
             domain = urlparse(url).netloc
         except Exception:
@@ -73,10 +94,8 @@ def extract_urls(
             "ASSET_TYPE": asset_type,
             "URL": url,
             "DOMAIN": domain,
-            "MENTION_COUNT": info["count"],
-            "FIRST_SEEN_ITEM_ID": info["first_seen_item_id"],
+            "MENTION_COUNT": count,
+            "FIRST_SEEN_ITEM_ID": first_seen[url],
         })
 
-    # Sort by mention count descending
-    results.sort(key=lambda r: r["MENTION_COUNT"], reverse=True)
     return results
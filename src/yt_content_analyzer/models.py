@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 
 @dataclass
@@ -24,3 +25,30 @@ class PreflightResult:
     ok: bool
     results: list[dict] = field(default_factory=list)
     report_path: Path | None = None
+
+
+@dataclass(slots=True)
+class RawComment:
+    """A comment as scraped by the Playwright collector, before normalization.
+
+    Slotted to keep large comment pages compact in memory. ``comment["id"]``
+    and ``comment.get("id")`` are supported so it can stand in for the raw
+    dicts yt-dlp returns.
+    """
+
+    id: str
+    parent: str
+    author: str
+    text: str
+    like_count: int
+    timestamp: int | None
+    reply_count: int
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
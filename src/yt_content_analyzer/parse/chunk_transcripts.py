@@ -5,9 +5,87 @@ from typing import Any
 
 from ..config import Settings
 
+try:
+    import numpy as np
+except ImportError:  # optional speedup — the plain-Python sweep below is the fallback
+    np = None  # type: ignore[assignment]
+
+try:
+    from numba import njit  # type: ignore[import-not-found, import-untyped]
+
+    _HAVE_NUMBA = True
+except ImportError:  # optional speedup — the kernel below also runs as plain Python
+    _HAVE_NUMBA = False
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        return lambda fn: fn
+
 logger = logging.getLogger(__name__)
 
 
+@njit(cache=True)
+def _sweep_bounds(starts, ends, window_starts, window_s, lo_out, hi_out):
+    """Fill ``[lo_out[w], hi_out[w])`` with the segments that may overlap window *w*.
+
+    Two-pointer sweep over segments sorted by start time: ``lo`` skips segments
+    that ended before the window opened (they cannot overlap any later window),
+    ``hi`` stops at the first segment starting after the window closes.
+    """
+    n = len(starts)
+    lo = 0
+    hi = 0
+    for w in range(len(window_starts)):
+        chunk_start = window_starts[w]
+        chunk_end = chunk_start + window_s
+        while lo < n and ends[lo] <= chunk_start:
+            lo += 1
+        hi = max(hi, lo)
+        while hi < n and starts[hi] < chunk_end:
+            hi += 1
+        lo_out[w] = lo
+        hi_out[w] = hi
+
+
+def _window_bounds(
+    starts: list[float],
+    ends: list[float],
+    window_starts: list[float],
+    window_s: float,
+) -> tuple[list[int], list[int]]:
+    """Return ``(lo, hi)`` so that segments ``lo[w]:hi[w]`` may overlap window *w*.
+
+    Runs :func:`_sweep_bounds` compiled when numba is installed, otherwise
+    an equivalent numpy searchsorted, otherwise the sweep as plain Python.
+    """
+    n_windows = len(window_starts)
+    if _HAVE_NUMBA:
+        lo_bounds = np.empty(n_windows, dtype=np.int64)
+        hi_bounds = np.empty(n_windows, dtype=np.int64)
+        _sweep_bounds(
+            np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64),
+            np.asarray(window_starts, dtype=np.float64), float(window_s), lo_bounds, hi_bounds,
+        )
+        return lo_bounds.tolist(), hi_bounds.tolist()
+
+    if np is not None:
+        # The first segment whose END_S passes the window start is found by
+        # searching the running maximum of END_S
+        ws = np.asarray(window_starts, dtype=np.float64)
+        lo_arr = np.searchsorted(
+            np.maximum.accumulate(np.asarray(ends, dtype=np.float64)), ws, side="right"
+        )
+        hi_arr = np.maximum(
+            np.searchsorted(np.asarray(starts, dtype=np.float64), ws + window_s, side="left"),
+            lo_arr,
+        )
+        return lo_arr.tolist(), hi_arr.tolist()
+
+    lo_out = [0] * n_windows
+    hi_out = [0] * n_windows
+    _sweep_bounds(starts, ends, window_starts, window_s, lo_out, hi_out)
+    return lo_out, hi_out
+
+
 def chunk_transcripts(
     segments: list[dict[str, Any]], cfg: Settings
 ) -> list[dict[str, Any]]:
@@ -15,6 +93,7 @@ def chunk_transcripts(
 
     Uses TRANSCRIPT_CHUNK_SECONDS as window width and
     TRANSCRIPT_CHUNK_OVERLAP_SECONDS as overlap between consecutive chunks.
+    Segments must be in start-time order, as produced by normalize_transcripts.
 
     Schema: VIDEO_ID, CHUNK_INDEX, START_S, END_S, TEXT, SEGMENT_INDICES, OVERLAP_S
     """
@@ -42,37 +121,35 @@ def chunk_transcripts(
         step = window_s
         overlap_s = 0
 
+    window_starts: list[float] = []
     while chunk_start < max_end:
-        chunk_end = chunk_start + window_s
+        window_starts.append(chunk_start)
+        chunk_start += step
 
-        # Collect segments that overlap with this window
-        included_indices: list[int] = []
-        texts: list[str] = []
-
-        for seg in segments:
-            seg_start = seg["START_S"]
-            seg_end = seg["END_S"]
-            # Segment overlaps with window if it starts before window ends
-            # and ends after window starts
-            if seg_start < chunk_end and seg_end > chunk_start:
-                included_indices.append(seg["SEGMENT_INDEX"])
-                texts.append(seg["TEXT"])
-
-        if texts:
-            actual_end = min(chunk_end, max_end)
-            actual_overlap = overlap_s if chunk_index > 0 else 0.0
-
-            chunks.append({
-                "VIDEO_ID": video_id,
-                "CHUNK_INDEX": chunk_index,
-                "START_S": round(chunk_start, 3),
-                "END_S": round(actual_end, 3),
-                "TEXT": " ".join(texts),
-                "SEGMENT_INDICES": included_indices,
-                "OVERLAP_S": round(actual_overlap, 3),
-            })
-            chunk_index += 1
+    seg_starts = [seg["START_S"] for seg in segments]
+    seg_ends = [seg["END_S"] for seg in segments]
+    lo_bounds, hi_bounds = _window_bounds(seg_starts, seg_ends, window_starts, window_s)
 
-        chunk_start += step
+    for chunk_start, lo, hi in zip(window_starts, lo_bounds, hi_bounds):
+        # Segment overlaps with window if it starts before window ends
+        # and ends after window starts
+        members = [k for k in range(lo, hi) if seg_ends[k] > chunk_start]
+        if not members:
+            continue
+
+        chunk_end = chunk_start + window_s
+        actual_end = min(chunk_end, max_end)
+        actual_overlap = overlap_s if chunk_index > 0 else 0.0
+
+        chunks.append({
+            "VIDEO_ID": video_id,
+            "CHUNK_INDEX": chunk_index,
+            "START_S": round(chunk_start, 3),
+            "END_S": round(actual_end, 3),
+            "TEXT": " ".join(segments[k]["TEXT"] for k in members),
+            "SEGMENT_INDICES": [segments[k]["SEGMENT_INDEX"] for k in members],
+            "OVERLAP_S": round(actual_overlap, 3),
+        })
+        chunk_index += 1
 
     return chunks
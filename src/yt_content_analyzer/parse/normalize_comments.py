@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+from typing import Any, Mapping, Sequence
 
 from ..config import Settings
+from ..models import RawComment
+
+
+@lru_cache(maxsize=4096)
+def _iso_utc(timestamp: float) -> str:
+    """Format a Unix timestamp as ISO 8601 UTC.
+
+    Cached because relative times ("2 days ago") collapse many comments onto
+    the same epoch second.
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
 
 
 def normalize_comments(
-    raw_comments: list[dict[str, Any]],
+    raw_comments: Sequence[Mapping[str, Any] | RawComment],
     video_id: str,
     cfg: Settings,
     sort_mode: str = "default",
@@ -17,9 +30,16 @@ def normalize_comments(
     Schema fields: VIDEO_ID, COMMENT_ID, PARENT_ID, AUTHOR, TEXT,
                    LIKE_COUNT, REPLY_COUNT, PUBLISHED_AT, SORT_MODE, THREAD_DEPTH
 
-    Supports raw dicts from both Playwright and yt-dlp collectors.
+    Supports raw comments from both the Playwright (:class:`RawComment`) and
+    yt-dlp (dict) collectors.
     """
     normalized: list[dict[str, Any]] = []
+    # Every row repeats these; interned so they share one string object, as do
+    # reply PARENT_IDs (yt-dlp decodes a separate copy per reply)
+    video_id = sys.intern(video_id)
+    sort_mode = sys.intern(sort_mode)
+    intern = sys.intern
+    iso_utc = _iso_utc
 
     for comment in raw_comments:
         parent_id = comment.get("parent", "root")
@@ -27,14 +47,13 @@ def normalize_comments(
             parent_id = ""
             thread_depth = 0
         else:
+            if type(parent_id) is str:  # sys.intern rejects None and str subclasses
+                parent_id = intern(parent_id)
             thread_depth = 1
 
         # Convert unix timestamp to ISO 8601
         timestamp = comment.get("timestamp")
-        if timestamp is not None:
-            published_at = datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
-        else:
-            published_at = ""
+        published_at = iso_utc(timestamp) if timestamp is not None else ""
 
         normalized.append({
             "VIDEO_ID": video_id,
@@ -50,3 +69,18 @@ def normalize_comments(
         })
 
     return normalized
+
+
+def normalize_comments_columnar(
+    raw_comments: Sequence[Mapping[str, Any] | RawComment],
+    video_id: str,
+    cfg: Settings,
+    sort_mode: str = "default",
+) -> dict[str, list[Any]]:
+    """Columnar form of :func:`normalize_comments`: one list per schema field.
+
+    The result can be handed straight to ``pandas.DataFrame`` or
+    ``pyarrow.table``; it is empty when there are no comments.
+    """
+    rows = normalize_comments(raw_comments, video_id, cfg, sort_mode)
+    return {key: [row[key] for row in rows] for key in (rows[0] if rows else ())}
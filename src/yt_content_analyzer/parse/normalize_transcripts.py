@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from itertools import accumulate
 from typing import Any
 
 from ..config import Settings
@@ -19,18 +21,19 @@ def normalize_transcripts(
     lang = raw_transcript.get("lang", "")
     max_chars = cfg.MAX_TRANSCRIPT_CHARS_PER_VIDEO
 
-    segments: list[dict[str, Any]] = []
-    total_chars = 0
-
-    for i, entry in enumerate(entries):
-        text = entry.get("text", "")
-        if total_chars + len(text) > max_chars:
-            remaining = max_chars - total_chars
-            if remaining > 0:
-                text = text[:remaining]
-            else:
-                break
+    texts = [entry.get("text", "") for entry in entries]
+    # Running character totals; the first entry to reach max_chars is the last kept
+    cum_chars = list(accumulate(map(len, texts)))
+    keep = bisect_left(cum_chars, max_chars) + 1
+    if keep <= len(texts) and cum_chars[keep - 1] > max_chars:
+        remaining = max_chars - (cum_chars[keep - 2] if keep > 1 else 0)
+        if remaining > 0:
+            texts[keep - 1] = texts[keep - 1][:remaining]
+        else:
+            keep -= 1
 
+    segments: list[dict[str, Any]] = []
+    for i, (entry, text) in enumerate(zip(entries[:keep], texts)):
         start = entry.get("start", 0.0)
         duration = entry.get("duration", 0.0)
 
@@ -45,8 +48,4 @@ def normalize_transcripts(
             "LANG": lang,
         })
 
-        total_chars += len(text)
-        if total_chars >= max_chars:
-            break
-
     return segments
@@ -1,30 +1,84 @@
 from __future__ import annotations
 
-import json
 import logging
 import re
+import string
 import time
-from datetime import datetime, timezone
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from importlib import import_module
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
 from .config import Settings
 from .exceptions import CollectionError, PreflightError
 from .models import RunResult
 from .preflight.checks import run_preflight
 from .utils.logger import setup_file_handler
-from .utils.io import read_jsonl, write_jsonl, write_failure
+from .utils.io import (
+    AsyncJsonlWriter, iter_jsonl, write_bytes_if_changed, write_failure,
+    write_jsonl,
+)
 from .state.checkpoint import CheckpointStore
 
 logger = logging.getLogger(__name__)
 
+# Normalized comments and transcript chunks always carry a TEXT field
+_get_text = itemgetter("TEXT")
 
-def _new_run_id() -> str:
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+# Config keys scrubbed from manifest.json (value replaced with "***" when set)
+_SECRET_KEYS: frozenset[str] = frozenset({"YOUTUBE_API_KEY"})
 
 
-_BARE_VIDEO_ID_RE = re.compile(r"^[\w-]{11}$")
+def _manifest_bytes(cfg: Settings) -> bytes:
+    """Serialize *cfg* for manifest.json with secret values replaced by ``***``."""
+    secrets = {key: "***" for key in _SECRET_KEYS if getattr(cfg, key)}
+    return cfg.model_copy(update=secrets).model_dump_json(indent=2).encode("utf-8")
 
 
+def _new_run_id() -> str:
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+
+
+_VIDEO_ID_RE = re.compile(
+    r"(?:youtube\.com/watch\?(?:[^#]*?&)?v="
+    r"|youtu\.be/"
+    r"|youtube\.com/(?:embed|v|e|shorts)/)"
+    r"([\w-]{11})"
+)
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + "-_")
+
+
+def _id_at(url: str, start: int) -> str | None:
+    """Return the 11-char ASCII video ID at *start* in *url*, or None."""
+    candidate = url[start : start + 11]
+    if len(candidate) == 11 and _ID_CHARS.issuperset(candidate):
+        return candidate
+    return None
+
+
+def _fast_video_id(url: str) -> str | None:
+    """str.find-based extraction for the common youtu.be/ and watch?v= forms."""
+    i = url.find("youtu.be/")
+    if i != -1:
+        return _id_at(url, i + 9)
+    i = url.find("youtube.com/watch?")
+    if i == -1:
+        return None
+    query = i + 18
+    if url.startswith("v=", query):
+        return _id_at(url, query + 2)
+    j = url.find("&v=", query)
+    if j != -1 and "#" not in url[query:j]:
+        return _id_at(url, j + 3)
+    return None
+
+
+@lru_cache(maxsize=8192)
 def extract_video_id(url: str) -> str:
     """Extract YouTube video ID from various URL formats or a bare 11-char ID.
 
@@ -35,22 +89,20 @@ def extract_video_id(url: str) -> str:
       - https://youtu.be/VIDEO_ID
       - https://www.youtube.com/embed/VIDEO_ID
       - https://www.youtube.com/v/VIDEO_ID
+      - https://www.youtube.com/e/VIDEO_ID
+      - https://www.youtube.com/shorts/VIDEO_ID
 
     Raises ValueError if no video ID can be extracted.
     """
     url = url.strip()
-    if _BARE_VIDEO_ID_RE.match(url):
-        return url
-    patterns = [
-        r"(?:youtube\.com/watch\?.*v=)([\w-]{11})",
-        r"(?:youtu\.be/)([\w-]{11})",
-        r"(?:youtube\.com/embed/)([\w-]{11})",
-        r"(?:youtube\.com/v/)([\w-]{11})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    if len(url) == 11 and _ID_CHARS.issuperset(url):
+        return url  # bare ID
+    video_id = _fast_video_id(url)
+    if video_id is not None:
+        return video_id
+    match = _VIDEO_ID_RE.search(url)
+    if match:
+        return match.group(1)
     raise ValueError(f"Cannot extract video ID from URL: {url}")
 
 
@@ -124,6 +176,19 @@ def _build_video_list(cfg: Settings, out_dir: Path) -> list[dict[str, str]]:
     return []
 
 
+def _as_matrix(vectors: list[list[float]]):
+    """Pack embedding vectors into a contiguous float32 ndarray.
+
+    Slicing the result yields views rather than copies. Returns *vectors*
+    unchanged when numpy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return vectors
+    return np.asarray(vectors, dtype=np.float32)
+
+
 def _video_out_dir(out_dir: Path, video_id: str, per_video: bool) -> Path:
     """Return the output directory for a single video's data."""
     if per_video:
@@ -179,15 +244,14 @@ def run_all(
 
     result = RunResult(run_id=run_id, output_dir=out_dir)
 
+    # run-level directories, created once up front
+    for sub in ("logs", "state", "failures"):
+        (out_dir / sub).mkdir(parents=True, exist_ok=True)
+
     # manifest snapshot (always write/overwrite, secrets scrubbed)
-    (out_dir / "logs").mkdir(exist_ok=True)
     manifest_path = out_dir / "manifest.json"
-    _SECRET_KEYS = {"YOUTUBE_API_KEY"}
-    manifest_data = {
-        k: ("***" if k in _SECRET_KEYS and v else v)
-        for k, v in cfg.model_dump().items()
-    }
-    manifest_path.write_text(json.dumps(manifest_data, indent=2), encoding="utf-8")
+    if not write_bytes_if_changed(manifest_path, _manifest_bytes(cfg)):
+        logger.debug("Manifest unchanged, skipping rewrite")
 
     # state
     ckpt = CheckpointStore(out_dir / "state" / "checkpoint.json")
@@ -196,7 +260,7 @@ def run_all(
     # file logging
     setup_file_handler(logging.getLogger("yt_content_analyzer"), out_dir / "logs")
 
-    logger.info("Run started", extra={"RUN_ID": run_id, "OUTPUT_DIR": str(out_dir)})
+    logger.info("Run started", extra={"RUN_ID": run_id, "OUTPUT_DIR": out_dir})
 
     failures_dir = out_dir / "failures"
 
@@ -210,34 +274,110 @@ def run_all(
         return result
 
     # --- Process each video ---
-    for video_entry in video_list:
-        video_url = video_entry["VIDEO_URL"]
-        video_id = video_entry["VIDEO_ID"]
-        _process_single_video(
-            cfg, video_url, video_id, out_dir, ckpt, result, failures_dir,
-        )
+    max_workers = min(max(1, cfg.MAX_CONCURRENT_VIDEOS), len(video_list))
+    if max_workers > 1 and not cfg.OUTPUT_PER_VIDEO:
+        # Videos would append to the same flat files; keep them sequential
+        logger.info("OUTPUT_PER_VIDEO is false — processing videos one at a time")
+        max_workers = 1
+    try:
+        if max_workers == 1:
+            with AsyncJsonlWriter() as writer:
+                for video_entry in video_list:
+                    video_url = video_entry["VIDEO_URL"]
+                    video_id = video_entry["VIDEO_ID"]
+                    _process_single_video(
+                        cfg, video_url, video_id, out_dir, ckpt, result, failures_dir,
+                        writer=writer,
+                    )
+        else:
+            _process_videos_concurrently(
+                cfg, video_list, out_dir, ckpt, result, failures_dir, max_workers,
+            )
+    finally:
+        ckpt.flush()
 
     return result
 
 
+def _merge_result(into: RunResult, part: RunResult) -> None:
+    """Add the counters, output files and failures of *part* to *into*."""
+    into.videos_processed += part.videos_processed
+    into.comments_collected += part.comments_collected
+    into.transcript_chunks += part.transcript_chunks
+    into.output_files.extend(part.output_files)
+    into.failures.extend(part.failures)
+
+
+def _process_videos_concurrently(
+    cfg, video_list, out_dir, ckpt, result, failures_dir, max_workers: int,
+):
+    """Run :func:`_process_single_video` for up to *max_workers* videos at once.
+
+    Each video gets its own :class:`RunResult` and background writer; results
+    are merged into *result* in video-list order. The first exception (e.g.
+    :class:`CollectionError` with ON_VIDEO_FAILURE=abort) cancels videos that
+    have not started yet and is re-raised once running ones finish. LLM and
+    embedding requests from all videos share one API_MAX_CONCURRENT_CALLS
+    limit, so adding videos overlaps collection without multiplying API load.
+    """
+    def run_one(video_entry: dict[str, str]) -> RunResult:
+        part = RunResult(run_id=result.run_id, output_dir=result.output_dir)
+        with AsyncJsonlWriter() as writer:
+            _process_single_video(
+                cfg, video_entry["VIDEO_URL"], video_entry["VIDEO_ID"], out_dir, ckpt,
+                part, failures_dir, writer=writer,
+            )
+        return part
+
+    logger.info("Processing %d videos, %d at a time", len(video_list), max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="video") as pool:
+        futures = [pool.submit(run_one, entry) for entry in video_list]
+        try:
+            for future in futures:
+                _merge_result(result, future.result())
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
 def _process_single_video(
     cfg, video_url, video_id, out_dir, ckpt, result, failures_dir,
+    *, writer: AsyncJsonlWriter | None = None,
 ):
-    """Run the collection + enrichment pipeline for a single video."""
+    """Run the collection + enrichment pipeline for a single video.
+
+    When *writer* is given, collection stages hand their JSONL output to it so
+    disk I/O overlaps with the next collection step; it is flushed at the end
+    of each stage. Stage checkpoint keys are marked by the writer once the
+    matching file is written, so a failed write never leaves a stage DONE.
+    """
+    write_rows = writer.submit if writer is not None else None
     unit_key = video_id
     vdir = _video_out_dir(out_dir, video_id, cfg.OUTPUT_PER_VIDEO)
     vfailures = vdir / "failures" if cfg.OUTPUT_PER_VIDEO else failures_dir
 
+    # Rows produced by this run's collection stages, handed straight to enrichment
+    collected: dict[str, list[dict] | None] = {}
     for stage_name, stage_fn in [
         ("transcript", lambda: _collect_and_process_transcript(
-            cfg, video_url, video_id, vdir, ckpt, unit_key, result)),
+            cfg, video_url, video_id, vdir, ckpt, unit_key, result,
+            write_rows=write_rows)),
         ("comments", lambda: _collect_and_process_comments(
-            cfg, video_url, video_id, vdir, ckpt, unit_key, result, vfailures)),
+            cfg, video_url, video_id, vdir, ckpt, unit_key, result, vfailures,
+            write_rows=write_rows)),
     ]:
         try:
-            stage_fn()
+            collected[stage_name] = stage_fn()
+            if writer is not None:
+                writer.flush()
         except Exception as exc:
             logger.exception("Collection stage '%s' failed for %s", stage_name, video_id)
+            if writer is not None:
+                try:
+                    writer.flush()  # drain whatever the failed stage queued
+                except Exception:
+                    logger.exception("Background JSONL write failed for %s", video_id)
             write_failure(vfailures, stage_name, video_id, exc)
             result.failures.append({
                 "stage": stage_name, "video_id": video_id, "error": str(exc),
@@ -249,27 +389,47 @@ def _process_single_video(
                 ) from exc
             logger.warning("Skipping failed stage '%s' for %s (ON_VIDEO_FAILURE=skip)",
                            stage_name, video_id)
+        finally:
+            ckpt.flush()
 
-    _enrich_video(cfg, video_id, vdir, ckpt, unit_key, result, vfailures)
+    _enrich_video(
+        cfg, video_id, vdir, ckpt, unit_key, result, vfailures,
+        comments=collected.get("comments"), chunks=collected.get("transcript"),
+    )
+    ckpt.flush()
     result.videos_processed += 1
 
     logger.info("Pipeline complete for video %s", video_id)
 
 
+def _write_now(path: Path, rows, *, on_done=None, **kwargs) -> None:
+    """Synchronous counterpart of :meth:`AsyncJsonlWriter.submit`."""
+    write_jsonl(path, rows, **kwargs)
+    if on_done is not None:
+        on_done()
+
+
 def _collect_and_process_transcript(
-    cfg, video_url, video_id, out_dir, ckpt, unit_key, result,
-):
+    cfg, video_url, video_id, out_dir, ckpt, unit_key, result, *, write_rows=None,
+) -> list[dict] | None:
+    """Collect, normalize and chunk the transcript.
+
+    *write_rows* replaces :func:`_write_now` for the output files (e.g. a
+    background writer's ``submit``). Returns the chunks written in this call,
+    or None if nothing was produced.
+    """
+    write_rows = write_rows or _write_now
     from .collectors.transcript_ytdlp import collect_transcript_ytdlp
     from .parse.normalize_transcripts import normalize_transcripts
     from .parse.chunk_transcripts import chunk_transcripts
 
     if not cfg.TRANSCRIPTS_ENABLE:
         logger.info("Transcripts disabled, skipping")
-        return
+        return None
 
     if ckpt.is_done(unit_key, "transcript_chunk"):
         logger.info("Transcript already processed for %s, skipping", video_id)
-        return
+        return None
 
     # Collect
     logger.info("Collecting transcript for %s", video_id)
@@ -281,60 +441,110 @@ def _collect_and_process_transcript(
 
     if not raw_transcript.get("entries"):
         logger.warning("No transcript entries for %s", video_id)
-        return
+        return None
 
     # Normalize
     segments = normalize_transcripts(raw_transcript, video_id, cfg)
-    ckpt.mark(unit_key, "transcript_normalize")
 
     # Write segments
-    seg_path = out_dir / "transcripts" / "transcript_segments.jsonl"
-    write_jsonl(seg_path, segments)
+    transcripts_dir = out_dir / "transcripts"
+    transcripts_dir.mkdir(parents=True, exist_ok=True)
+    seg_path = transcripts_dir / "transcript_segments.jsonl"
+    write_rows(
+        seg_path, segments, ensure_dir=False,
+        on_done=partial(ckpt.mark, unit_key, "transcript_normalize"),
+    )
     result.output_files.append(seg_path)
     logger.info("Wrote %d transcript segments to %s", len(segments), seg_path)
 
     # Chunk
     chunks = chunk_transcripts(segments, cfg)
-    ckpt.mark(unit_key, "transcript_chunk")
 
     # Write chunks
-    chunk_path = out_dir / "transcripts" / "transcript_chunks.jsonl"
-    write_jsonl(chunk_path, chunks)
+    chunk_path = transcripts_dir / "transcript_chunks.jsonl"
+    write_rows(
+        chunk_path, chunks, ensure_dir=False,
+        on_done=partial(ckpt.mark, unit_key, "transcript_chunk"),
+    )
     result.output_files.append(chunk_path)
     result.transcript_chunks += len(chunks)
     logger.info("Wrote %d transcript chunks to %s", len(chunks), chunk_path)
+    return chunks
+
+
+@lru_cache(maxsize=1)
+def _get_collectors() -> SimpleNamespace:
+    """Import the comment collector modules once, on first use.
+
+    Modules (not functions) are returned so patching a collector function on
+    its module still takes effect. Tests that swap the modules in
+    ``sys.modules`` must call ``_get_collectors.cache_clear()``.
+    """
+    # import_module (not "from .collectors import ...") so sys.modules wins
+    # over attributes already set on the collectors package
+    return SimpleNamespace(
+        playwright=import_module(".collectors.comments_playwright_ui", __package__),
+        ytdlp=import_module(".collectors.comments_ytdlp", __package__),
+    )
 
 
 def _collect_and_process_comments(
     cfg, video_url, video_id, out_dir, ckpt, unit_key, result, failures_dir,
-):
+    *, write_rows=None,
+) -> list[dict] | None:
+    """Collect comments for each sort mode, then normalize and deduplicate them.
+
+    *write_rows* replaces :func:`_write_now` for the output files (e.g. a
+    background writer's ``submit``). Returns the deduplicated comments written
+    in this call, or None if the stage was already complete.
+    """
+    write_rows = write_rows or _write_now
     from .parse.normalize_comments import normalize_comments
 
     if ckpt.is_done(unit_key, "comments_normalize"):
         logger.info("Comments already processed for %s, skipping", video_id)
-        return
-
-    all_normalized = []
+        return None
+
+    comments_dir = out_dir / "comments"
+    comments_dir.mkdir(parents=True, exist_ok=True)
+    # Comments are merged as each sort mode finishes; the first occurrence of
+    # a COMMENT_ID wins and comments with no ID are all kept. Only the IDs are
+    # tracked for dedup — a set of the rows' own ID strings, not a second
+    # id -> row mapping
+    seen_ids: set[str] = set()
+    deduped: list[dict] = []
+    total_rows = 0
+
+    def merge(rows: Iterable[dict]) -> int:
+        count = 0
+        for row in rows:
+            count += 1
+            comment_id = row["COMMENT_ID"]
+            if comment_id:
+                if comment_id in seen_ids:
+                    continue
+                seen_ids.add(comment_id)
+            deduped.append(row)
+        return count
 
     for sort_mode in cfg.COLLECT_SORT_MODES:
         sm_ckpt_key = f"comments_collect_{sort_mode}"
 
         if ckpt.is_done(unit_key, sm_ckpt_key):
             # Already collected this sort mode — read from per-mode file
-            per_mode_path = out_dir / "comments" / f"comments_{sort_mode}.jsonl"
-            rows = read_jsonl(per_mode_path)
+            per_mode_path = comments_dir / f"comments_{sort_mode}.jsonl"
             # Filter to current video_id for multi-video runs
-            rows = [r for r in rows if r.get("VIDEO_ID") == video_id]
-            all_normalized.extend(rows)
+            total_rows += merge(
+                r for r in iter_jsonl(per_mode_path) if r.get("VIDEO_ID") == video_id
+            )
             continue
 
         raw_comments = []
 
         # --- Fallback chain: Playwright → yt-dlp ---
         try:
-            from .collectors.comments_playwright_ui import collect_comments_playwright_ui
             t0 = time.time()
-            raw_comments = collect_comments_playwright_ui(
+            raw_comments = _get_collectors().playwright.collect_comments_playwright_ui(
                 video_url, cfg, sort_mode, artifact_dir=failures_dir,
             )
             logger.info(
@@ -346,9 +556,8 @@ def _collect_and_process_comments(
 
         if not raw_comments:
             try:
-                from .collectors.comments_ytdlp import collect_comments_ytdlp
                 t0 = time.time()
-                raw_comments = collect_comments_ytdlp(video_url, cfg)
+                raw_comments = _get_collectors().ytdlp.collect_comments_ytdlp(video_url, cfg)
                 logger.info(
                     "yt-dlp fallback collected %d comments in %.1fs",
                     len(raw_comments), time.time() - t0,
@@ -365,36 +574,38 @@ def _collect_and_process_comments(
         normalized = normalize_comments(raw_comments, video_id, cfg, sort_mode=sort_mode)
 
         # Write per-sort-mode file
-        per_mode_path = out_dir / "comments" / f"comments_{sort_mode}.jsonl"
-        write_jsonl(per_mode_path, normalized)
-        ckpt.mark(unit_key, sm_ckpt_key)
-
-        all_normalized.extend(normalized)
+        per_mode_path = comments_dir / f"comments_{sort_mode}.jsonl"
+        write_rows(
+            per_mode_path, normalized, ensure_dir=False,
+            on_done=partial(ckpt.mark, unit_key, sm_ckpt_key),
+        )
 
-    # Deduplicate by COMMENT_ID (keep first occurrence)
-    seen_ids: set[str] = set()
-    deduped: list[dict] = []
-    for c in all_normalized:
-        cid = c["COMMENT_ID"]
-        if cid and cid not in seen_ids:
-            seen_ids.add(cid)
-            deduped.append(c)
-        elif not cid:
-            deduped.append(c)  # keep comments with no ID
+        total_rows += merge(normalized)
 
     # Write merged file
-    comments_path = out_dir / "comments" / "comments.jsonl"
-    write_jsonl(comments_path, deduped)
+    comments_path = comments_dir / "comments.jsonl"
+    write_rows(
+        comments_path, deduped, ensure_dir=False,
+        on_done=partial(ckpt.mark, unit_key, "comments_normalize"),
+    )
     result.output_files.append(comments_path)
     result.comments_collected += len(deduped)
     logger.info(
         "Wrote %d comments (%d before dedup) to %s",
-        len(deduped), len(all_normalized), comments_path,
+        len(deduped), total_rows, comments_path,
     )
-    ckpt.mark(unit_key, "comments_normalize")
+    return deduped
+
 
+def _enrich_video(
+    cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir,
+    *, comments: list[dict] | None = None, chunks: list[dict] | None = None,
+):
+    """Run the enrichment stages over a video's comments and transcript chunks.
 
-def _enrich_video(cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir):
+    *comments* / *chunks* are the rows collected earlier in this run; when
+    None (stage skipped on resume, or failed) they are read back from JSONL.
+    """
     from .enrich.embeddings_client import compute_embeddings
     from .enrich.topics_nlp import extract_topics_nlp
     from .enrich.topics_llm import extract_topics_llm
@@ -403,14 +614,34 @@ def _enrich_video(cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir):
     from .enrich.url_extraction import extract_urls
     from .enrich.summarization import summarize_content
 
-    # Read collected data, filtering to current video_id
-    all_comments = read_jsonl(out_dir / "comments" / "comments.jsonl")
-    comments = [c for c in all_comments if c.get("VIDEO_ID") == video_id]
-    all_chunks = read_jsonl(out_dir / "transcripts" / "transcript_chunks.jsonl")
-    chunks = [c for c in all_chunks if c.get("VIDEO_ID") == video_id]
-    all_items = comments + chunks
+    # Stages already completed for this unit. Each stage below only marks its own
+    # key, so one snapshot taken up front serves every check that follows.
+    unit_state = ckpt.load().get("UNITS", {}).get(unit_key, {})
+    done = {stage for stage, status in unit_state.items() if status == "DONE"}
+    wanted = {"enrich_topics", "enrich_sentiment", "enrich_triples"}
+    if cfg.EMBEDDINGS_ENABLE:
+        wanted.add("enrich_embeddings")
+    if cfg.URL_EXTRACTION_ENABLE:
+        wanted.add("enrich_urls")
+    if cfg.SUMMARY_ENABLE:
+        wanted.add("enrich_summary")
+    if wanted <= done:
+        logger.info("Enrichment already complete for %s, skipping", video_id)
+        return
 
-    if not all_items:
+    # Fall back to collected data on disk, filtering to current video_id
+    if comments is None:
+        comments = [
+            c for c in iter_jsonl(out_dir / "comments" / "comments.jsonl")
+            if c.get("VIDEO_ID") == video_id
+        ]
+    if chunks is None:
+        chunks = [
+            c for c in iter_jsonl(out_dir / "transcripts" / "transcript_chunks.jsonl")
+            if c.get("VIDEO_ID") == video_id
+        ]
+
+    if not comments and not chunks:
         logger.warning("No items to enrich for %s", video_id)
         return
 
@@ -424,10 +655,12 @@ def _enrich_video(cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir):
 
     # --- Embeddings (optional, used by NLP topics) ---
     embeddings = None
-    if cfg.EMBEDDINGS_ENABLE and not ckpt.is_done(unit_key, "enrich_embeddings"):
+    if cfg.EMBEDDINGS_ENABLE and "enrich_embeddings" not in done:
         try:
-            texts = [item.get("TEXT", "") for item in all_items]
+            texts = list(map(_get_text, chain(comments, chunks)))
             embeddings = compute_embeddings(texts, cfg)
+            if embeddings:
+                embeddings = _as_matrix(embeddings)
             ckpt.mark(unit_key, "enrich_embeddings")
         except Exception as exc:
             logger.exception("Embeddings failed for %s", video_id)
@@ -437,111 +670,78 @@ def _enrich_video(cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir):
             })
             ckpt.mark(unit_key, "enrich_embeddings", status="FAILED")
 
-    # --- Topics ---
-    if not ckpt.is_done(unit_key, "enrich_topics"):
-        try:
-            all_topics: list[dict] = []
-            for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
-                if not items:
-                    continue
-                if cfg.TM_CLUSTERING == "llm":
-                    topics = extract_topics_llm(items, video_id, asset_type, cfg)
-                else:
-                    asset_embeddings = None
-                    if embeddings is not None:
-                        offset = 0 if asset_type == "comments" else len(comments)
-                        asset_embeddings = embeddings[offset : offset + len(items)]
-                    topics = extract_topics_nlp(items, video_id, asset_type, cfg, asset_embeddings)
-                all_topics.extend(topics)
-
-            if all_topics:
-                topics_path = enrich_dir / "topics.jsonl"
-                write_jsonl(topics_path, all_topics)
-                result.output_files.append(topics_path)
-                logger.info("Wrote %d topic records to enrich/topics.jsonl", len(all_topics))
-            ckpt.mark(unit_key, "enrich_topics")
-        except Exception as exc:
-            logger.exception("Topics enrichment failed for %s", video_id)
-            write_failure(failures_dir, "enrich_topics", video_id, exc)
-            result.failures.append({
-                "stage": "enrich_topics", "video_id": video_id, "error": str(exc),
-            })
-            ckpt.mark(unit_key, "enrich_topics", status="FAILED")
-
-    # --- Sentiment ---
-    if not ckpt.is_done(unit_key, "enrich_sentiment"):
-        try:
-            all_sentiment: list[dict] = []
-            for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
-                if not items:
-                    continue
-                sentiment = analyze_sentiment(items, video_id, asset_type, cfg)
-                all_sentiment.extend(sentiment)
-
-            if all_sentiment:
-                sentiment_path = enrich_dir / "sentiment.jsonl"
-                write_jsonl(sentiment_path, all_sentiment)
-                result.output_files.append(sentiment_path)
-                logger.info("Wrote %d sentiment records to enrich/sentiment.jsonl", len(all_sentiment))
-            ckpt.mark(unit_key, "enrich_sentiment")
-        except Exception as exc:
-            logger.exception("Sentiment enrichment failed for %s", video_id)
-            write_failure(failures_dir, "enrich_sentiment", video_id, exc)
-            result.failures.append({
-                "stage": "enrich_sentiment", "video_id": video_id, "error": str(exc),
-            })
-            ckpt.mark(unit_key, "enrich_sentiment", status="FAILED")
-
-    # --- Triples ---
-    if not ckpt.is_done(unit_key, "enrich_triples"):
-        try:
-            all_triples: list[dict] = []
-            for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
-                if not items:
-                    continue
-                triples = extract_triples(items, video_id, asset_type, cfg)
-                all_triples.extend(triples)
-
-            if all_triples:
-                triples_path = enrich_dir / "triples.jsonl"
-                write_jsonl(triples_path, all_triples)
-                result.output_files.append(triples_path)
-                logger.info("Wrote %d triple records to enrich/triples.jsonl", len(all_triples))
-            ckpt.mark(unit_key, "enrich_triples")
-        except Exception as exc:
-            logger.exception("Triples enrichment failed for %s", video_id)
-            write_failure(failures_dir, "enrich_triples", video_id, exc)
-            result.failures.append({
-                "stage": "enrich_triples", "video_id": video_id, "error": str(exc),
-            })
-            ckpt.mark(unit_key, "enrich_triples", status="FAILED")
-
-    # --- URL extraction ---
-    if cfg.URL_EXTRACTION_ENABLE and not ckpt.is_done(unit_key, "enrich_urls"):
-        try:
-            all_urls: list[dict] = []
-            for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
-                if not items:
-                    continue
-                urls = extract_urls(items, video_id, asset_type, cfg)
-                all_urls.extend(urls)
-
-            if all_urls:
-                urls_path = enrich_dir / "urls.jsonl"
-                write_jsonl(urls_path, all_urls)
-                result.output_files.append(urls_path)
-                logger.info("Wrote %d URL records to enrich/urls.jsonl", len(all_urls))
-            ckpt.mark(unit_key, "enrich_urls")
-        except Exception as exc:
-            logger.exception("URL extraction failed for %s", video_id)
-            write_failure(failures_dir, "enrich_urls", video_id, exc)
-            result.failures.append({
-                "stage": "enrich_urls", "video_id": video_id, "error": str(exc),
-            })
-            ckpt.mark(unit_key, "enrich_urls", status="FAILED")
+    # --- Topics / sentiment / triples / URLs ---
+    # These stages are independent and mostly bound on remote API latency, so they run
+    # concurrently; outputs, checkpoints and failure records are still handled on
+    # this thread in a fixed order.
+    # Sentiment and triples score items independently, so both asset types go
+    # through one call and share LLM batches; topics cluster per asset type.
+    all_items = [*comments, *chunks]
+    all_asset_types = ["comments"] * len(comments) + ["transcripts"] * len(chunks)
+
+    # Per-asset embedding rows (zero-copy views when embeddings is an ndarray)
+    asset_embeddings: dict[str, Any] = {"comments": None, "transcripts": None}
+    if embeddings is not None:
+        asset_embeddings["comments"] = embeddings[: len(comments)]
+        asset_embeddings["transcripts"] = embeddings[len(comments) :]
+
+    def _topics() -> list[dict]:
+        records: list[dict] = []
+        for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
+            if not items:
+                continue
+            if cfg.TM_CLUSTERING == "llm":
+                records.extend(extract_topics_llm(items, video_id, asset_type, cfg))
+                continue
+            records.extend(extract_topics_nlp(
+                items, video_id, asset_type, cfg, asset_embeddings[asset_type],
+            ))
+        return records
+
+    def _urls() -> list[dict]:
+        records: list[dict] = []
+        for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
+            if items:
+                records.extend(extract_urls(items, video_id, asset_type, cfg))
+        return records
+
+    concurrent_stages = [
+        ("enrich_topics", "topics", "topic", "Topics enrichment", _topics),
+        ("enrich_sentiment", "sentiment", "sentiment", "Sentiment enrichment",
+         lambda: analyze_sentiment(all_items, video_id, all_asset_types, cfg)),
+        ("enrich_triples", "triples", "triple", "Triples enrichment",
+         lambda: extract_triples(all_items, video_id, all_asset_types, cfg)),
+    ]
+    if cfg.URL_EXTRACTION_ENABLE:
+        # The regex scan overlaps with the API-bound stages instead of following them
+        concurrent_stages.append(
+            ("enrich_urls", "urls", "URL", "URL extraction", _urls),
+        )
+    pending = [s for s in concurrent_stages if s[0] not in done]
+    if pending:
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="enrich") as pool:
+            futures = [(stage, pool.submit(stage[4])) for stage in pending]
+            for (stage_key, name, noun, label, _), future in futures:
+                try:
+                    records = future.result()
+                    if records:
+                        out_path = enrich_dir / f"{name}.jsonl"
+                        write_jsonl(out_path, records, ensure_dir=False)
+                        result.output_files.append(out_path)
+                        logger.info(
+                            "Wrote %d %s records to enrich/%s.jsonl", len(records), noun, name,
+                        )
+                    ckpt.mark(unit_key, stage_key)
+                except Exception as exc:
+                    logger.exception("%s failed for %s", label, video_id)
+                    write_failure(failures_dir, stage_key, video_id, exc)
+                    result.failures.append({
+                        "stage": stage_key, "video_id": video_id, "error": str(exc),
+                    })
+                    ckpt.mark(unit_key, stage_key, status="FAILED")
 
     # --- Summarization ---
-    if cfg.SUMMARY_ENABLE and not ckpt.is_done(unit_key, "enrich_summary"):
+    if cfg.SUMMARY_ENABLE and "enrich_summary" not in done:
         try:
             all_summaries: list[dict] = []
             for asset_type, items in [("comments", comments), ("transcripts", chunks)]:
@@ -552,7 +752,7 @@ def _enrich_video(cfg, video_id, out_dir, ckpt, unit_key, result, failures_dir):
 
             if all_summaries:
                 summary_path = enrich_dir / "summary.jsonl"
-                write_jsonl(summary_path, all_summaries)
+                write_jsonl(summary_path, all_summaries, ensure_dir=False)
                 result.output_files.append(summary_path)
                 logger.info("Wrote %d summary records to enrich/summary.jsonl", len(all_summaries))
             ckpt.mark(unit_key, "enrich_summary")
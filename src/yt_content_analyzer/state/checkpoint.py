@@ -3,63 +3,127 @@ import json
 import logging
 import os
 import shutil
-import tempfile
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 _logger = logging.getLogger(__name__)
 
+# Serialized form of an empty checkpoint (matches json.dumps(..., indent=2))
+_EMPTY_CHECKPOINT = b'{\n  "UNITS": {}\n}'
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename in *directory* (no-op where directories can't be opened)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 @dataclass
 class CheckpointStore:
+    """JSON checkpoint of per-unit stage status.
+
+    The parsed checkpoint is cached in memory after the first :meth:`load`
+    and reused while the file's mtime is unchanged (or marks are pending).
+    :meth:`mark` updates the cache and only writes to disk once
+    *flush_every* marks are pending or *flush_interval_s* seconds have passed
+    since the last write; call :meth:`flush` at pipeline boundaries to persist
+    anything outstanding. All methods may be called from several threads.
+    Pass ``fsync=False`` to skip forcing writes to disk (tests, scratch runs);
+    saves stay atomic but may not survive a power loss.
+    """
+
     path: Path
+    flush_every: int = 8
+    flush_interval_s: float = 5.0
+    fsync: bool = True
+    _cache: dict[str, Any] | None = field(default=None, init=False, repr=False)
+    _mtime_ns: int | None = field(default=None, init=False, repr=False)
+    _pending: int = field(default=0, init=False, repr=False)
+    _last_flush: float = field(default_factory=time.monotonic, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
 
     def init_if_missing(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
-            self.path.write_text(json.dumps({"UNITS": {}}, indent=2), encoding="utf-8")
+            self.path.write_bytes(_EMPTY_CHECKPOINT)
 
     def load(self) -> dict[str, Any]:
-        try:
-            result: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+        with self._lock:
+            if self._cache is not None:
+                if self._pending:
+                    return self._cache  # unflushed marks make memory authoritative
+                try:
+                    if self.path.stat().st_mtime_ns == self._mtime_ns:
+                        return self._cache
+                except FileNotFoundError:
+                    pass
+            try:
+                result: dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                backup = self.path.with_suffix(".json.corrupt")
+                shutil.copy2(self.path, backup)
+                _logger.warning(
+                    "Corrupt checkpoint %s — backed up to %s, reinitializing", self.path, backup
+                )
+                result = {"UNITS": {}}
+                self.path.write_bytes(_EMPTY_CHECKPOINT)
+            self._cache = result
+            self._mtime_ns = self.path.stat().st_mtime_ns
             return result
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            backup = self.path.with_suffix(".json.corrupt")
-            shutil.copy2(self.path, backup)
-            _logger.warning(
-                "Corrupt checkpoint %s — backed up to %s, reinitializing", self.path, backup
-            )
-            data: dict[str, Any] = {"UNITS": {}}
-            self.path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-            return data
 
     def save(self, data: dict[str, Any]) -> None:
-        content = json.dumps(data, indent=2).encode("utf-8")
-        fd = None
-        tmp_path = None
-        try:
-            fd, tmp_name = tempfile.mkstemp(dir=str(self.path.parent))
-            tmp_path = Path(tmp_name)
-            os.write(fd, content)
-            os.close(fd)
-            fd = None
-            tmp_path.replace(self.path)
-        except BaseException:
-            if fd is not None:
-                os.close(fd)
-            if tmp_path is not None and tmp_path.exists():
-                tmp_path.unlink()
-            raise
+        with self._lock:
+            content = json.dumps(data, indent=2).encode("utf-8")
+            tmp_path = self.path.with_suffix(".json.tmp")
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(content)  # buffered write() retries short writes
+                    if self.fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                tmp_path.unlink(missing_ok=True)
+                raise
+            if self.fsync:
+                _fsync_dir(self.path.parent)
+            self._cache = data
+            self._mtime_ns = self.path.stat().st_mtime_ns
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Write pending marks to disk (no-op when nothing changed)."""
+        with self._lock:
+            if self._pending and self._cache is not None:
+                self.save(self._cache)
 
     def is_done(self, unit_key: str, stage: str) -> bool:
-        data = self.load()
-        status: str | None = data.get("UNITS", {}).get(unit_key, {}).get(stage)
+        with self._lock:
+            data = self.load()
+            status: str | None = data.get("UNITS", {}).get(unit_key, {}).get(stage)
         return status == "DONE"
 
     def mark(self, unit_key: str, stage: str, status: str = "DONE") -> None:
-        data = self.load()
-        units = data.setdefault("UNITS", {})
-        units.setdefault(unit_key, {})
-        units[unit_key][stage] = status
-        self.save(data)
+        with self._lock:
+            data = self.load()
+            units = data.setdefault("UNITS", {})
+            units.setdefault(unit_key, {})
+            units[unit_key][stage] = status
+            self._pending += 1
+            if (
+                self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval_s
+            ):
+                self.flush()
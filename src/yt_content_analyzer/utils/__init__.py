@@ -1,5 +1,5 @@
 from __future__ import annotations
 
-from .io import read_jsonl, write_jsonl, write_csv, write_failure
+from .io import iter_jsonl, read_jsonl, write_jsonl, write_csv, write_failure
 
-__all__ = ["read_jsonl", "write_jsonl", "write_csv", "write_failure"]
+__all__ = ["iter_jsonl", "read_jsonl", "write_jsonl", "write_csv", "write_failure"]
@@ -1,43 +1,189 @@
 from __future__ import annotations
 import json
 import logging
+import queue
+import threading
 import traceback as tb_mod
 from datetime import datetime, timezone
 from pathlib import Path
 import csv
 import re
-from typing import Iterable, Mapping, Any
+from typing import Callable, Iterable, Iterator, Mapping, Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup — stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# write_jsonl hands the file object at most this many bytes per write() call
+_WRITE_CHUNK_BYTES = 1 << 20
+# iter_jsonl reads through a buffer this size rather than the default (a few KiB)
+_READ_BUFFER_BYTES = 1 << 20
+
+# Characters replaced with "_" when a video ID is used in a failure filename
+_UNSAFE_ID_RE = re.compile(r"[^\w\-]")
 
 
 _logger = logging.getLogger(__name__)
 
 
-def read_jsonl(path: Path) -> list[dict]:
-    """Read all rows from a JSONL file. Returns [] if file doesn't exist.
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Write *data* to *path* unless the file already holds identical bytes.
+
+    Returns True if the file was (re)written.
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def iter_jsonl(path: Path) -> Iterator[dict]:
+    """Lazily yield rows from a JSONL file. Yields nothing if file doesn't exist.
 
     Skips lines that cannot be parsed as JSON, logging a warning.
     """
     if not path.exists():
-        return []
-    rows: list[dict] = []
-    with path.open("r", encoding="utf-8") as f:
+        return
+    with path.open("rb", buffering=_READ_BUFFER_BYTES) as f:
         for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if line:
-                try:
-                    rows.append(json.loads(line))
-                except json.JSONDecodeError:
-                    _logger.warning("Skipping bad JSON at %s:%d", path, line_no)
-    return rows
+            if line.isspace():  # blank line (every line read keeps its b"\n")
+                continue
+            try:
+                yield _loads(line)
+            except ValueError:
+                _logger.warning("Skipping bad JSON at %s:%d", path, line_no)
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    """Read all rows from a JSONL file. Returns [] if file doesn't exist.
+
+    Skips lines that cannot be parsed as JSON, logging a warning.
+    """
+    return list(iter_jsonl(path))
 
 
 def write_jsonl(
-    path: Path, rows: Iterable[Mapping[str, Any]], *, mode: str = "a",
+    path: Path,
+    rows: Iterable[Mapping[str, Any]],
+    *,
+    mode: str = "a",
+    ensure_dir: bool = True,
 ) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open(mode, encoding="utf-8") as f:
+    """Serialize *rows* as JSON lines, writing in ~1 MiB batches.
+
+    Pass ``ensure_dir=False`` when the caller has already created the parent
+    directory, to skip the per-call ``mkdir``.
+    """
+    if ensure_dir:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    buf: list[bytes] = []
+    size = 0
+    with path.open(mode + "b") as f:
         for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            line = _dumps_line(r)
+            buf.append(line)
+            size += len(line)
+            if size >= _WRITE_CHUNK_BYTES:
+                f.write(b"".join(buf))
+                buf.clear()
+                size = 0
+        if buf:
+            f.write(b"".join(buf))
+
+
+def _dumps_line(row: Mapping[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits — let stdlib json handle it
+    return (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class AsyncJsonlWriter:
+    """Run :func:`write_jsonl` calls on a background thread.
+
+    Writes are applied in submission order, so serialization and disk I/O
+    overlap with whatever the caller does next. A write's *on_done* callback
+    runs on the writer thread once that write (and every one before it) has
+    succeeded.
+    :meth:`flush` blocks until every submitted write has finished and
+    re-raises the first error.
+    Use as a context manager, or call :meth:`close` when done.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[
+            tuple[Path, list, str, bool, Callable[[], None] | None] | None
+        ] = queue.Queue()
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(target=self._run, name="jsonl-writer", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        path: Path,
+        rows: Iterable[Mapping[str, Any]],
+        *,
+        mode: str = "a",
+        ensure_dir: bool = True,
+        on_done: Callable[[], None] | None = None,
+    ) -> None:
+        """Queue *rows* for writing; same arguments as :func:`write_jsonl`.
+
+        *on_done* is called after the rows are on disk. It is skipped if this
+        or any earlier write since the last :meth:`flush` failed.
+        """
+        self._queue.put((path, list(rows), mode, ensure_dir, on_done))
+
+    def flush(self) -> None:
+        """Wait for queued writes, re-raising the first one that failed."""
+        self._queue.join()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """Flush pending writes and stop the background thread."""
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+
+    def __enter__(self) -> AsyncJsonlWriter:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except Exception:
+            _logger.exception("Background JSONL write failed")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, rows, mode, ensure_dir, on_done = item
+                write_jsonl(path, rows, mode=mode, ensure_dir=ensure_dir)
+                if on_done is not None and self._error is None:
+                    on_done()
+            except BaseException as exc:
+                if self._error is None:
+                    self._error = exc
+            finally:
+                self._queue.task_done()
 
 
 def write_csv(
@@ -50,11 +196,11 @@ def write_csv(
     path.parent.mkdir(parents=True, exist_ok=True)
     write_header = mode == "w" or not path.exists()
     with path.open(mode, newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w = csv.writer(f)
         if write_header:
-            w.writeheader()
-        for r in rows:
-            w.writerow({k: r.get(k) for k in fieldnames})
+            w.writerow(fieldnames)
+        # Missing keys become empty cells; keys outside fieldnames are ignored
+        w.writerows([r.get(k) for k in fieldnames] for r in rows)
 
 
 def write_failure(
@@ -65,7 +211,7 @@ def write_failure(
     Returns the path of the written file.
     """
     failures_dir.mkdir(parents=True, exist_ok=True)
-    safe_id = re.sub(r"[^\w\-]", "_", video_id)
+    safe_id = _UNSAFE_ID_RE.sub("_", video_id)
     filename = f"{stage}_{safe_id}.json"
     path = failures_dir / filename
     record = {
@@ -73,7 +219,9 @@ def write_failure(
         "video_id": video_id,
         "error_type": type(error).__name__,
         "error_message": str(error),
-        "traceback": tb_mod.format_exception(type(error), error, error.__traceback__),
+        "traceback": "".join(
+            tb_mod.format_exception(type(error), error, error.__traceback__)
+        ),
         "timestamp": datetime.now(timezone.utc).isoformat(),
     }
     path.write_text(json.dumps(record, indent=2), encoding="utf-8")
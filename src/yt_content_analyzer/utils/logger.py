@@ -7,6 +7,11 @@ import warnings
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup — stdlib json is the fallback
+    orjson = None  # type: ignore[assignment]
+
 _STANDARD_LOG_ATTRS = frozenset({
     "name", "msg", "args", "created", "relativeCreated", "exc_info", "exc_text",
     "stack_info", "lineno", "funcName", "levelno", "levelname", "pathname",
@@ -19,29 +24,48 @@ class JsonLineFormatter(logging.Formatter):
     """Formats log records as one-JSON-object-per-line."""
 
     def format(self, record: logging.LogRecord) -> str:
-        extra = {
-            k: v for k, v in record.__dict__.items()
-            if k not in _STANDARD_LOG_ATTRS and not k.startswith("_")
-        }
+        attrs = record.__dict__
+        extra = {k: attrs[k] for k in attrs.keys() - _STANDARD_LOG_ATTRS if k[0] != "_"}
+        # Reuse the message if another handler's formatter already rendered it
+        message = attrs.get("message")
+        if message is None:
+            message = record.message = record.getMessage()
         obj: dict = {
-            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc),
             "level": record.levelname,
-            "message": record.getMessage(),
+            "message": message,
             "module": record.module,
             "extra": extra,
         }
         if record.exc_info and record.exc_info[0] is not None:
             obj["traceback"] = traceback.format_exception(*record.exc_info)
+        if orjson is not None:
+            # orjson renders the aware datetime in isoformat() form itself and
+            # falls back to str() for values like Path
+            try:
+                return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                pass  # e.g. ints beyond 64 bits — let stdlib json handle it
+        obj["timestamp"] = obj["timestamp"].isoformat()
         return json.dumps(obj, default=str)
 
 
+_WARNED = False
+
+
 def get_logger() -> logging.Logger:
-    """Deprecated: use ``logging.getLogger(__name__)`` instead."""
-    warnings.warn(
-        "get_logger() is deprecated, use logging.getLogger(__name__) instead",
-        DeprecationWarning,
-        stacklevel=2,
-    )
+    """Deprecated: use ``logging.getLogger(__name__)`` instead.
+
+    The deprecation warning is emitted on the first call only.
+    """
+    global _WARNED
+    if not _WARNED:
+        _WARNED = True
+        warnings.warn(
+            "get_logger() is deprecated, use logging.getLogger(__name__) instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
     return logging.getLogger("yt_content_analyzer")
 
 
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import Any
+
+# The yt_dlp module, imported on first use (tests replace it with a stub)
+_yt_dlp: Any = None
+
+
+def get_yt_dlp(feature: str) -> Any:
+    """Return the yt_dlp module, importing it on the first call.
+
+    Raises RuntimeError with an install hint naming *feature* when yt-dlp
+    is not installed.
+    """
+    global _yt_dlp
+    if _yt_dlp is None:
+        try:
+            import yt_dlp  # type: ignore[import-untyped]
+        except ImportError:
+            raise RuntimeError(
+                f"yt-dlp is required for {feature}. "
+                "Install with: pip install yt-content-analyzer[scrape]"
+            )
+        _yt_dlp = yt_dlp
+    return _yt_dlp
@@ -0,0 +1,112 @@
+"""Lightweight stand-ins for the Playwright sync API used by the comment collector.
+
+Cheaper than nested ``MagicMock`` trees. Every locator is empty and invisible,
+so the collector navigates, scrolls until its patience runs out, and returns
+whatever the registered response handler collected. A :class:`FakePage` built
+with *responses* replays them to that handler on ``goto``.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+
+class FakeLocator:
+    @property
+    def first(self) -> FakeLocator:
+        return self
+
+    def nth(self, index: int) -> FakeLocator:
+        return self
+
+    def count(self) -> int:
+        return 0
+
+    def is_visible(self, timeout: int | None = None) -> bool:
+        return False
+
+    def wait_for(self, timeout: int | None = None) -> None:
+        pass
+
+    def click(self) -> None:
+        pass
+
+    def scroll_into_view_if_needed(self) -> None:
+        pass
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        body: bytes,
+        *,
+        url: str = "https://www.youtube.com/youtubei/v1/next?prettyPrint=false",
+        method: str = "POST",
+        status: int = 200,
+    ) -> None:
+        self._body = body
+        self.url = url
+        self.status = status
+        self.request = SimpleNamespace(method=method)
+
+    def body(self) -> bytes:
+        return self._body
+
+
+class FakePage:
+    def __init__(self, responses: list[FakeResponse] | tuple[()] = ()) -> None:
+        self.handlers: dict[str, object] = {}
+        self.responses = list(responses)
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def goto(self, url: str, **kwargs) -> None:
+        handler = self.handlers.get("response")
+        if handler is not None:
+            for response in self.responses:
+                handler(response)
+
+    def evaluate(self, script: str) -> None:
+        pass
+
+    def wait_for_timeout(self, ms: int) -> None:
+        pass
+
+    def wait_for_selector(self, selector: str, **kwargs) -> None:
+        pass
+
+    def locator(self, selector: str) -> FakeLocator:
+        return FakeLocator()
+
+    def screenshot(self, **kwargs) -> None:
+        pass
+
+
+class FakeBrowser:
+    def __init__(self, page: FakePage | None = None) -> None:
+        self.page = page or FakePage()
+        self.closed = False
+
+    def new_context(self, **kwargs) -> SimpleNamespace:
+        return SimpleNamespace(new_page=lambda: self.page)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self, browser: FakeBrowser | None = None) -> None:
+        self.browser = browser or FakeBrowser()
+        self.chromium = SimpleNamespace(launch=lambda **kwargs: self.browser)
+        self.stopped = False
+
+    def start(self) -> FakePlaywright:
+        return self
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+def fake_sync_playwright(pw: FakePlaywright):
+    """Return a drop-in for ``playwright.sync_api.sync_playwright`` yielding *pw*."""
+    return lambda: pw
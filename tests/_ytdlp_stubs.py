@@ -0,0 +1,48 @@
+"""Lightweight stand-in for the ``yt_dlp`` module used by collectors and resolvers.
+
+Cheaper than nested ``MagicMock`` trees. :class:`FakeYtDlp` hands out a new
+:class:`FakeYoutubeDL` per ``YoutubeDL(...)`` call and keeps them in
+``instances``, so tests can count attempts with ``len(fake.instances)``.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+
+class FakeYoutubeDL:
+    def __init__(self, extract: Callable[[str], Any], opts: dict[str, Any]) -> None:
+        self.opts = opts
+        self.calls = 0
+        self._extract = extract
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> bool:
+        return False
+
+    def extract_info(self, url: str, download: bool = False) -> Any:
+        self.calls += 1
+        return self._extract(url)
+
+
+class FakeYtDlp:
+    """Module stand-in whose ``extract_info`` delegates to *extract(url)*."""
+
+    def __init__(self, extract: Callable[[str], Any]) -> None:
+        self.instances: list[FakeYoutubeDL] = []
+        self._extract = extract
+
+    @classmethod
+    def returning(cls, info: Any) -> FakeYtDlp:
+        """A stub whose every ``extract_info`` call returns *info*."""
+        return cls(lambda url: info)
+
+    def YoutubeDL(self, opts: dict[str, Any] | None = None) -> FakeYoutubeDL:
+        ydl = FakeYoutubeDL(self._extract, opts or {})
+        self.instances.append(ydl)
+        return ydl
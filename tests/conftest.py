@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from _pw_stubs import FakePlaywright, fake_sync_playwright
+from _ytdlp_stubs import FakeYtDlp
+from click.testing import CliRunner
+
+from yt_content_analyzer.config import Settings
+
+
+@pytest.fixture(scope="session")
+def base_cfg() -> Settings:
+    """Default Settings, built once per session.
+
+    Derive variants with ``base_cfg.model_copy(update={...})``; never mutate it.
+    """
+    return Settings()
+
+
+@pytest.fixture(scope="session")
+def make_cfg(base_cfg: Settings) -> Callable[..., Settings]:
+    """Return a factory for ``base_cfg`` variants: ``make_cfg(KEY=value, ...)``.
+
+    With no overrides it returns ``base_cfg`` itself; never mutate the result.
+    """
+    def make(**overrides: Any) -> Settings:
+        return base_cfg.model_copy(update=overrides) if overrides else base_cfg
+
+    return make
+
+
+@pytest.fixture(scope="module")
+def runner() -> CliRunner:
+    """A :class:`CliRunner` shared by the CLI tests of one module."""
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def default_manifest_bytes() -> bytes:
+    """manifest.json contents for a single-video run, serialized once per session.
+
+    Built by the same serializer ``run_all`` uses, so resume tests read the real format.
+    """
+    from yt_content_analyzer.run import _manifest_bytes
+
+    return _manifest_bytes(Settings(VIDEO_URL="https://www.youtube.com/watch?v=dQw4w9WgXcQ"))
+
+
+@pytest.fixture
+def fake_pw() -> Iterator[FakePlaywright]:
+    """A fresh :class:`FakePlaywright` installed as ``sync_playwright``.
+
+    Queue intercepted API responses with ``fake_pw.browser.page.responses``.
+    """
+    pw = FakePlaywright()
+    with patch("playwright.sync_api.sync_playwright", fake_sync_playwright(pw)):
+        yield pw
+
+
+@pytest.fixture
+def install_ytdlp(monkeypatch: pytest.MonkeyPatch) -> Callable[[FakeYtDlp], FakeYtDlp]:
+    """Return a function that installs a stub as the yt_dlp module for this test.
+
+    Collectors and resolvers all get yt_dlp from ``utils.ytdlp``, so one
+    attribute covers them.
+    """
+    def install(fake: FakeYtDlp) -> FakeYtDlp:
+        monkeypatch.setattr("yt_content_analyzer.utils.ytdlp._yt_dlp", fake)
+        return fake
+
+    return install
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # Registered here too so the marker is known when pytest-xdist is absent
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run all tests of the group on one xdist worker"
+    )
+
+
+# Test classes whose tests must share one xdist worker, by group name
+_XDIST_GROUPS = {
+    "TestChunkTranscripts": "chunking",
+    # Attaches handlers to the process-global "yt_content_analyzer" logger
+    "TestConfigureFileLogging": "logger",
+}
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Apply :data:`_XDIST_GROUPS` for ``-n auto --dist=loadgroup`` runs."""
+    for item in items:
+        cls = getattr(item, "cls", None)
+        group = _XDIST_GROUPS.get(cls.__name__) if cls is not None else None
+        if group is not None:
+            item.add_marker(pytest.mark.xdist_group(group))
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import sys
+
 import pytest
 
-from yt_content_analyzer.config import Settings
 from yt_content_analyzer.run import extract_video_id
 from yt_content_analyzer.parse.normalize_transcripts import normalize_transcripts
-from yt_content_analyzer.parse.normalize_comments import normalize_comments
+from yt_content_analyzer.parse.normalize_comments import (
+    normalize_comments, normalize_comments_columnar,
+)
 from yt_content_analyzer.parse.chunk_transcripts import chunk_transcripts
 
 
@@ -14,44 +17,47 @@ from yt_content_analyzer.parse.chunk_transcripts import chunk_transcripts
 # ---------------------------------------------------------------------------
 
 class TestExtractVideoId:
-    def test_standard_url(self):
-        assert extract_video_id("https://www.youtube.com/watch?v=qhuS__jC4n8") == "qhuS__jC4n8"
-
-    def test_short_url(self):
-        assert extract_video_id("https://youtu.be/qhuS__jC4n8") == "qhuS__jC4n8"
-
-    def test_embed_url(self):
-        assert extract_video_id("https://www.youtube.com/embed/qhuS__jC4n8") == "qhuS__jC4n8"
-
-    def test_v_url(self):
-        assert extract_video_id("https://www.youtube.com/v/qhuS__jC4n8") == "qhuS__jC4n8"
-
-    def test_url_with_extra_params(self):
-        url = "https://www.youtube.com/watch?v=qhuS__jC4n8&list=PLxyz&index=3"
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.youtube.com/watch?v=qhuS__jC4n8",
+            "https://youtu.be/qhuS__jC4n8",
+            "https://www.youtube.com/embed/qhuS__jC4n8",
+            "https://www.youtube.com/v/qhuS__jC4n8",
+            "https://www.youtube.com/e/qhuS__jC4n8",
+            "https://www.youtube.com/shorts/qhuS__jC4n8?feature=share",
+            "https://www.youtube.com/watch?v=qhuS__jC4n8&list=PLxyz&index=3",
+            "https://youtube.com/watch?v=qhuS__jC4n8",
+            "https://www.youtube.com/watch?feature=share&v=qhuS__jC4n8",
+        ],
+        ids=[
+            "standard", "short", "embed", "v", "e", "shorts",
+            "extra_params", "no_www", "v_param_not_first",
+        ],
+    )
+    def test_extract(self, url):
         assert extract_video_id(url) == "qhuS__jC4n8"
 
-    def test_no_www(self):
-        assert extract_video_id("https://youtube.com/watch?v=qhuS__jC4n8") == "qhuS__jC4n8"
-
-    def test_invalid_url_raises(self):
+    @pytest.mark.parametrize(
+        "bad",
+        [
+            "https://example.com/watch?v=qhuS__jC4n8",
+            "https://example.com/not-youtube",
+            "",
+        ],
+        ids=["v_param_on_other_host", "invalid_url", "empty_string"],
+    )
+    def test_invalid_raises(self, bad):
         with pytest.raises(ValueError):
-            extract_video_id("https://example.com/not-youtube")
-
-    def test_empty_string_raises(self):
-        with pytest.raises(ValueError):
-            extract_video_id("")
+            extract_video_id(bad)
 
 
 # ---------------------------------------------------------------------------
 # normalize_transcripts
 # ---------------------------------------------------------------------------
 
-def _make_cfg(**overrides) -> Settings:
-    return Settings(**overrides)
-
-
 class TestNormalizeTranscripts:
-    def test_basic_schema(self):
+    def test_basic_schema(self, base_cfg):
         raw = {
             "video_id": "abc123",
             "source": "auto",
@@ -61,7 +67,7 @@ class TestNormalizeTranscripts:
                 {"text": "Second segment", "start": 2.5, "duration": 3.0},
             ],
         }
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_transcripts(raw, "abc123", cfg)
 
         assert len(result) == 2
@@ -75,7 +81,7 @@ class TestNormalizeTranscripts:
         assert seg["SOURCE"] == "auto"
         assert seg["LANG"] == "en"
 
-    def test_char_limit_truncation(self):
+    def test_char_limit_truncation(self, base_cfg):
         raw = {
             "video_id": "vid1",
             "source": "manual",
@@ -86,7 +92,7 @@ class TestNormalizeTranscripts:
                 {"text": "C" * 50, "start": 2.0, "duration": 1.0},
             ],
         }
-        cfg = _make_cfg(MAX_TRANSCRIPT_CHARS_PER_VIDEO=80)
+        cfg = base_cfg.model_copy(update={"MAX_TRANSCRIPT_CHARS_PER_VIDEO": 80})
         result = normalize_transcripts(raw, "vid1", cfg)
 
         # First segment: 50 chars, total=50
@@ -95,9 +101,9 @@ class TestNormalizeTranscripts:
         assert len(result[0]["TEXT"]) == 50
         assert len(result[1]["TEXT"]) == 30
 
-    def test_empty_input(self):
+    def test_empty_input(self, base_cfg):
         raw = {"video_id": "vid1", "source": "none", "lang": "", "entries": []}
-        cfg = _make_cfg()
+        cfg = base_cfg
         assert normalize_transcripts(raw, "vid1", cfg) == []
 
 
@@ -106,7 +112,7 @@ class TestNormalizeTranscripts:
 # ---------------------------------------------------------------------------
 
 class TestNormalizeComments:
-    def test_top_level_comment(self):
+    def test_top_level_comment(self, base_cfg):
         raw = [
             {
                 "id": "c1",
@@ -117,7 +123,7 @@ class TestNormalizeComments:
                 "timestamp": 1700000000,
             }
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
 
         assert len(result) == 1
@@ -131,9 +137,9 @@ class TestNormalizeComments:
         assert c["REPLY_COUNT"] == 0
         assert c["SORT_MODE"] == "default"
         assert c["THREAD_DEPTH"] == 0
-        assert "2023-11-14" in c["PUBLISHED_AT"]
+        assert c["PUBLISHED_AT"] == "2023-11-14T22:13:20+00:00"
 
-    def test_reply_comment(self):
+    def test_reply_comment(self, base_cfg):
         raw = [
             {
                 "id": "c2",
@@ -144,13 +150,13 @@ class TestNormalizeComments:
                 "timestamp": 1700100000,
             }
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
 
         assert result[0]["PARENT_ID"] == "c1"
         assert result[0]["THREAD_DEPTH"] == 1
 
-    def test_missing_timestamp(self):
+    def test_missing_timestamp(self, base_cfg):
         raw = [
             {
                 "id": "c3",
@@ -160,15 +166,51 @@ class TestNormalizeComments:
                 "like_count": 0,
             }
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["PUBLISHED_AT"] == ""
 
-    def test_empty_input(self):
-        cfg = _make_cfg()
+    def test_shared_timestamps_format_identically(self, base_cfg):
+        raw = [
+            {"id": f"c{i}", "parent": "root", "text": "t", "timestamp": ts}
+            for i, ts in enumerate([1700000000, 1700000000.5, 1700000000, None])
+        ]
+        result = normalize_comments(raw, "vid1", base_cfg)
+        assert [c["PUBLISHED_AT"] for c in result] == [
+            "2023-11-14T22:13:20+00:00",
+            "2023-11-14T22:13:20.500000+00:00",
+            "2023-11-14T22:13:20+00:00",
+            "",
+        ]
+
+    def test_empty_input(self, base_cfg):
+        cfg = base_cfg
         assert normalize_comments([], "vid1", cfg) == []
 
-    def test_none_like_count(self):
+    def test_reply_parent_ids_interned(self, base_cfg):
+        # Build equal parent strings that are distinct objects, as a JSON decoder would
+        parents = ["".join(["Ugz", "parent"]) for _ in range(2)]
+        assert parents[0] is not parents[1]
+        raw = [{"id": f"r{i}", "parent": p, "text": "reply"} for i, p in enumerate(parents)]
+        raw.append({"id": "r9", "parent": None, "text": "odd"})
+        result = normalize_comments(raw, "vid1", base_cfg)
+        assert result[0]["PARENT_ID"] is result[1]["PARENT_ID"]
+        assert result[2]["PARENT_ID"] is None
+
+    def test_columnar_matches_rows(self, base_cfg):
+        raw = [
+            {"id": "c1", "parent": "root", "author": "A", "text": "hi",
+             "like_count": None, "timestamp": 1700000000, "reply_count": 2},
+            {"id": "c2", "parent": "c1", "text": "reply"},
+        ]
+        columns = normalize_comments_columnar(raw, "vid1", base_cfg, sort_mode="top")
+
+        assert columns["THREAD_DEPTH"] == [0, 1]
+        assert columns["PARENT_ID"] == ["", "c1"]
+        assert columns["SORT_MODE"] == ["top", "top"]
+        assert normalize_comments_columnar([], "vid1", base_cfg) == {}
+
+    def test_none_like_count(self, base_cfg):
         raw = [
             {
                 "id": "c4",
@@ -179,7 +221,7 @@ class TestNormalizeComments:
                 "timestamp": 1700000000,
             }
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["LIKE_COUNT"] == 0
 
@@ -204,11 +246,13 @@ class TestChunkTranscripts:
             for i in range(count)
         ]
 
-    def test_basic_chunking(self):
+    def test_basic_chunking(self, base_cfg):
         # 12 segments of 5s each = 60s total
         # Window=30s, overlap=5s, step=25s
         segments = self._make_segments(12)
-        cfg = _make_cfg(TRANSCRIPT_CHUNK_SECONDS=30, TRANSCRIPT_CHUNK_OVERLAP_SECONDS=5)
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 30, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 5}
+        )
         chunks = chunk_transcripts(segments, cfg)
 
         assert len(chunks) >= 2
@@ -218,10 +262,12 @@ class TestChunkTranscripts:
         assert chunks[0]["OVERLAP_S"] == 0.0  # first chunk has no overlap
         assert chunks[1]["OVERLAP_S"] == 5.0  # subsequent chunks have overlap
 
-    def test_chunking_with_overlap_segments(self):
+    def test_chunking_with_overlap_segments(self, base_cfg):
         # Verify that overlapping windows share segments
         segments = self._make_segments(12)
-        cfg = _make_cfg(TRANSCRIPT_CHUNK_SECONDS=30, TRANSCRIPT_CHUNK_OVERLAP_SECONDS=10)
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 30, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 10}
+        )
         chunks = chunk_transcripts(segments, cfg)
 
         if len(chunks) >= 2:
@@ -230,13 +276,15 @@ class TestChunkTranscripts:
             idx1 = set(chunks[1]["SEGMENT_INDICES"])
             assert idx0 & idx1, "Overlapping chunks should share segment indices"
 
-    def test_empty_segments(self):
-        cfg = _make_cfg()
+    def test_empty_segments(self, base_cfg):
+        cfg = base_cfg
         assert chunk_transcripts([], cfg) == []
 
-    def test_single_segment(self):
+    def test_single_segment(self, base_cfg):
         segments = self._make_segments(1)
-        cfg = _make_cfg(TRANSCRIPT_CHUNK_SECONDS=60, TRANSCRIPT_CHUNK_OVERLAP_SECONDS=10)
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 60, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 10}
+        )
         chunks = chunk_transcripts(segments, cfg)
 
         assert len(chunks) == 1
@@ -244,11 +292,45 @@ class TestChunkTranscripts:
         assert chunks[0]["TEXT"] == "Segment 0"
         assert chunks[0]["SEGMENT_INDICES"] == [0]
 
-    def test_chunk_text_joins_segments(self):
+    def test_chunk_text_joins_segments(self, base_cfg):
         segments = self._make_segments(3, duration=10.0)
         # One big window covering all segments
-        cfg = _make_cfg(TRANSCRIPT_CHUNK_SECONDS=60, TRANSCRIPT_CHUNK_OVERLAP_SECONDS=0)
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 60, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 0}
+        )
         chunks = chunk_transcripts(segments, cfg)
 
         assert len(chunks) == 1
         assert chunks[0]["TEXT"] == "Segment 0 Segment 1 Segment 2"
+
+    def test_long_segment_spans_windows(self, base_cfg):
+        # A 50s segment keeps appearing while later short segments come and go
+        segments = [
+            {"VIDEO_ID": "vid1", "SEGMENT_INDEX": 0, "START_S": 0.0, "END_S": 50.0, "TEXT": "long"},
+            {"VIDEO_ID": "vid1", "SEGMENT_INDEX": 1, "START_S": 5.0, "END_S": 8.0, "TEXT": "a"},
+            {"VIDEO_ID": "vid1", "SEGMENT_INDEX": 2, "START_S": 45.0, "END_S": 60.0, "TEXT": "b"},
+        ]
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 20, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 0}
+        )
+        chunks = chunk_transcripts(segments, cfg)
+
+        assert [c["SEGMENT_INDICES"] for c in chunks] == [[0, 1], [0], [0, 2]]
+        assert [c["START_S"] for c in chunks] == [0.0, 20.0, 40.0]
+        assert chunks[-1]["END_S"] == 60.0
+
+    def test_fallback_without_numpy_matches(self, base_cfg, monkeypatch):
+        pytest.importorskip("numpy")
+        # parse/__init__ re-exports the function under the module's name
+        ct = sys.modules["yt_content_analyzer.parse.chunk_transcripts"]
+        segments = self._make_segments(40, duration=3.0)
+        segments[5]["END_S"] = 90.0  # long segment spanning several windows
+        cfg = base_cfg.model_copy(
+            update={"TRANSCRIPT_CHUNK_SECONDS": 20, "TRANSCRIPT_CHUNK_OVERLAP_SECONDS": 5}
+        )
+        vectorized = chunk_transcripts(segments, cfg)
+
+        monkeypatch.setattr(ct, "_HAVE_NUMBA", False)
+        assert chunk_transcripts(segments, cfg) == vectorized
+        monkeypatch.setattr(ct, "np", None)
+        assert chunk_transcripts(segments, cfg) == vectorized
@@ -2,22 +2,24 @@ from __future__ import annotations
 
 import time
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from yt_content_analyzer.collectors.comments_playwright_ui import (
     _extract_comments_from_api_response,
     _extract_text_from_runs,
+    _iter_comments,
     _parse_comment_entity_payload,
     _parse_comment_renderer,
     _parse_relative_time,
     _parse_vote_count,
 )
-from yt_content_analyzer.config import Settings
+from yt_content_analyzer.models import RawComment
 from yt_content_analyzer.parse.normalize_comments import normalize_comments
 
-
-def _make_cfg(**overrides) -> Settings:
-    return Settings(**overrides)
+from _pw_stubs import FakeResponse
 
 
 # ---------------------------------------------------------------------------
@@ -43,6 +45,17 @@ class TestParseVoteCount:
     def test_comma_separated(self):
         assert _parse_vote_count("1,234") == 1234
 
+    def test_lowercase_suffix_and_padding(self):
+        assert _parse_vote_count(" 1.2 k ") == 1200
+
+    def test_unparseable(self):
+        assert _parse_vote_count("abc") == 0
+        assert _parse_vote_count("1.5") == 0
+
+    def test_non_ascii_digits(self):
+        assert _parse_vote_count("\u0664\u0662") == 42  # Arabic-Indic digits
+        assert _parse_vote_count("\u00b2") == 0  # superscript is a digit, not decimal
+
 
 # ---------------------------------------------------------------------------
 # _parse_relative_time
@@ -82,6 +95,20 @@ class TestParseRelativeTime:
         expected = int(time.time()) - 6 * 2592000
         assert abs(result - expected) < 5
 
+    def test_explicit_now(self):
+        assert _parse_relative_time("2 days ago", now=1_000_000) == 1_000_000 - 2 * 86400
+        assert _parse_relative_time("just now", now=1_000_000) == 1_000_000
+
+    def test_case_insensitive_with_edited(self):
+        result = _parse_relative_time("Just now (edited)")
+        assert abs(result - int(time.time())) < 5
+        result = _parse_relative_time("1 Year ago")
+        assert abs(result - (int(time.time()) - 31536000)) < 5
+
+    def test_repeated_phrasing_uses_each_reference_instant(self):
+        assert _parse_relative_time("2 days ago", now=1_000_000) == 1_000_000 - 2 * 86400
+        assert _parse_relative_time("2 days ago", now=2_000_000) == 2_000_000 - 2 * 86400
+
 
 # ---------------------------------------------------------------------------
 # _extract_text_from_runs
@@ -102,6 +129,9 @@ class TestExtractTextFromRuns:
         runs = [{"text": "a"}, {"url": "http://example.com"}, {"text": "b"}]
         assert _extract_text_from_runs(runs) == "ab"
 
+    def test_single_run_without_text(self):
+        assert _extract_text_from_runs([{"url": "http://example.com"}]) == ""
+
 
 # ---------------------------------------------------------------------------
 # _parse_comment_renderer
@@ -137,6 +167,26 @@ class TestParseCommentRenderer:
         result = _parse_comment_renderer(renderer)
         assert result is None
 
+    def test_optional_fields_missing(self):
+        result = _parse_comment_renderer({"commentId": "Ugz789"})
+        assert result == RawComment(
+            id="Ugz789",
+            parent="root",
+            author="",
+            text="",
+            like_count=0,
+            timestamp=None,
+            reply_count=0,
+        )
+
+    def test_mapping_style_access(self):
+        result = _parse_comment_renderer({"commentId": "Ugz789"})
+        assert result["id"] == result.id == "Ugz789"
+        assert result.get("timestamp") is None
+        assert result.get("missing", "x") == "x"
+        with pytest.raises(KeyError):
+            result["missing"]
+
     def test_reply_has_zero_reply_count(self):
         renderer = {
             "commentId": "Ugz456def",
@@ -213,6 +263,14 @@ class TestParseCommentEntityPayload:
         result = _parse_comment_entity_payload(entity)
         assert result is None
 
+    def test_missing_sub_objects_use_defaults(self):
+        entity = {"properties": {"commentId": "Ugz000", "content": None}}
+        result = _parse_comment_entity_payload(entity)
+        assert result is not None
+        assert result["text"] == ""
+        assert result["author"] == ""
+        assert result["like_count"] == 0
+
     def test_empty_likes(self):
         entity = {
             "properties": {
@@ -389,6 +447,43 @@ class TestExtractCommentsFromApiResponse:
         assert _extract_comments_from_api_response(
             {"onResponseReceivedEndpoints": []}
         ) == []
+        assert _extract_comments_from_api_response(
+            {"frameworkUpdates": {}, "onResponseReceivedEndpoints": None}
+        ) == []
+
+    def test_legacy_used_when_framework_has_no_comments(self):
+        data = {
+            "frameworkUpdates": {"entityBatchUpdate": {"mutations": [
+                {"payload": {"commentSharedEntityPayload": {"key": "shared"}}},
+            ]}},
+            "onResponseReceivedEndpoints": [{"appendContinuationItemsAction": {
+                "continuationItems": [{"commentRenderer": {"commentId": "Ugw_old"}}],
+            }}],
+        }
+        comments = _extract_comments_from_api_response(data)
+        assert [c["id"] for c in comments] == ["Ugw_old"]
+
+    def test_now_shared_across_response(self):
+        entities = [
+            {"payload": {"commentEntityPayload": {"properties": {
+                "commentId": f"c{i}", "publishedTime": "1 hour ago",
+            }}}}
+            for i in range(2)
+        ]
+        data = {"frameworkUpdates": {"entityBatchUpdate": {"mutations": entities}}}
+        comments = _extract_comments_from_api_response(data, now=10_000)
+        assert [c["timestamp"] for c in comments] == [10_000 - 3600] * 2
+
+    def test_iter_comments_is_lazy(self):
+        entities = [
+            {"payload": {"commentEntityPayload": {"properties": {"commentId": f"c{i}"}}}}
+            for i in range(3)
+        ]
+        comments = _iter_comments({"frameworkUpdates": {"entityBatchUpdate": {
+            "mutations": entities,
+        }}})
+        assert next(comments)["id"] == "c0"
+        assert [c["id"] for c in comments] == ["c1", "c2"]
 
     def test_inline_replies(self):
         data = {
@@ -453,46 +548,76 @@ class TestExtractCommentsFromApiResponse:
 # ---------------------------------------------------------------------------
 
 class TestCollectEmpty:
-    def test_no_intercepted_comments(self):
-        """Mock Playwright with no API responses → returns []."""
-        mock_pw_instance = MagicMock()
-        mock_browser = MagicMock()
-        mock_pw_instance.chromium.launch.return_value = mock_browser
-        mock_context = MagicMock()
-        mock_browser.new_context.return_value = mock_context
-        mock_page = MagicMock()
-        mock_context.new_page.return_value = mock_page
-
-        mock_sync_pw = MagicMock()
-        mock_sync_pw.return_value.start.return_value = mock_pw_instance
-
-        with patch(
-            "playwright.sync_api.sync_playwright", mock_sync_pw
-        ):
-            from yt_content_analyzer.collectors.comments_playwright_ui import (
-                collect_comments_playwright_ui,
-            )
+    def test_no_intercepted_comments(self, fake_pw, make_cfg):
+        """Fake Playwright with no API responses → returns []."""
+        from yt_content_analyzer.collectors.comments_playwright_ui import (
+            collect_comments_playwright_ui,
+        )
 
-            cfg = _make_cfg(MAX_COMMENTS_PER_VIDEO=100)
-            result = collect_comments_playwright_ui(
-                "https://www.youtube.com/watch?v=test12345", cfg, sort_mode="top"
-            )
+        cfg = make_cfg(MAX_COMMENTS_PER_VIDEO=100)
+        result = collect_comments_playwright_ui(
+            "https://www.youtube.com/watch?v=test12345", cfg, sort_mode="top"
+        )
         assert result == []
-        mock_browser.close.assert_called_once()
+        assert fake_pw.browser.closed
+        assert fake_pw.stopped
+
+
+class TestCollectIntercepted:
+    def test_comments_parsed_from_response_bytes(self, fake_pw, base_cfg):
+        import json
+
+        from yt_content_analyzer.collectors.comments_playwright_ui import (
+            collect_comments_playwright_ui,
+        )
+
+        body = json.dumps({"frameworkUpdates": {"entityBatchUpdate": {"mutations": [
+            {"payload": {"commentEntityPayload": {"properties": {
+                "commentId": "c1", "content": {"content": "héllo"},
+            }}}},
+        ]}}}).encode()
+        fake_pw.browser.page.responses = [
+            FakeResponse(body),
+            FakeResponse(b"not json"),  # ignored
+            FakeResponse(body, method="GET"),  # not an API POST
+        ]
+
+        result = collect_comments_playwright_ui(
+            "https://www.youtube.com/watch?v=test12345", base_cfg, sort_mode="top"
+        )
+        assert [(c["id"], c["text"]) for c in result] == [("c1", "héllo")]
 
 
 # ---------------------------------------------------------------------------
 # Fallback chain in run.py
 # ---------------------------------------------------------------------------
 
+@pytest.fixture
+def fresh_collectors():
+    """Make run._get_collectors re-import, so sys.modules patches take effect."""
+    from yt_content_analyzer.run import _get_collectors
+
+    _get_collectors.cache_clear()
+    yield
+    _get_collectors.cache_clear()
+
+
+@pytest.mark.usefixtures("fresh_collectors")
 class TestFallbackChain:
+    def test_collectors_imported_once(self):
+        from yt_content_analyzer.run import _get_collectors
+
+        collectors = _get_collectors()
+        assert collectors is _get_collectors()
+        assert callable(collectors.ytdlp.collect_comments_ytdlp)
+
     @patch("yt_content_analyzer.run.write_jsonl")
-    @patch("yt_content_analyzer.run.read_jsonl", return_value=[])
-    def test_playwright_fails_ytdlp_succeeds(self, mock_read, mock_write):
+    @patch("yt_content_analyzer.run.iter_jsonl", return_value=[])
+    def test_playwright_fails_ytdlp_succeeds(self, mock_read, mock_write, make_cfg):
         """When Playwright raises, yt-dlp fallback should be used."""
         from yt_content_analyzer.run import _collect_and_process_comments
 
-        cfg = _make_cfg(
+        cfg = make_cfg(
             VIDEO_URL="https://www.youtube.com/watch?v=test12345",
             COLLECT_SORT_MODES=["top"],
         )
@@ -511,11 +636,14 @@ class TestFallbackChain:
             }
         ]
 
-        # Patch the modules that get lazily imported inside the function
-        mock_pw_mod = MagicMock()
-        mock_pw_mod.collect_comments_playwright_ui.side_effect = RuntimeError("Browser crashed")
-        mock_ytdlp_mod = MagicMock()
-        mock_ytdlp_mod.collect_comments_ytdlp.return_value = fake_ytdlp_comments
+        # Stand-ins for the collector modules imported inside the function
+        def crashing_playwright(*args, **kwargs):
+            raise RuntimeError("Browser crashed")
+
+        mock_pw_mod = SimpleNamespace(collect_comments_playwright_ui=crashing_playwright)
+        mock_ytdlp_mod = SimpleNamespace(
+            collect_comments_ytdlp=lambda url, cfg: fake_ytdlp_comments
+        )
 
         import sys
         from yt_content_analyzer.models import RunResult
@@ -535,15 +663,16 @@ class TestFallbackChain:
         assert mock_write.call_count >= 1
 
 
+@pytest.mark.usefixtures("fresh_collectors")
 class TestSortModeLoop:
     @patch("yt_content_analyzer.run.write_jsonl")
-    @patch("yt_content_analyzer.run.read_jsonl", return_value=[])
-    def test_two_sort_modes_produces_files(self, mock_read, mock_write):
+    @patch("yt_content_analyzer.run.iter_jsonl", return_value=[])
+    def test_two_sort_modes_produces_files(self, mock_read, mock_write, make_cfg):
         """Two sort modes should produce two per-mode files + merged."""
         from yt_content_analyzer.run import _collect_and_process_comments
         from yt_content_analyzer.state.checkpoint import CheckpointStore
 
-        cfg = _make_cfg(
+        cfg = make_cfg(
             VIDEO_URL="https://www.youtube.com/watch?v=test12345",
             COLLECT_SORT_MODES=["top", "newest"],
         )
@@ -580,7 +709,7 @@ class TestSortModeLoop:
         with patch.dict(
             "sys.modules",
             {
-                "yt_content_analyzer.collectors.comments_playwright_ui": MagicMock(
+                "yt_content_analyzer.collectors.comments_playwright_ui": SimpleNamespace(
                     collect_comments_playwright_ui=fake_playwright
                 ),
             },
@@ -600,55 +729,119 @@ class TestSortModeLoop:
         assert len(merged_ids) == 3
         assert merged_ids.count("c2") == 1  # deduped
 
+    @patch("yt_content_analyzer.run.write_jsonl")
+    @patch("yt_content_analyzer.run.iter_jsonl", return_value=[])
+    def test_merge_keeps_order_and_id_less_comments(self, mock_read, mock_write, make_cfg):
+        from yt_content_analyzer.models import RunResult
+        from yt_content_analyzer.run import _collect_and_process_comments
+
+        cfg = make_cfg(COLLECT_SORT_MODES=["top", "newest"])
+        ckpt = MagicMock()
+        ckpt.is_done.return_value = False
+        out_dir = Path("/tmp/test_run")
+        per_mode = {
+            "top": [{"id": "c1", "text": "a"}, {"id": "", "text": "b"}],
+            "newest": [{"id": "", "text": "c"}, {"id": "c1", "text": "a"},
+                       {"id": "c2", "text": "d"}],
+        }
+
+        with patch.dict("sys.modules", {
+            "yt_content_analyzer.collectors.comments_playwright_ui": SimpleNamespace(
+                collect_comments_playwright_ui=lambda url, cfg, sm, **kw: per_mode[sm]
+            ),
+        }):
+            deduped = _collect_and_process_comments(
+                cfg, "https://youtu.be/test1234567", "test1234567", out_dir, ckpt,
+                "test1234567", RunResult(run_id="test", output_dir=out_dir),
+                out_dir / "failures",
+            )
+
+        assert [c["TEXT"] for c in deduped] == ["a", "b", "c", "d"]
+
+    @patch("yt_content_analyzer.run.write_jsonl")
+    def test_resumed_mode_rows_merged_without_refetch(self, mock_write, make_cfg):
+        from yt_content_analyzer.models import RunResult
+        from yt_content_analyzer.run import _collect_and_process_comments
+
+        cfg = make_cfg(COLLECT_SORT_MODES=["top", "newest"])
+        ckpt = MagicMock()
+        ckpt.is_done.side_effect = lambda unit, stage: stage == "comments_collect_top"
+        out_dir = Path("/tmp/test_run")
+        stored_top = [
+            {"VIDEO_ID": "test1234567", "COMMENT_ID": "c1", "TEXT": "a"},
+            {"VIDEO_ID": "other123456", "COMMENT_ID": "c9", "TEXT": "other video"},
+        ]
+        fetched_modes = []
+
+        def fake_playwright(url, cfg, sort_mode, **kwargs):
+            fetched_modes.append(sort_mode)
+            return [{"id": "c1", "text": "a"}, {"id": "c2", "text": "b"}]
+
+        with patch("yt_content_analyzer.run.iter_jsonl", return_value=stored_top), \
+                patch.dict("sys.modules", {
+                    "yt_content_analyzer.collectors.comments_playwright_ui": SimpleNamespace(
+                        collect_comments_playwright_ui=fake_playwright
+                    ),
+                }):
+            deduped = _collect_and_process_comments(
+                cfg, "https://youtu.be/test1234567", "test1234567", out_dir, ckpt,
+                "test1234567", RunResult(run_id="test", output_dir=out_dir),
+                out_dir / "failures",
+            )
+
+        assert fetched_modes == ["newest"]
+        assert [c["COMMENT_ID"] for c in deduped] == ["c1", "c2"]
+        assert deduped[0] is stored_top[0]  # resumed row wins over the re-fetched copy
+
 
 # ---------------------------------------------------------------------------
 # normalize_comments updates
 # ---------------------------------------------------------------------------
 
 class TestNormalizeSortModeParam:
-    def test_sort_mode_top(self):
+    def test_sort_mode_top(self, base_cfg):
         raw = [
             {"id": "c1", "parent": "root", "author": "A", "text": "hi",
              "like_count": 1, "timestamp": 1700000000},
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg, sort_mode="top")
         assert result[0]["SORT_MODE"] == "top"
 
-    def test_sort_mode_default_when_omitted(self):
+    def test_sort_mode_default_when_omitted(self, base_cfg):
         raw = [
             {"id": "c1", "parent": "root", "author": "A", "text": "hi",
              "like_count": 1, "timestamp": 1700000000},
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["SORT_MODE"] == "default"
 
 
 class TestNormalizeReplyCount:
-    def test_reply_count_from_raw(self):
+    def test_reply_count_from_raw(self, base_cfg):
         raw = [
             {"id": "c1", "parent": "root", "author": "A", "text": "hi",
              "like_count": 1, "timestamp": 1700000000, "reply_count": 5},
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["REPLY_COUNT"] == 5
 
-    def test_reply_count_missing(self):
+    def test_reply_count_missing(self, base_cfg):
         raw = [
             {"id": "c1", "parent": "root", "author": "A", "text": "hi",
              "like_count": 1, "timestamp": 1700000000},
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["REPLY_COUNT"] == 0
 
-    def test_reply_count_none(self):
+    def test_reply_count_none(self, base_cfg):
         raw = [
             {"id": "c1", "parent": "root", "author": "A", "text": "hi",
              "like_count": 1, "timestamp": 1700000000, "reply_count": None},
         ]
-        cfg = _make_cfg()
+        cfg = base_cfg
         result = normalize_comments(raw, "vid1", cfg)
         assert result[0]["REPLY_COUNT"] == 0
@@ -11,6 +11,8 @@ from yt_content_analyzer.enrich.llm_client import (
     chat_completion,
     get_embeddings,
     parse_json_response,
+    _close_idle_connections,
+    _http_post,
     _resolve_base_url,
 )
 
@@ -43,15 +45,19 @@ def _make_cfg(**overrides) -> Settings:
     return Settings(**defaults)
 
 
-def _mock_urlopen_response(data: dict, status: int = 200):
-    """Create a mock response for urllib.request.urlopen."""
-    body = json.dumps(data).encode("utf-8")
-    resp = MagicMock()
-    resp.read.return_value = body
-    resp.__enter__ = lambda s: s
-    resp.__exit__ = MagicMock(return_value=False)
-    resp.status = status
-    return resp
+@pytest.fixture(autouse=True)
+def _clear_embedding_cache():
+    """Keep get_embeddings' process-wide LRU from leaking vectors between tests."""
+    from yt_content_analyzer.enrich.llm_cache import embedding_cache
+
+    embedding_cache.clear()
+    yield
+    embedding_cache.clear()
+
+
+def _mock_http_response(data: dict) -> bytes:
+    """Create a response body as returned by llm_client._http_post."""
+    return json.dumps(data).encode("utf-8")
 
 
 def _sample_items(n: int = 30, asset_type: str = "comments") -> list[dict]:
@@ -77,9 +83,9 @@ class TestChatCompletion:
         resp_data = {
             "choices": [{"message": {"content": "Hello, world!"}}]
         }
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             result = chat_completion(cfg, [{"role": "user", "content": "Hi"}])
             assert result == "Hello, world!"
 
@@ -96,15 +102,250 @@ class TestChatCompletion:
             fp=io.BytesIO(b"rate limited"),
         )
         resp_data = {"choices": [{"message": {"content": "Success after retry"}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
         with patch(
-            "yt_content_analyzer.enrich.llm_client.urllib.request.urlopen",
+            "yt_content_analyzer.enrich.llm_client._http_post",
             side_effect=[error_429, mock_resp],
         ):
             result = chat_completion(cfg, [{"role": "user", "content": "Hi"}])
             assert result == "Success after retry"
 
+    def test_in_flight_requests_capped_across_pools(self):
+        import threading
+        import time
+
+        from yt_content_analyzer.enrich.llm_client import map_api_calls
+
+        cfg = _make_cfg(LLM_PROVIDER="local", API_MAX_CONCURRENT_CALLS=2)
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def fake_post(url, body, headers, timeout):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return _mock_http_response({"choices": [{"message": {"content": "ok"}}]})
+
+        def stage(n):  # like one enrichment stage fanning out its own batches
+            return map_api_calls(
+                lambda i: chat_completion(cfg, [{"role": "user", "content": f"{n}-{i}"}]),
+                range(4), cfg.API_MAX_CONCURRENT_CALLS,
+            )
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", side_effect=fake_post):
+            results = map_api_calls(stage, range(3), 3)
+
+        assert results == [["ok"] * 4] * 3
+        assert peak == 2
+
+
+class TestResponseCache:
+    def _chat(self, cfg, content="Hi", **kwargs):
+        return chat_completion(cfg, [{"role": "user", "content": content}], **kwargs)
+
+    def test_identical_request_served_from_cache(self, tmp_path):
+        cfg = _make_cfg(
+            LLM_PROVIDER="local", LLM_CACHE_ENABLE=True,
+            LLM_CACHE_PATH=str(tmp_path / "llm_cache.sqlite"),
+        )
+        body = _mock_http_response({"choices": [{"message": {"content": "cached"}}]})
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post:
+            assert self._chat(cfg) == "cached"
+            assert self._chat(cfg) == "cached"
+            assert post.call_count == 1
+            self._chat(cfg, content="Different")
+            assert post.call_count == 2
+
+    def test_expired_entry_ignored(self, tmp_path):
+        cfg = _make_cfg(
+            LLM_PROVIDER="local", LLM_CACHE_ENABLE=True,
+            LLM_CACHE_PATH=str(tmp_path / "llm_cache.sqlite"), LLM_CACHE_TTL_S=60,
+        )
+        body = _mock_http_response({"choices": [{"message": {"content": "fresh"}}]})
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post:
+            self._chat(cfg)
+            with patch("yt_content_analyzer.enrich.llm_cache.time.time", return_value=2e10):
+                self._chat(cfg)
+        assert post.call_count == 2
+
+    def test_semantic_match_served_from_cache(self, tmp_path):
+        cfg = _make_cfg(
+            LLM_PROVIDER="local", LLM_SEMANTIC_CACHE_ENABLE=True,
+            LLM_CACHE_PATH=str(tmp_path / "llm_cache.sqlite"),
+        )
+        body = _mock_http_response({"choices": [{"message": {"content": "answer"}}]})
+        vectors = {"A": [1.0, 0.0], "A'": [0.99, 0.05], "B": [0.0, 1.0]}
+
+        def fake_embed(cfg, texts):
+            return [vectors[texts[0].rsplit(" ", 1)[-1]]]
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post, \
+                patch("yt_content_analyzer.enrich.llm_client.get_embeddings", fake_embed):
+            assert self._chat(cfg, "A", semantic_scope=("vid1", "comments")) == "answer"
+            assert self._chat(cfg, "A'", semantic_scope=("vid1", "comments")) == "answer"
+            assert post.call_count == 1
+            self._chat(cfg, "B", semantic_scope=("vid1", "comments"))
+            assert post.call_count == 2
+
+    def test_semantic_match_requires_opt_in(self, tmp_path):
+        cfg = _make_cfg(
+            LLM_PROVIDER="local", LLM_SEMANTIC_CACHE_ENABLE=True,
+            LLM_CACHE_PATH=str(tmp_path / "llm_cache.sqlite"),
+        )
+        body = _mock_http_response({"choices": [{"message": {"content": "answer"}}]})
+        embed = MagicMock(return_value=[[1.0, 0.0]])
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post, \
+                patch("yt_content_analyzer.enrich.llm_client.get_embeddings", embed):
+            self._chat(cfg, "batch 1", semantic_scope=("vid1", "comments"))
+            self._chat(cfg, "batch 2")
+        assert post.call_count == 2
+        embed.assert_called_once()
+
+    def test_semantic_match_limited_to_scope(self, tmp_path):
+        cfg = _make_cfg(
+            LLM_PROVIDER="local", LLM_SEMANTIC_CACHE_ENABLE=True,
+            LLM_CACHE_PATH=str(tmp_path / "llm_cache.sqlite"),
+        )
+        body = _mock_http_response({"choices": [{"message": {"content": "answer"}}]})
+        embed = MagicMock(return_value=[[1.0, 0.0]])  # every prompt looks identical
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post, \
+                patch("yt_content_analyzer.enrich.llm_client.get_embeddings", embed):
+            self._chat(cfg, "video A", semantic_scope=("vidA", "comments"))
+            self._chat(cfg, "video B", semantic_scope=("vidB", "comments"))
+            self._chat(cfg, "video A again", semantic_scope=("vidA", "comments"))
+        assert post.call_count == 2
+
+    def test_semantic_rows_deduped_pruned_and_capped(self, tmp_path):
+        from yt_content_analyzer.enrich.llm_cache import ResponseCache
+
+        cache = ResponseCache(tmp_path / "c.sqlite", ttl_s=60, max_semantic_rows=2)
+
+        def rows():
+            return cache._conn.execute(
+                "SELECT scope, response FROM semantic ORDER BY rowid"
+            ).fetchall()
+
+        with patch("yt_content_analyzer.enrich.llm_cache.time.time", return_value=1000):
+            cache.put_semantic("other", [0.0, 1.0], "stale")
+        cache.put_semantic("s", [1.0, 0.0], "first")
+        cache.put_semantic("s", [1.0, 0.0], "again")
+        assert rows() == [("s", "again")]
+
+        cache.put_semantic("s", [0.0, 1.0], "second")
+        cache.put_semantic("s", [1.0, 1.0], "third")
+        assert rows() == [("s", "second"), ("s", "third")]
+        assert cache.nearest("s", [1.0, 0.0], 0.99) is None
+        assert cache.nearest("s", [0.0, 2.0], 0.99) == "second"
+
+    def test_disabled_by_default(self, tmp_path):
+        cfg = _make_cfg(LLM_PROVIDER="local", LLM_CACHE_PATH=str(tmp_path / "c.sqlite"))
+        body = _mock_http_response({"choices": [{"message": {"content": "x"}}]})
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post:
+            self._chat(cfg)
+            self._chat(cfg)
+        assert post.call_count == 2
+        assert not (tmp_path / "c.sqlite").exists()
+
+
+@pytest.fixture
+def local_server(monkeypatch):
+    """A keep-alive HTTP/1.1 server on localhost; yields (base_url, peer ports seen).
+
+    ``/fail`` answers 503, ``/hang`` never answers, and ``/drop`` answers but
+    then closes the connection without announcing it.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    peers: list[int] = []
+    release = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            peers.append(self.client_address[1])
+            if self.path == "/hang":
+                release.wait(5)
+                self.close_connection = True
+                return
+            status = 503 if self.path == "/fail" else 200
+            body = b'{"ok": true}'
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            if self.path == "/drop":
+                self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    monkeypatch.setattr("yt_content_analyzer.enrich.llm_client._proxied_schemes", frozenset)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", peers
+    release.set()
+    _close_idle_connections()
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpPost:
+    def test_connection_reused(self, local_server):
+        base_url, peers = local_server
+        for _ in range(3):
+            assert _http_post(f"{base_url}/ok", b"{}", {}, 5) == b'{"ok": true}'
+        assert len(peers) == 3
+        assert len(set(peers)) == 1
+
+    def test_connection_reused_across_threads(self, local_server):
+        import threading
+
+        base_url, peers = local_server
+        for _ in range(3):  # one short-lived thread per request, like map_api_calls pools
+            thread = threading.Thread(target=_http_post, args=(f"{base_url}/ok", b"{}", {}, 5))
+            thread.start()
+            thread.join()
+        assert len(peers) == 3
+        assert len(set(peers)) == 1
+
+    def test_error_status_raises_http_error(self, local_server):
+        import urllib.error
+
+        base_url, _ = local_server
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            _http_post(f"{base_url}/fail", b"{}", {}, 5)
+        assert exc_info.value.code == 503
+
+    def test_timeout_on_reused_connection_not_resent(self, local_server):
+        import urllib.error
+
+        base_url, peers = local_server
+        _http_post(f"{base_url}/ok", b"{}", {}, 5)  # leaves one idle connection
+        with pytest.raises(urllib.error.URLError):
+            _http_post(f"{base_url}/hang", b"{}", {}, 0.2)
+        assert len(peers) == 2  # the warm-up and exactly one /hang POST
+
+    def test_closed_idle_connection_retried_once(self, local_server):
+        base_url, peers = local_server
+        _http_post(f"{base_url}/drop", b"{}", {}, 5)  # pooled, then closed by the server
+        assert _http_post(f"{base_url}/ok", b"{}", {}, 5) == b'{"ok": true}'
+        assert len(peers) == 2
+        assert peers[0] != peers[1]
+
 
 class TestGetEmbeddings:
     def test_get_embeddings_success(self):
@@ -115,15 +356,42 @@ class TestGetEmbeddings:
                 {"index": 1, "embedding": [0.4, 0.5, 0.6]},
             ]
         }
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             result = get_embeddings(cfg, ["hello", "world"])
             assert len(result) == 2
             assert result[0] == [0.1, 0.2, 0.3]
             assert result[1] == [0.4, 0.5, 0.6]
 
 
+    def test_repeated_texts_requested_once(self):
+        cfg = _make_cfg()
+
+        def fake_post(url, body, headers, timeout):
+            inputs = json.loads(body)["input"]
+            data = [{"index": i, "embedding": [float(len(t))]} for i, t in enumerate(inputs)]
+            return _mock_http_response({"data": data})
+
+        with patch(
+            "yt_content_analyzer.enrich.llm_client._http_post", side_effect=fake_post,
+        ) as mock_post:
+            assert get_embeddings(cfg, ["a", "bb", "a"]) == [[1.0], [2.0], [1.0]]
+            assert get_embeddings(cfg, ["bb", "ccc"]) == [[2.0], [3.0]]
+
+        sent = [json.loads(c.args[1])["input"] for c in mock_post.call_args_list]
+        assert sent == [["a", "bb"], ["ccc"]]
+
+    def test_cache_disabled(self):
+        cfg = _make_cfg(EMBEDDINGS_CACHE_SIZE=0)
+        body = _mock_http_response({"data": [{"index": 0, "embedding": [0.5]}]})
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=body) as post:
+            get_embeddings(cfg, ["a"])
+            get_embeddings(cfg, ["a"])
+        assert post.call_count == 2
+
+
 class TestParseJsonResponse:
     def test_parse_json_response_strips_fences(self):
         text = '```json\n{"topics": [{"label": "AI"}]}\n```'
@@ -140,6 +408,10 @@ class TestParseJsonResponse:
         result = parse_json_response(text)
         assert result == {"key": "value"}
 
+    def test_parse_json_response_fenced_array_with_preamble(self):
+        text = 'Sure:\n```json\n[1, 2]\n```'
+        assert parse_json_response(text) == [1, 2]
+
     def test_parse_json_response_invalid_raises(self):
         with pytest.raises(ValueError, match="Could not parse JSON"):
             parse_json_response("not json at all")
@@ -211,6 +483,24 @@ class TestTopicsNlp:
             assert isinstance(r["KEYWORDS"], list)
             assert isinstance(r["SCORE"], float)
 
+    def test_embeddings_clustered_by_direction(self):
+        import numpy as np
+
+        from yt_content_analyzer.enrich.topics_nlp import extract_topics_nlp
+
+        cfg = _make_cfg()
+        items = _sample_items(20)  # two topics
+        # Two directions at very different lengths; lengths must not drive clustering
+        embeddings = np.zeros((20, 2), dtype=np.float32)
+        embeddings[:10, 0] = np.tile([1.0, 50.0], 5)
+        embeddings[10:, 1] = np.tile([1.0, 50.0], 5)
+        original = embeddings.copy()
+
+        results = extract_topics_nlp(items, "vid", "comments", cfg, embeddings)
+
+        assert sorted(r["SCORE"] for r in results) == [0.5, 0.5]
+        np.testing.assert_array_equal(embeddings, original)
+
     def test_extract_topics_empty_input(self):
         from yt_content_analyzer.enrich.topics_nlp import extract_topics_nlp
 
@@ -243,9 +533,9 @@ class TestTopicsLlm:
         })
 
         resp_data = {"choices": [{"message": {"content": llm_response}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             results = extract_topics_llm(items, "vid789", "comments", cfg)
 
         assert len(results) == 2
@@ -292,6 +582,23 @@ class TestSentimentNlp:
         required_keys = {"VIDEO_ID", "ASSET_TYPE", "ITEM_ID", "POLARITY", "SCORE", "TEXT_EXCERPT"}
         assert required_keys == set(results[0].keys())
 
+    def test_repeated_text_scored_once(self):
+        from yt_content_analyzer.enrich.sentiment import _sentiment_analyzer, analyze_sentiment_nlp
+
+        cfg = _make_cfg()
+        items = [
+            {"TEXT": "Great video!", "COMMENT_ID": "c1"},
+            {"TEXT": "Awful.", "COMMENT_ID": "c2"},
+            {"TEXT": "Great video!", "COMMENT_ID": "c3"},
+        ]
+        analyzer = _sentiment_analyzer()
+        with patch.object(analyzer, "analyze", wraps=analyzer.analyze) as analyze:
+            results = analyze_sentiment_nlp(items, "vid1", "comments", cfg)
+
+        assert analyze.call_count == 2
+        assert [r["ITEM_ID"] for r in results] == ["c1", "c2", "c3"]
+        assert results[0]["SCORE"] == results[2]["SCORE"]
+
     def test_analyze_sentiment_dispatch_no_llm(self):
         from yt_content_analyzer.enrich.sentiment import analyze_sentiment
 
@@ -321,9 +628,9 @@ class TestSentimentLlm:
             ]
         })
         resp_data = {"choices": [{"message": {"content": llm_response}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             results = analyze_sentiment_llm(items, "vid1", "comments", cfg)
 
         assert len(results) == 2
@@ -331,6 +638,98 @@ class TestSentimentLlm:
         assert results[0]["SCORE"] == 0.85
         assert results[1]["POLARITY"] == "negative"
 
+    def test_analyze_sentiment_llm_mixed_asset_types(self):
+        from yt_content_analyzer.enrich.sentiment import analyze_sentiment_llm
+
+        cfg = _make_cfg(LLM_PROVIDER="local", LLM_ENDPOINT="http://localhost:1234/v1")
+        items = [
+            {"TEXT": "Great stuff!", "COMMENT_ID": "c1"},
+            {"TEXT": "Today we talk about tests.", "CHUNK_INDEX": 0},
+        ]
+
+        llm_response = json.dumps({
+            "results": [
+                {"id": "c1", "polarity": "positive", "score": 0.85},
+                {"id": "0", "polarity": "neutral", "score": 0.0},
+            ]
+        })
+        resp_data = {"choices": [{"message": {"content": llm_response}}]}
+        mock_resp = _mock_http_response(resp_data)
+
+        with patch(
+            "yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp,
+        ) as mock_open:
+            results = analyze_sentiment_llm(items, "vid1", ["comments", "transcripts"], cfg)
+
+        assert mock_open.call_count == 1
+        assert [r["ASSET_TYPE"] for r in results] == ["comments", "transcripts"]
+        assert results[1]["TEXT_EXCERPT"] == "Today we talk about tests."
+
+    def test_batches_sent_concurrently_in_order(self):
+        import re
+        import threading
+
+        from yt_content_analyzer.enrich.sentiment import analyze_sentiment_llm
+
+        cfg = _make_cfg(LLM_PROVIDER="local", API_MAX_CONCURRENT_CALLS=3)
+        items = _sample_items(150)  # three batches of 50
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_chat(cfg, messages, **kwargs):
+            barrier.wait()  # only passes once all three batches are in flight
+            ids = re.findall(r"^\[(comment_\d+)\]", messages[1]["content"], re.MULTILINE)
+            if ids[0] == "comment_50":
+                raise ConnectionError("middle batch fails")
+            return json.dumps({"results": [{"id": i, "polarity": "neutral"} for i in ids]})
+
+        with patch("yt_content_analyzer.enrich.sentiment.chat_completion", fake_chat):
+            results = analyze_sentiment_llm(items, "vid1", "comments", cfg)
+
+        expected = [f"comment_{i}" for i in [*range(50), *range(100, 150)]]
+        assert [r["ITEM_ID"] for r in results] == expected
+
+    def test_batch_size_from_config(self):
+        import re
+
+        from yt_content_analyzer.enrich.sentiment import analyze_sentiment_llm
+
+        cfg = _make_cfg(LLM_PROVIDER="local", SENTIMENT_BATCH_SIZE=4)
+        calls = []
+
+        def fake_chat(cfg, messages, **kwargs):
+            ids = re.findall(r"^\[(comment_\d+)\]", messages[1]["content"], re.MULTILINE)
+            calls.append(ids)
+            return json.dumps({"results": [{"id": i, "polarity": "neutral"} for i in ids]})
+
+        with patch("yt_content_analyzer.enrich.sentiment.chat_completion", fake_chat):
+            results = analyze_sentiment_llm(_sample_items(10), "vid1", "comments", cfg)
+
+        assert sorted(len(c) for c in calls) == [2, 4, 4]
+        assert [r["ITEM_ID"] for r in results] == [f"comment_{i}" for i in range(10)]
+
+    def test_oversized_batch_split_and_retried(self):
+        import re
+        import urllib.error
+
+        from yt_content_analyzer.enrich.sentiment import analyze_sentiment_llm
+
+        cfg = _make_cfg(LLM_PROVIDER="local", SENTIMENT_BATCH_SIZE=8)
+        calls = []
+
+        def fake_chat(cfg, messages, **kwargs):
+            ids = re.findall(r"^\[(comment_\d+)\]", messages[1]["content"], re.MULTILINE)
+            calls.append(len(ids))
+            if len(ids) > 2:
+                body = b'{"error": {"code": "context_length_exceeded"}}'
+                raise urllib.error.HTTPError("u", 400, "Bad Request", None, io.BytesIO(body))
+            return json.dumps({"results": [{"id": i, "polarity": "neutral"} for i in ids]})
+
+        with patch("yt_content_analyzer.enrich.sentiment.chat_completion", fake_chat):
+            results = analyze_sentiment_llm(_sample_items(8), "vid1", "comments", cfg)
+
+        assert [r["ITEM_ID"] for r in results] == [f"comment_{i}" for i in range(8)]
+        assert calls == [8, 4, 4, 2, 2, 2, 2]
+
 
 # ===========================================================================
 # Triples Tests
@@ -372,9 +771,9 @@ class TestTriples:
             ]
         })
         resp_data = {"choices": [{"message": {"content": llm_response}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             results = extract_triples(items, "vid1", "comments", cfg)
 
         assert len(results) == 2
@@ -422,6 +821,24 @@ class TestEmbeddingsClient:
             result = compute_embeddings(["hello"], cfg)
             assert result is None
 
+    def test_compute_embeddings_batches_in_order(self):
+        from yt_content_analyzer.enrich.embeddings_client import compute_embeddings
+
+        cfg = _make_cfg(EMBEDDINGS_BATCH_SIZE=2, API_MAX_CONCURRENT_CALLS=3)
+        texts = [str(i) for i in range(5)]
+
+        def fake_embeddings(cfg, batch):
+            return [[float(t)] for t in batch]
+
+        with patch(
+            "yt_content_analyzer.enrich.embeddings_client.get_embeddings",
+            side_effect=fake_embeddings,
+        ) as mock_get:
+            result = compute_embeddings(texts, cfg)
+
+        assert mock_get.call_count == 3
+        assert result == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+
 
 # ===========================================================================
 # IO Tests
@@ -451,6 +868,31 @@ class TestUrlExtraction:
         assert results[1]["URL"] == "https://foo.org"
         assert results[1]["MENTION_COUNT"] == 1
 
+    def test_ties_keep_first_seen_order(self):
+        from yt_content_analyzer.enrich.url_extraction import extract_urls
+
+        items = [
+            {"TEXT": "https://b.org https://a.org", "COMMENT_ID": "c1"},
+            {"TEXT": "https://c.org https://a.org", "COMMENT_ID": "c2"},
+        ]
+        results = extract_urls(items, "vid1", "comments", _make_cfg())
+
+        assert [r["URL"] for r in results] == ["https://a.org", "https://b.org", "https://c.org"]
+        assert [r["FIRST_SEEN_ITEM_ID"] for r in results] == ["c1", "c1", "c2"]
+
+    def test_unique_cap_keeps_counting_known_urls(self):
+        from yt_content_analyzer.enrich.url_extraction import extract_urls
+
+        items = [
+            {"TEXT": "https://a.org https://b.org", "COMMENT_ID": "c1"},
+            {"TEXT": "https://c.org https://a.org https://b.org", "COMMENT_ID": "c2"},
+        ]
+        results = extract_urls(items, "vid1", "comments", _make_cfg(URL_MAX_UNIQUE=2))
+
+        assert [(r["URL"], r["MENTION_COUNT"]) for r in results] == [
+            ("https://a.org", 2), ("https://b.org", 2),
+        ]
+
     def test_schema_completeness(self):
         from yt_content_analyzer.enrich.url_extraction import extract_urls
 
@@ -530,9 +972,9 @@ class TestSummarization:
             "tone": "informative",
         })
         resp_data = {"choices": [{"message": {"content": llm_response}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             results = summarize_content(items, "vid1", "comments", cfg)
 
         assert len(results) == 1
@@ -571,9 +1013,9 @@ class TestSummarization:
             "tone": "neutral",
         })
         resp_data = {"choices": [{"message": {"content": llm_response}}]}
-        mock_resp = _mock_urlopen_response(resp_data)
+        mock_resp = _mock_http_response(resp_data)
 
-        with patch("yt_content_analyzer.enrich.llm_client.urllib.request.urlopen", return_value=mock_resp):
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", return_value=mock_resp):
             results = summarize_content(items, "vid1", "comments", cfg)
 
         assert len(results) == 1
@@ -587,7 +1029,7 @@ class TestSummarization:
         items = _sample_items(5)
 
         with patch(
-            "yt_content_analyzer.enrich.llm_client.urllib.request.urlopen",
+            "yt_content_analyzer.enrich.llm_client._http_post",
             side_effect=RuntimeError("connection refused"),
         ):
             results = summarize_content(items, "vid1", "comments", cfg)
@@ -614,3 +1056,63 @@ class TestReadJsonl:
         write_jsonl(path, rows)
         result = read_jsonl(path)
         assert result == rows
+
+    def test_write_jsonl_batches_and_appends(self, tmp_path, monkeypatch):
+        from yt_content_analyzer.utils import io
+        from yt_content_analyzer.utils.io import read_jsonl, write_jsonl
+
+        monkeypatch.setattr(io, "_WRITE_CHUNK_BYTES", 32)
+        path = tmp_path / "test.jsonl"
+        rows = [{"i": i, "TEXT": "caf\u00e9 " * i} for i in range(20)]
+        write_jsonl(path, rows[:10], mode="w")
+        write_jsonl(path, rows[10:])
+        assert read_jsonl(path) == rows
+
+    def test_async_writer_preserves_order(self, tmp_path):
+        from yt_content_analyzer.utils.io import AsyncJsonlWriter, read_jsonl
+
+        path = tmp_path / "out" / "test.jsonl"
+        with AsyncJsonlWriter() as writer:
+            for i in range(5):
+                writer.submit(path, [{"i": i}])
+            writer.flush()
+            assert [r["i"] for r in read_jsonl(path)] == [0, 1, 2, 3, 4]
+
+    def test_async_writer_flush_raises_write_error(self, tmp_path):
+        from yt_content_analyzer.utils.io import AsyncJsonlWriter
+
+        writer = AsyncJsonlWriter()
+        writer.submit(tmp_path / "missing" / "x.jsonl", [{"a": 1}], ensure_dir=False)
+        with pytest.raises(FileNotFoundError):
+            writer.flush()
+        writer.close()
+
+    def test_async_writer_on_done_only_after_successful_writes(self, tmp_path):
+        from yt_content_analyzer.utils.io import AsyncJsonlWriter
+
+        done = []
+        with AsyncJsonlWriter() as writer:
+            writer.submit(tmp_path / "a.jsonl", [{"a": 1}], on_done=lambda: done.append("a"))
+            writer.flush()
+            writer.submit(tmp_path / "missing" / "b.jsonl", [{"b": 1}], ensure_dir=False,
+                          on_done=lambda: done.append("b"))
+            writer.submit(tmp_path / "c.jsonl", [{"c": 1}], on_done=lambda: done.append("c"))
+            with pytest.raises(FileNotFoundError):
+                writer.flush()
+        assert done == ["a"]
+        assert (tmp_path / "c.jsonl").exists()
+
+    def test_write_jsonl_without_ensure_dir(self, tmp_path):
+        from yt_content_analyzer.utils.io import write_jsonl
+
+        with pytest.raises(FileNotFoundError):
+            write_jsonl(tmp_path / "missing" / "x.jsonl", [{"a": 1}], ensure_dir=False)
+        write_jsonl(tmp_path / "x.jsonl", [{"a": 1}], ensure_dir=False)
+        assert (tmp_path / "x.jsonl").exists()
+
+    def test_write_csv_missing_and_extra_keys(self, tmp_path):
+        from yt_content_analyzer.utils.io import write_csv
+
+        path = tmp_path / "test.csv"
+        write_csv(path, [{"a": 1, "extra": 3}, {"b": "x,y"}], ["a", "b"], mode="w")
+        assert path.read_text(encoding="utf-8").splitlines() == ["a,b", "1,", ',"x,y"']
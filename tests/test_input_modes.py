@@ -5,9 +5,10 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from _ytdlp_stubs import FakeYtDlp
 
 from yt_content_analyzer.config import Settings
-from yt_content_analyzer.run import extract_video_id, _video_out_dir
+from yt_content_analyzer.run import extract_video_id, _new_run_id, _video_out_dir
 
 
 # ---------------------------------------------------------------------------
@@ -41,6 +42,10 @@ class TestExtractVideoIdBareId:
         with pytest.raises(ValueError, match="Cannot extract video ID"):
             extract_video_id("abcdefghijkl")
 
+    def test_non_ascii_bare_id_raises(self):
+        with pytest.raises(ValueError, match="Cannot extract video ID"):
+            extract_video_id("abcdéfghijk")
+
 
 # ---------------------------------------------------------------------------
 # _video_out_dir helper
@@ -58,13 +63,101 @@ class TestVideoOutDir:
         assert result == base
 
 
+class TestConcurrentVideos:
+    def _run(self, tmp_path, fake_process, **overrides):
+        from yt_content_analyzer.run import run_all
+
+        cfg = Settings(**overrides)
+        videos = [{"VIDEO_URL": f"u{i}", "VIDEO_ID": f"vid{i}"} for i in range(3)]
+        with patch("yt_content_analyzer.run._build_video_list", return_value=videos), \
+                patch("yt_content_analyzer.run._process_single_video", fake_process), \
+                patch("yt_content_analyzer.run.setup_file_handler"):
+            return run_all(cfg, output_dir=tmp_path, resume_run_id="run1")
+
+    def test_videos_run_in_parallel_and_merge_in_order(self, tmp_path):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_process(cfg, url, video_id, out_dir, ckpt, result, failures_dir, *, writer):
+            barrier.wait()  # only passes once all three videos are in flight
+            ckpt.mark(video_id, "transcript")
+            result.output_files.append(Path(video_id))
+            result.videos_processed += 1
+
+        result = self._run(tmp_path, fake_process, MAX_CONCURRENT_VIDEOS=3)
+
+        assert result.videos_processed == 3
+        assert result.output_files == [Path("vid0"), Path("vid1"), Path("vid2")]
+        checkpoint = (tmp_path / "run1" / "state" / "checkpoint.json").read_text()
+        assert all(f'"vid{i}"' in checkpoint for i in range(3))
+
+    def test_llm_calls_capped_across_videos(self, tmp_path):
+        import json
+        import threading
+        import time
+
+        from yt_content_analyzer.enrich.llm_client import chat_completion, map_api_calls
+
+        lock = threading.Lock()
+        in_flight = peak = 0
+
+        def fake_post(url, body, headers, timeout):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+
+        def fake_process(cfg, url, video_id, out_dir, ckpt, result, failures_dir, *, writer):
+            map_api_calls(
+                lambda i: chat_completion(cfg, [{"role": "user", "content": f"{video_id}-{i}"}]),
+                range(4), cfg.API_MAX_CONCURRENT_CALLS,
+            )
+            result.videos_processed += 1
+
+        with patch("yt_content_analyzer.enrich.llm_client._http_post", side_effect=fake_post):
+            result = self._run(
+                tmp_path, fake_process, MAX_CONCURRENT_VIDEOS=3, API_MAX_CONCURRENT_CALLS=2,
+                LLM_PROVIDER="local",
+            )
+
+        assert result.videos_processed == 3
+        assert peak == 2
+
+    def test_flat_output_stays_sequential(self, tmp_path):
+        import threading
+
+        def fake_process(cfg, url, video_id, out_dir, ckpt, result, failures_dir, *, writer):
+            assert threading.current_thread() is threading.main_thread()
+            result.videos_processed += 1
+
+        result = self._run(
+            tmp_path, fake_process, MAX_CONCURRENT_VIDEOS=3, OUTPUT_PER_VIDEO=False,
+        )
+        assert result.videos_processed == 3
+
+
+class TestNewRunId:
+    def test_utc_compact_format(self):
+        import re
+        from datetime import datetime, timezone
+
+        run_id = _new_run_id()
+        assert re.fullmatch(r"\d{8}T\d{6}Z", run_id)
+        parsed = datetime.strptime(run_id, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        assert abs((datetime.now(timezone.utc) - parsed).total_seconds()) < 5
+
+
 # ---------------------------------------------------------------------------
 # CLI: --channel flag
 # ---------------------------------------------------------------------------
 
 class TestChannelCLI:
-    def test_channel_flag_constructs_subscriptions(self, tmp_path):
-        from click.testing import CliRunner
+    def test_channel_flag_constructs_subscriptions(self, tmp_path, runner):
         from yt_content_analyzer.cli import main
 
         cfg_file = tmp_path / "config.yml"
@@ -75,7 +168,6 @@ class TestChannelCLI:
                 run_id="test", output_dir=tmp_path, videos_processed=0,
                 comments_collected=0, transcript_chunks=0, failures=[],
             )
-            runner = CliRunner()
             result = runner.invoke(main, [
                 "run-all", "--config", str(cfg_file),
                 "--channel", "@fahdmirza",
@@ -89,8 +181,7 @@ class TestChannelCLI:
                 assert call_cfg.YT_SUBSCRIPTIONS[0]["CHANNEL"] == "@fahdmirza"
                 assert call_cfg.YT_SUBSCRIPTIONS[1]["CHANNEL"] == "@engineerprompt"
 
-    def test_channel_flag_single(self, tmp_path):
-        from click.testing import CliRunner
+    def test_channel_flag_single(self, tmp_path, runner):
         from yt_content_analyzer.cli import main
 
         cfg_file = tmp_path / "config.yml"
@@ -101,7 +192,6 @@ class TestChannelCLI:
                 run_id="test", output_dir=tmp_path, videos_processed=0,
                 comments_collected=0, transcript_chunks=0, failures=[],
             )
-            runner = CliRunner()
             result = runner.invoke(main, [
                 "run-all", "--config", str(cfg_file),
                 "--channel", "@fahdmirza",
@@ -117,30 +207,25 @@ class TestChannelCLI:
 # ---------------------------------------------------------------------------
 
 class TestSearchResolver:
-    def _make_mock_ydl(self, fake_info):
-        mock_ydl = MagicMock()
-        mock_ydl.__enter__ = MagicMock(return_value=mock_ydl)
-        mock_ydl.__exit__ = MagicMock(return_value=False)
-        mock_ydl.extract_info.return_value = fake_info
-        return mock_ydl
-
-    @patch.dict("sys.modules", {"yt_dlp": MagicMock()})
-    def test_resolve_search_basic(self):
-        import sys
-        mock_ytdlp = sys.modules["yt_dlp"]
+    @pytest.fixture
+    def resolve(self, install_ytdlp):
+        """Run resolve_search_videos against a stub yt_dlp returning *fake_info*."""
+        from yt_content_analyzer.discovery import search_resolver
+
+        def run(fake_info, term):
+            install_ytdlp(FakeYtDlp.returning(fake_info))
+            return search_resolver.resolve_search_videos(term, 5, Settings())
+
+        return run
+
+    def test_resolve_search_basic(self, resolve):
         fake_info = {
             "entries": [
                 {"id": "vid11111111", "title": "Result 1"},
                 {"id": "vid22222222", "title": "Result 2"},
             ],
         }
-        mock_ytdlp.YoutubeDL.return_value = self._make_mock_ydl(fake_info)
-
-        cfg = Settings()
-        import importlib
-        import yt_content_analyzer.discovery.search_resolver as mod
-        importlib.reload(mod)
-        result = mod.resolve_search_videos("Claude CoWork", 5, cfg)
+        result = resolve(fake_info, "Claude CoWork")
 
         assert len(result) == 2
         assert result[0]["VIDEO_ID"] == "vid11111111"
@@ -148,25 +233,12 @@ class TestSearchResolver:
         assert result[0]["SEARCH_TERM"] == "Claude CoWork"
         assert result[1]["TITLE"] == "Result 2"
 
-    @patch.dict("sys.modules", {"yt_dlp": MagicMock()})
-    def test_resolve_search_empty(self):
-        import sys
-        mock_ytdlp = sys.modules["yt_dlp"]
-        fake_info = {"entries": []}
-        mock_ytdlp.YoutubeDL.return_value = self._make_mock_ydl(fake_info)
-
-        cfg = Settings()
-        import importlib
-        import yt_content_analyzer.discovery.search_resolver as mod
-        importlib.reload(mod)
-        result = mod.resolve_search_videos("nonexistent_xyz_query", 5, cfg)
+    def test_resolve_search_empty(self, resolve):
+        result = resolve({"entries": []}, "nonexistent_xyz_query")
 
         assert result == []
 
-    @patch.dict("sys.modules", {"yt_dlp": MagicMock()})
-    def test_resolve_search_skips_empty_entries(self):
-        import sys
-        mock_ytdlp = sys.modules["yt_dlp"]
+    def test_resolve_search_skips_empty_entries(self, resolve):
         fake_info = {
             "entries": [
                 {"id": "vid11111111", "title": "Good"},
@@ -174,13 +246,7 @@ class TestSearchResolver:
                 {"id": "", "title": "No ID"},
             ],
         }
-        mock_ytdlp.YoutubeDL.return_value = self._make_mock_ydl(fake_info)
-
-        cfg = Settings()
-        import importlib
-        import yt_content_analyzer.discovery.search_resolver as mod
-        importlib.reload(mod)
-        result = mod.resolve_search_videos("test", 5, cfg)
+        result = resolve(fake_info, "test")
 
         assert len(result) == 1
         assert result[0]["VIDEO_ID"] == "vid11111111"
@@ -3,13 +3,20 @@ from __future__ import annotations
 
 import json
 import logging
+import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
+from _ytdlp_stubs import FakeYtDlp
 
+from yt_content_analyzer.collectors import comments_ytdlp, transcript_ytdlp
 from yt_content_analyzer.config import Settings
-from yt_content_analyzer.utils.io import read_jsonl, write_failure
+from yt_content_analyzer.enrich import sentiment, topics_llm, triples
+from yt_content_analyzer.utils.io import (
+    iter_jsonl, read_jsonl, write_bytes_if_changed, write_failure,
+)
 from yt_content_analyzer.utils.logger import JsonLineFormatter, configure_file_logging
 from yt_content_analyzer.state.checkpoint import CheckpointStore
 
@@ -19,9 +26,8 @@ from yt_content_analyzer.state.checkpoint import CheckpointStore
 # ---------------------------------------------------------------------------
 
 class TestOnVideoFailureConfig:
-    def test_default_is_skip(self):
-        cfg = Settings()
-        assert cfg.ON_VIDEO_FAILURE == "skip"
+    def test_default_is_skip(self, base_cfg):
+        assert base_cfg.ON_VIDEO_FAILURE == "skip"
 
     def test_accepts_abort(self):
         cfg = Settings(ON_VIDEO_FAILURE="abort")
@@ -44,35 +50,59 @@ class TestOnVideoFailureConfig:
 # read_jsonl hardened
 # ---------------------------------------------------------------------------
 
-class TestReadJsonlHardened:
-    def test_skips_bad_lines(self, tmp_path):
-        p = tmp_path / "data.jsonl"
-        p.write_text('{"a":1}\nnot json\n{"b":2}\n', encoding="utf-8")
-        rows = read_jsonl(p)
-        assert len(rows) == 2
-        assert rows[0] == {"a": 1}
-        assert rows[1] == {"b": 2}
+@pytest.fixture(scope="module")
+def bad_jsonl_corpus(tmp_path_factory):
+    """JSONL files for TestReadJsonlHardened, written once per module."""
+    d = tmp_path_factory.mktemp("jsonl")
+    contents = {
+        "mixed": '{"a":1}\nnot json\n{"b":2}\n',
+        "all_bad": "bad1\nbad2\nbad3\n",
+        "empty": "",
+    }
+    corpus = {"missing": d / "nonexistent.jsonl"}
+    for key, text in contents.items():
+        corpus[key] = d / f"{key}.jsonl"
+        corpus[key].write_text(text, encoding="utf-8")
+    return corpus
 
-    def test_all_bad_returns_empty(self, tmp_path):
-        p = tmp_path / "data.jsonl"
-        p.write_text("bad1\nbad2\nbad3\n", encoding="utf-8")
-        assert read_jsonl(p) == []
 
-    def test_empty_file_returns_empty(self, tmp_path):
+class TestReadJsonlHardened:
+    @pytest.mark.parametrize("key, expected", [
+        ("mixed", [{"a": 1}, {"b": 2}]),
+        ("all_bad", []),
+        ("empty", []),
+        ("missing", []),
+    ])
+    def test_skips_what_cannot_be_read(self, bad_jsonl_corpus, key, expected):
+        assert read_jsonl(bad_jsonl_corpus[key]) == expected
+
+    def test_iter_jsonl_is_lazy(self, tmp_path):
         p = tmp_path / "data.jsonl"
-        p.write_text("", encoding="utf-8")
-        assert read_jsonl(p) == []
-
-    def test_missing_file_returns_empty(self, tmp_path):
-        p = tmp_path / "nonexistent.jsonl"
-        assert read_jsonl(p) == []
+        p.write_bytes(b'{"a":1}\n\n\xff\xfe\n{"b":"\xc3\xa9"}\n')
+        it = iter_jsonl(p)
+        assert next(it) == {"a": 1}
+        assert list(it) == [{"b": "\u00e9"}]
 
 
 # ---------------------------------------------------------------------------
 # write_failure
 # ---------------------------------------------------------------------------
 
+# Fixed clock for timestamp assertions (freezegun is not a test dependency)
+_FROZEN_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return _FROZEN_NOW.astimezone(tz)
+
+
 class TestWriteFailure:
+    @pytest.fixture(autouse=True)
+    def _frozen_clock(self, monkeypatch):
+        monkeypatch.setattr("yt_content_analyzer.utils.io.datetime", _FrozenDatetime)
+
     def test_correct_schema(self, tmp_path):
         failures_dir = tmp_path / "failures"
         try:
@@ -82,13 +112,17 @@ class TestWriteFailure:
 
         assert path.exists()
         data = json.loads(path.read_text(encoding="utf-8"))
-        assert data["stage"] == "comments"
-        assert data["video_id"] == "abc123"
-        assert data["error_type"] == "ValueError"
-        assert data["error_message"] == "test error"
-        assert isinstance(data["traceback"], list)
-        assert len(data["traceback"]) > 0
-        assert "timestamp" in data
+        expected = {
+            "stage": "comments",
+            "video_id": "abc123",
+            "error_type": "ValueError",
+            "error_message": "test error",
+            "timestamp": "2024-01-01T00:00:00+00:00",
+        }
+        assert expected.items() <= data.items()
+        assert data.keys() == expected.keys() | {"traceback"}
+        assert data["traceback"].startswith("Traceback")
+        assert "ValueError: test error" in data["traceback"]
 
     def test_creates_dir(self, tmp_path):
         failures_dir = tmp_path / "deep" / "nested" / "failures"
@@ -110,84 +144,92 @@ class TestWriteFailure:
 
 
 # ---------------------------------------------------------------------------
-# Collector retry
+# Manifest serialization
 # ---------------------------------------------------------------------------
 
-def _make_mock_yt_dlp(extract_info_fn):
-    """Create a mock yt_dlp module with a YoutubeDL context manager."""
-    mock_ydl_instance = MagicMock()
-    mock_ydl_instance.extract_info = extract_info_fn
-    mock_ydl_instance.__enter__ = lambda self: self
-    mock_ydl_instance.__exit__ = lambda self, *a: None
+class TestManifestWrite:
+    def test_manifest_bytes_stable_for_equal_settings(self):
+        from yt_content_analyzer.run import _manifest_bytes
+
+        first = _manifest_bytes(Settings(VIDEO_URL="x", COLLECT_SORT_MODES=["top"]))
+        assert _manifest_bytes(Settings(COLLECT_SORT_MODES=["top"], VIDEO_URL="x")) == first
+
+    def test_skips_unchanged_write(self, tmp_path):
+        from yt_content_analyzer.run import _manifest_bytes
+
+        p = tmp_path / "manifest.json"
+        data = _manifest_bytes(Settings(VIDEO_URL="x"))
+        assert write_bytes_if_changed(p, data) is True
+        assert write_bytes_if_changed(p, data) is False
+        assert write_bytes_if_changed(p, _manifest_bytes(Settings(VIDEO_URL="y"))) is True
+        assert json.loads(p.read_text(encoding="utf-8"))["VIDEO_URL"] == "y"
+
+    def test_manifest_scrubs_secrets_and_round_trips(self):
+        from yt_content_analyzer.run import _manifest_bytes
+
+        cfg = Settings(VIDEO_URL="https://youtu.be/dQw4w9WgXcQ", YOUTUBE_API_KEY="secret")
+        data = json.loads(_manifest_bytes(cfg))
+        assert data["YOUTUBE_API_KEY"] == "***"
+        assert Settings(**data).VIDEO_URL == cfg.VIDEO_URL
+        assert cfg.YOUTUBE_API_KEY == "secret"
+        assert json.loads(_manifest_bytes(Settings()))["YOUTUBE_API_KEY"] is None
 
-    mock_module = MagicMock()
-    mock_module.YoutubeDL = MagicMock(return_value=mock_ydl_instance)
-    return mock_module, mock_ydl_instance
+
+# ---------------------------------------------------------------------------
+# Collector retry
+# ---------------------------------------------------------------------------
+
+_VIDEO_URL = "https://www.youtube.com/watch?v=abc123"
 
 
 class TestCollectorRetry:
-    def test_comments_ytdlp_fail_then_succeed(self):
+    @pytest.mark.parametrize("module, func_name, info, check", [
+        (
+            comments_ytdlp, "collect_comments_ytdlp",
+            {"id": "abc123", "comments": [{"text": "hi"}]},
+            lambda result: len(result) == 1,
+        ),
+        (
+            transcript_ytdlp, "collect_transcript_ytdlp",
+            {"id": "abc123", "subtitles": {}, "automatic_captions": {}},
+            lambda result: result["video_id"] == "abc123",
+        ),
+    ], ids=["comments", "transcript"])
+    def test_fail_then_succeed(self, install_ytdlp, module, func_name, info, check):
         cfg = Settings(MAX_RETRY_SCRAPE=2, BACKOFF_BASE_SECONDS=0.01, BACKOFF_MAX_SECONDS=0.01)
         call_count = 0
 
-        def fake_extract_info(url, download=False):
+        def fake_extract_info(url):
             nonlocal call_count
             call_count += 1
             if call_count < 2:
                 raise RuntimeError("transient error")
-            return {"id": "abc123", "comments": [{"text": "hi"}]}
-
-        mock_module, _ = _make_mock_yt_dlp(fake_extract_info)
+            return info
 
-        import sys
-        with patch.dict(sys.modules, {"yt_dlp": mock_module}):
-            from yt_content_analyzer.collectors.comments_ytdlp import collect_comments_ytdlp
-            result = collect_comments_ytdlp("https://www.youtube.com/watch?v=abc123", cfg)
+        install_ytdlp(FakeYtDlp(fake_extract_info))
+        result = getattr(module, func_name)(_VIDEO_URL, cfg)
 
         assert call_count == 2
-        assert len(result) == 1
+        assert check(result)
 
-    def test_comments_ytdlp_exhaust_retries(self):
+    def test_comments_ytdlp_exhaust_retries(self, install_ytdlp):
         cfg = Settings(MAX_RETRY_SCRAPE=1, BACKOFF_BASE_SECONDS=0.01, BACKOFF_MAX_SECONDS=0.01)
 
-        def always_fail(url, download=False):
+        def always_fail(url):
             raise RuntimeError("persistent error")
 
-        mock_module, _ = _make_mock_yt_dlp(always_fail)
-
-        import sys
-        with patch.dict(sys.modules, {"yt_dlp": mock_module}):
-            from yt_content_analyzer.collectors.comments_ytdlp import collect_comments_ytdlp
-            with pytest.raises(RuntimeError, match="persistent error"):
-                collect_comments_ytdlp("https://www.youtube.com/watch?v=abc123", cfg)
+        fake = install_ytdlp(FakeYtDlp(always_fail))
+        with pytest.raises(RuntimeError, match="persistent error"):
+            comments_ytdlp.collect_comments_ytdlp(_VIDEO_URL, cfg)
 
         # 1 initial + 1 retry = 2 calls
-        assert mock_module.YoutubeDL.call_count == 2
-
-    def test_transcript_ytdlp_fail_then_succeed(self):
-        cfg = Settings(MAX_RETRY_SCRAPE=2, BACKOFF_BASE_SECONDS=0.01, BACKOFF_MAX_SECONDS=0.01)
-        call_count = 0
-
-        def fake_extract_info(url, download=False):
-            nonlocal call_count
-            call_count += 1
-            if call_count < 2:
-                raise RuntimeError("transient error")
-            return {
-                "id": "abc123",
-                "subtitles": {},
-                "automatic_captions": {},
-            }
+        assert len(fake.instances) == 2
 
-        mock_module, _ = _make_mock_yt_dlp(fake_extract_info)
-
-        import sys
-        with patch.dict(sys.modules, {"yt_dlp": mock_module}):
-            from yt_content_analyzer.collectors.transcript_ytdlp import collect_transcript_ytdlp
-            result = collect_transcript_ytdlp("https://www.youtube.com/watch?v=abc123", cfg)
-
-        assert call_count == 2
-        assert result["video_id"] == "abc123"
+    def test_missing_ytdlp_raises_install_hint(self, monkeypatch):
+        monkeypatch.setattr("yt_content_analyzer.utils.ytdlp._yt_dlp", None)
+        monkeypatch.setitem(sys.modules, "yt_dlp", None)  # makes the import fail
+        with pytest.raises(RuntimeError, match=r"pip install yt-content-analyzer\[scrape\]"):
+            transcript_ytdlp.collect_transcript_ytdlp(_VIDEO_URL, Settings())
 
 
 # ---------------------------------------------------------------------------
@@ -195,44 +237,95 @@ class TestCollectorRetry:
 # ---------------------------------------------------------------------------
 
 class TestEnrichErrorHandling:
-    def test_topics_llm_returns_empty_on_error(self):
+    @pytest.mark.parametrize("module, func_name, items", [
+        (topics_llm, "extract_topics_llm", [{"TEXT": "hello world"}]),
+        (sentiment, "analyze_sentiment_llm", [{"TEXT": "hello world", "COMMENT_ID": "c1"}]),
+        (triples, "extract_triples", [{"TEXT": "hello world"}]),
+    ], ids=["topics", "sentiment", "triples"])
+    def test_llm_stage_returns_empty_on_error(self, module, func_name, items):
         cfg = Settings(LLM_PROVIDER="openai", LLM_MODEL="test")
-        items = [{"TEXT": "hello world"}]
 
-        with patch(
-            "yt_content_analyzer.enrich.topics_llm.chat_completion",
-            side_effect=ConnectionError("connection refused"),
+        with patch.object(
+            module, "chat_completion", side_effect=ConnectionError("connection refused"),
         ):
-            from yt_content_analyzer.enrich.topics_llm import extract_topics_llm
-            result = extract_topics_llm(items, "vid1", "comments", cfg)
+            result = getattr(module, func_name)(items, "vid1", "comments", cfg)
 
         assert result == []
 
-    def test_sentiment_llm_returns_empty_on_error(self):
-        cfg = Settings(LLM_PROVIDER="openai", LLM_MODEL="test")
-        items = [{"TEXT": "hello world", "COMMENT_ID": "c1"}]
+    def test_concurrent_stage_failure_is_isolated(self, tmp_path):
+        from yt_content_analyzer.models import RunResult
+        from yt_content_analyzer.run import _enrich_video
+        from yt_content_analyzer.utils.io import write_jsonl
 
-        with patch(
-            "yt_content_analyzer.enrich.sentiment.chat_completion",
-            side_effect=ConnectionError("connection refused"),
-        ):
-            from yt_content_analyzer.enrich.sentiment import analyze_sentiment_llm
-            result = analyze_sentiment_llm(items, "vid1", "comments", cfg)
+        cfg = Settings(EMBEDDINGS_ENABLE=False, URL_EXTRACTION_ENABLE=False, SUMMARY_ENABLE=False)
+        write_jsonl(tmp_path / "comments" / "comments.jsonl", [{"VIDEO_ID": "vid1", "TEXT": "hi"}])
+        ckpt = CheckpointStore(tmp_path / "state" / "checkpoint.json")
+        ckpt.init_if_missing()
+        result = RunResult(run_id="r", output_dir=tmp_path)
+
+        with patch("yt_content_analyzer.enrich.topics_nlp.extract_topics_nlp",
+                   return_value=[{"TOPIC": "t"}]), \
+             patch("yt_content_analyzer.enrich.sentiment.analyze_sentiment",
+                   side_effect=RuntimeError("boom")), \
+             patch("yt_content_analyzer.enrich.triples.extract_triples",
+                   return_value=[{"SUBJECT": "s"}]):
+            _enrich_video(cfg, "vid1", tmp_path, ckpt, "vid1", result, tmp_path / "failures")
+
+        assert ckpt.is_done("vid1", "enrich_topics")
+        assert ckpt.is_done("vid1", "enrich_triples")
+        assert ckpt.load()["UNITS"]["vid1"]["enrich_sentiment"] == "FAILED"
+        assert [f["stage"] for f in result.failures] == ["enrich_sentiment"]
+        assert (tmp_path / "enrich" / "topics.jsonl").exists()
+        assert (tmp_path / "enrich" / "triples.jsonl").exists()
+
+    def test_enrich_skips_when_all_stages_done(self, tmp_path):
+        from yt_content_analyzer.models import RunResult
+        from yt_content_analyzer.run import _enrich_video
+
+        cfg = Settings(EMBEDDINGS_ENABLE=False, URL_EXTRACTION_ENABLE=False, SUMMARY_ENABLE=False)
+        ckpt = CheckpointStore(tmp_path / "state" / "checkpoint.json")
+        ckpt.init_if_missing()
+        for stage in ("enrich_topics", "enrich_sentiment", "enrich_triples"):
+            ckpt.mark("vid1", stage)
+        result = RunResult(run_id="r", output_dir=tmp_path)
 
-        assert result == []
+        with patch("yt_content_analyzer.run.iter_jsonl") as mock_iter:
+            _enrich_video(cfg, "vid1", tmp_path, ckpt, "vid1", result, tmp_path / "failures")
 
-    def test_triples_returns_empty_on_error(self):
-        cfg = Settings(LLM_PROVIDER="openai", LLM_MODEL="test")
-        items = [{"TEXT": "hello world"}]
+        mock_iter.assert_not_called()
 
-        with patch(
-            "yt_content_analyzer.enrich.triples.chat_completion",
-            side_effect=ConnectionError("connection refused"),
-        ):
-            from yt_content_analyzer.enrich.triples import extract_triples
-            result = extract_triples(items, "vid1", "comments", cfg)
+    def test_embeddings_packed_as_float32_matrix(self):
+        np = pytest.importorskip("numpy")
+        from yt_content_analyzer.run import _as_matrix
 
-        assert result == []
+        matrix = _as_matrix([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+        assert matrix.dtype == np.float32
+        assert matrix.shape == (3, 2)
+        assert np.shares_memory(matrix[:1], matrix)
+
+    def test_enrich_uses_in_memory_rows(self, tmp_path):
+        from yt_content_analyzer.models import RunResult
+        from yt_content_analyzer.run import _enrich_video
+
+        cfg = Settings(EMBEDDINGS_ENABLE=False, URL_EXTRACTION_ENABLE=False, SUMMARY_ENABLE=False)
+        ckpt = CheckpointStore(tmp_path / "state" / "checkpoint.json")
+        ckpt.init_if_missing()
+        result = RunResult(run_id="r", output_dir=tmp_path)
+        comments = [{"VIDEO_ID": "vid1", "TEXT": "hi"}]
+
+        with patch("yt_content_analyzer.run.iter_jsonl") as mock_iter, \
+             patch("yt_content_analyzer.enrich.topics_nlp.extract_topics_nlp",
+                   return_value=[]), \
+             patch("yt_content_analyzer.enrich.sentiment.analyze_sentiment",
+                   return_value=[]) as mock_sentiment, \
+             patch("yt_content_analyzer.enrich.triples.extract_triples", return_value=[]):
+            _enrich_video(
+                cfg, "vid1", tmp_path, ckpt, "vid1", result, tmp_path / "failures",
+                comments=comments, chunks=[],
+            )
+
+        mock_iter.assert_not_called()
+        mock_sentiment.assert_called_once_with(comments, "vid1", ["comments"], cfg)
 
 
 # ---------------------------------------------------------------------------
@@ -246,11 +339,12 @@ class TestJsonLineFormatter:
             name="test", level=logging.INFO, pathname="test.py",
             lineno=1, msg="hello %s", args=("world",), exc_info=None,
         )
+        record.created = _FROZEN_NOW.timestamp()
         line = fmt.format(record)
         data = json.loads(line)
         assert data["message"] == "hello world"
         assert data["level"] == "INFO"
-        assert "timestamp" in data
+        assert data["timestamp"] == "2024-01-01T00:00:00+00:00"
         assert "module" in data
 
     def test_extra_fields(self):
@@ -264,12 +358,37 @@ class TestJsonLineFormatter:
         data = json.loads(line)
         assert data["extra"]["my_custom_field"] == "custom_value"
 
+    def test_extra_non_json_and_private_fields(self):
+        fmt = JsonLineFormatter()
+        record = logging.LogRecord(
+            name="test", level=logging.INFO, pathname="test.py",
+            lineno=1, msg="test", args=(), exc_info=None,
+        )
+        record.OUTPUT_DIR = Path("out") / "run"
+        record._private = "hidden"
+        data = json.loads(fmt.format(record))
+        assert data["extra"] == {"OUTPUT_DIR": str(Path("out") / "run")}
+
+    def test_timestamp_matches_stdlib_fallback(self, monkeypatch):
+        from yt_content_analyzer.utils import logger as logger_mod
+
+        record = logging.LogRecord(
+            name="test", level=logging.INFO, pathname="test.py",
+            lineno=1, msg="hello %s", args=("world",), exc_info=None,
+        )
+        record.created = _FROZEN_NOW.timestamp() + 0.25
+        fast = json.loads(JsonLineFormatter().format(record))
+        monkeypatch.setattr(logger_mod, "orjson", None)
+        slow = json.loads(JsonLineFormatter().format(record))
+        assert fast == slow
+        assert fast["message"] == "hello world"
+        assert fast["timestamp"] == "2024-01-01T00:00:00.250000+00:00"
+
     def test_exception_traceback(self):
         fmt = JsonLineFormatter()
         try:
             raise ValueError("test error")
         except ValueError:
-            import sys
             exc_info = sys.exc_info()
 
         record = logging.LogRecord(
@@ -283,6 +402,20 @@ class TestJsonLineFormatter:
         assert any("ValueError" in t for t in data["traceback"])
 
 
+class TestGetLoggerDeprecation:
+    def test_warns_only_once(self, monkeypatch):
+        import warnings
+        from yt_content_analyzer.utils import logger as logger_mod
+
+        monkeypatch.setattr(logger_mod, "_WARNED", False)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            first = logger_mod.get_logger()
+            second = logger_mod.get_logger()
+        assert first is second
+        assert [w.category for w in caught] == [DeprecationWarning]
+
+
 # ---------------------------------------------------------------------------
 # configure_file_logging
 # ---------------------------------------------------------------------------
@@ -299,14 +432,24 @@ class TestConfigureFileLogging:
     def test_creates_run_log(self, tmp_path):
         log_dir = tmp_path / "logs"
         configure_file_logging(log_dir)
-        # Write a log entry to force file creation
+
+        _logger = logging.getLogger("yt_content_analyzer")
+        handlers = [h for h in _logger.handlers if isinstance(h, logging.FileHandler)]
+        assert len(handlers) == 1
+        assert Path(handlers[0].baseFilename) == log_dir / "run.log"
+        assert handlers[0].level == logging.DEBUG
+
+    def test_writes_json_lines(self, tmp_path):
+        log_dir = tmp_path / "logs"
+        configure_file_logging(log_dir)
+
         _logger = logging.getLogger("yt_content_analyzer")
-        _logger.setLevel(logging.DEBUG)
-        _logger.debug("test message")
-        # Flush handlers
+        _logger.warning("test message")
         for h in _logger.handlers:
             h.flush()
-        assert (log_dir / "run.log").exists()
+
+        line = (log_dir / "run.log").read_text(encoding="utf-8").splitlines()[-1]
+        assert json.loads(line)["message"] == "test message"
 
     def test_idempotent(self, tmp_path):
         log_dir = tmp_path / "logs"
@@ -337,7 +480,7 @@ class TestConfigureFileLogging:
 class TestCheckpointCorruption:
     def test_corrupt_backup_and_reinit(self, tmp_path):
         ckpt_path = tmp_path / "state" / "checkpoint.json"
-        ckpt = CheckpointStore(ckpt_path)
+        ckpt = CheckpointStore(ckpt_path, fsync=False)
         ckpt.init_if_missing()
 
         # Corrupt the file
@@ -366,13 +509,64 @@ class TestCheckpointCorruption:
 
     def test_atomic_save_content(self, tmp_path):
         ckpt_path = tmp_path / "state" / "checkpoint.json"
-        ckpt = CheckpointStore(ckpt_path)
+        ckpt = CheckpointStore(ckpt_path, fsync=False)
         ckpt.init_if_missing()
 
         ckpt.mark("vid1", "stage1", "DONE")
         data = ckpt.load()
         assert data["UNITS"]["vid1"]["stage1"] == "DONE"
 
+    def test_fsync_false_skips_fsync(self, tmp_path, monkeypatch):
+        import os
+
+        synced = []
+        monkeypatch.setattr(os, "fsync", synced.append)
+        ckpt_path = tmp_path / "checkpoint.json"
+        CheckpointStore(ckpt_path, fsync=False).save({"UNITS": {}})
+        assert synced == []
+
+        CheckpointStore(ckpt_path).save({"UNITS": {}})
+        assert len(synced) == 2  # the temp file, then its directory
+
+
+class TestCheckpointBatching:
+    def test_marks_buffered_until_flush(self, tmp_path):
+        ckpt_path = tmp_path / "state" / "checkpoint.json"
+        ckpt = CheckpointStore(ckpt_path, flush_every=10, flush_interval_s=3600, fsync=False)
+        ckpt.init_if_missing()
+
+        ckpt.mark("vid1", "stage1")
+        assert ckpt.is_done("vid1", "stage1")
+        on_disk = json.loads(ckpt_path.read_text(encoding="utf-8"))
+        assert on_disk == {"UNITS": {}}
+
+        ckpt.flush()
+        on_disk = json.loads(ckpt_path.read_text(encoding="utf-8"))
+        assert on_disk["UNITS"]["vid1"]["stage1"] == "DONE"
+
+    def test_reloads_after_external_change(self, tmp_path):
+        import os
+
+        ckpt_path = tmp_path / "state" / "checkpoint.json"
+        ckpt = CheckpointStore(ckpt_path, fsync=False)
+        ckpt.init_if_missing()
+        assert ckpt.load() == {"UNITS": {}}
+
+        ckpt_path.write_text('{"UNITS": {"vid1": {"s": "DONE"}}}', encoding="utf-8")
+        st = ckpt_path.stat()
+        os.utime(ckpt_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert ckpt.is_done("vid1", "s")
+
+    def test_flush_every_threshold(self, tmp_path):
+        ckpt_path = tmp_path / "state" / "checkpoint.json"
+        ckpt = CheckpointStore(ckpt_path, flush_every=2, flush_interval_s=3600, fsync=False)
+        ckpt.init_if_missing()
+
+        ckpt.mark("vid1", "stage1")
+        ckpt.mark("vid1", "stage2")
+        on_disk = json.loads(ckpt_path.read_text(encoding="utf-8"))
+        assert on_disk["UNITS"]["vid1"] == {"stage1": "DONE", "stage2": "DONE"}
+
 
 # ---------------------------------------------------------------------------
 # Checkpoint FAILED status
@@ -381,7 +575,7 @@ class TestCheckpointCorruption:
 class TestCheckpointFailedStatus:
     def test_failed_is_not_done(self, tmp_path):
         ckpt_path = tmp_path / "state" / "checkpoint.json"
-        ckpt = CheckpointStore(ckpt_path)
+        ckpt = CheckpointStore(ckpt_path, fsync=False)
         ckpt.init_if_missing()
 
         ckpt.mark("vid1", "comments", status="FAILED")
@@ -389,7 +583,7 @@ class TestCheckpointFailedStatus:
 
     def test_failed_to_done_works(self, tmp_path):
         ckpt_path = tmp_path / "state" / "checkpoint.json"
-        ckpt = CheckpointStore(ckpt_path)
+        ckpt = CheckpointStore(ckpt_path, fsync=False)
         ckpt.init_if_missing()
 
         ckpt.mark("vid1", "comments", status="FAILED")
@@ -404,29 +598,22 @@ class TestCheckpointFailedStatus:
 # ---------------------------------------------------------------------------
 
 class TestResumeCLI:
-    def test_missing_run_dir_errors(self, tmp_path):
-        from click.testing import CliRunner
+    def test_missing_run_dir_errors(self, tmp_path, runner):
         from yt_content_analyzer.cli import main
 
-        runner = CliRunner()
         with runner.isolated_filesystem(temp_dir=tmp_path):
             result = runner.invoke(main, ["run-all", "--resume", "nonexistent_run"])
             assert result.exit_code != 0
             assert "not found" in result.output.lower() or result.exit_code != 0
 
-    def test_loads_manifest_when_no_config(self, tmp_path):
-        from click.testing import CliRunner
+    def test_loads_manifest_when_no_config(self, tmp_path, runner, default_manifest_bytes):
         from yt_content_analyzer.cli import main
 
-        runner = CliRunner()
         with runner.isolated_filesystem(temp_dir=tmp_path) as td:
             # Create run dir with manifest
             run_dir = Path(td) / "runs" / "test_run"
             run_dir.mkdir(parents=True)
-            manifest = Settings(VIDEO_URL="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
-            (run_dir / "manifest.json").write_text(
-                json.dumps(manifest.model_dump(), indent=2), encoding="utf-8"
-            )
+            (run_dir / "manifest.json").write_bytes(default_manifest_bytes)
 
             # Mock run_all to capture the call (lazy-imported in run_all_cmd)
             with patch("yt_content_analyzer.run.run_all") as mock_run_all: